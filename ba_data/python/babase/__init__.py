@@ -161,7 +161,7 @@ from babase._general import (
     getclass,
     get_type_name,
 )
-from babase._language import Lstr, LanguageSubsystem
+from babase._language import Lstr, LanguageSubsystem, LstrCacheStats
 from babase._login import LoginAdapter, LoginInfo
 
 # noinspection PyProtectedMember
@@ -273,6 +273,7 @@ __all__ = [
     'LoginAdapter',
     'LoginInfo',
     'Lstr',
+    'LstrCacheStats',
     'mac_music_app_get_playlists',
     'mac_music_app_get_volume',
     'mac_music_app_init',
@@ -4,8 +4,13 @@
 from __future__ import annotations
 
 import os
+import sys
 import json
+import weakref
+import marshal
 import logging
+import functools
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, overload, override
 
 import _babase
@@ -17,6 +22,35 @@ if TYPE_CHECKING:
     import babase
 
 
+# Max number of evaluated Lstr results we keep around.
+_LSTR_EVAL_CACHE_SIZE = 2048
+
+
+@functools.lru_cache(maxsize=_LSTR_EVAL_CACHE_SIZE)
+def _evaluate_lstr_json(lstr_json: str) -> str:
+    # Results only depend on the Lstr and the current language, so
+    # this gets cleared whenever the language is set.
+    return _babase.evaluate_lstr(lstr_json)
+
+
+@dataclass
+class LstrCacheStats:
+    """Stats for the Lstr evaluation cache.
+
+    Category: **App Classes**
+    """
+
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of evaluations served from the cache."""
+        total = self.hits + self.misses
+        return 0.0 if total == 0 else self.hits / total
+
+
 class LanguageSubsystem(AppSubsystem):
     """Language functionality for the app.
 
@@ -30,8 +64,8 @@ class LanguageSubsystem(AppSubsystem):
         self.default_language: str = self._get_default_language()
 
         self._language: str | None = None
-        self._language_target: AttrDict | None = None
-        self._language_merged: AttrDict | None = None
+        self._language_target: _LanguageTable | None = None
+        self._language_merged: _LanguageTable | None = None
 
     @property
     def locale(self) -> str:
@@ -122,34 +156,11 @@ class LanguageSubsystem(AppSubsystem):
         else:
             switched = False
 
-        with open(
-            os.path.join(
-                _babase.app.env.data_directory,
-                'ba_data',
-                'data',
-                'languages',
-                'english.json',
-            ),
-            encoding='utf-8',
-        ) as infile:
-            lenglishvalues = json.loads(infile.read())
-
         # None implies default.
         if language is None:
             language = self.default_language
         try:
-            if language == 'English':
-                lmodvalues = None
-            else:
-                lmodfile = os.path.join(
-                    _babase.app.env.data_directory,
-                    'ba_data',
-                    'data',
-                    'languages',
-                    language.lower() + '.json',
-                )
-                with open(lmodfile, encoding='utf-8') as infile:
-                    lmodvalues = json.loads(infile.read())
+            langtarget, lmerged = _get_language_tables(language)
         except Exception:
             logging.exception("Error importing language '%s'.", language)
             _babase.screenmessage(
@@ -157,32 +168,24 @@ class LanguageSubsystem(AppSubsystem):
                 color=(1, 0, 0),
             )
             switched = False
-            lmodvalues = None
+            langtarget, lmerged = _get_language_tables('English')
 
         self._language = language
 
-        # Create an attrdict of *just* our target language.
-        self._language_target = AttrDict()
-        langtarget = self._language_target
-        assert langtarget is not None
-        _add_to_attr_dict(
-            langtarget, lmodvalues if lmodvalues is not None else lenglishvalues
-        )
+        # Any previously evaluated Lstrs are now potentially wrong.
+        _evaluate_lstr_json.cache_clear()
 
-        # Create an attrdict of our target language overlaid on our base
-        # (english).
-        languages = [lenglishvalues]
-        if lmodvalues is not None:
-            languages.append(lmodvalues)
-        lfull = AttrDict()
-        for lmod in languages:
-            _add_to_attr_dict(lfull, lmod)
-        self._language_merged = lfull
+        # Tables of *just* our target language and of our target
+        # language overlaid on our base (english).
+        self._language_target = langtarget
+        self._language_merged = lmerged
 
         # Pass some keys/values in for low level code to use; start with
         # everything in their 'internal' section.
         internal_vals = [
-            v for v in list(lfull['internal'].items()) if isinstance(v[1], str)
+            v
+            for v in list(lmerged.get('internal').items())
+            if isinstance(v[1], str)
         ]
 
         # Cherry-pick various other values to include.
@@ -194,15 +197,13 @@ class LanguageSubsystem(AppSubsystem):
             'replayVersionErrorText',
             'replayReadErrorText',
         ]:
-            internal_vals.append((value, lfull[value]))
+            internal_vals.append((value, lmerged.get(value)))
         internal_vals.append(
-            ('axisText', lfull['configGamepadWindow']['axisText'])
+            ('axisText', lmerged.get('configGamepadWindow.axisText'))
         )
-        internal_vals.append(('buttonText', lfull['buttonText']))
-        lmerged = self._language_merged
-        assert lmerged is not None
+        internal_vals.append(('buttonText', lmerged.get('buttonText')))
         random_names = [
-            n.strip() for n in lmerged['randomPlayerNamesText'].split(',')
+            n.strip() for n in lmerged.get('randomPlayerNamesText').split(',')
         ]
         random_names = [n for n in random_names if n != '']
         _babase.set_internal_language_keys(internal_vals, random_names)
@@ -259,31 +260,15 @@ class LanguageSubsystem(AppSubsystem):
             # trying the fallback_resource value in the merged dict.
             if fallback_resource is not None:
                 try:
-                    values = self._language_target
-                    splits = resource.split('.')
-                    dicts = splits[:-1]
-                    key = splits[-1]
-                    for dct in dicts:
-                        assert values is not None
-                        values = values[dct]
-                    assert values is not None
-                    val = values[key]
-                    return val
+                    assert self._language_target is not None
+                    return self._language_target.get(resource)
                 except Exception:
                     # FIXME: Shouldn't we try the fallback resource in
                     #  the merged dict AFTER we try the main resource in
                     #  the merged dict?
                     try:
-                        values = self._language_merged
-                        splits = fallback_resource.split('.')
-                        dicts = splits[:-1]
-                        key = splits[-1]
-                        for dct in dicts:
-                            assert values is not None
-                            values = values[dct]
-                        assert values is not None
-                        val = values[key]
-                        return val
+                        assert self._language_merged is not None
+                        return self._language_merged.get(fallback_resource)
 
                     except Exception:
                         # If we got nothing for fallback_resource,
@@ -294,16 +279,8 @@ class LanguageSubsystem(AppSubsystem):
                         # through).
                         pass
 
-            values = self._language_merged
-            splits = resource.split('.')
-            dicts = splits[:-1]
-            key = splits[-1]
-            for dct in dicts:
-                assert values is not None
-                values = values[dct]
-            assert values is not None
-            val = values[key]
-            return val
+            assert self._language_merged is not None
+            return self._language_merged.get(resource)
 
         except Exception:
             # Ok, looks like we couldn't find our main or fallback
@@ -317,6 +294,16 @@ class LanguageSubsystem(AppSubsystem):
                 f"Resource not found: '{resource}'"
             ) from None
 
+    def get_lstr_cache_stats(self) -> LstrCacheStats:
+        """Return stats for the Lstr evaluation cache.
+
+        Counts are since the last time the language was set.
+        """
+        info = _evaluate_lstr_json.cache_info()
+        return LstrCacheStats(
+            hits=info.hits, misses=info.misses, size=info.currsize
+        )
+
     def translate(
         self,
         category: str,
@@ -527,6 +514,8 @@ class Lstr:
         # However if they passed any Lstr values for subs,
         # replace them with that Lstr's dict.
         self.args = keywds
+        self._json: str | None = None
+        self._json_args: dict | None = None
         our_type = type(self)
 
         if isinstance(self.args.get('value'), our_type):
@@ -577,8 +566,11 @@ class Lstr:
 
         You should avoid doing this as much as possible and instead pass
         and store Lstr values.
+
+        Results are cached (until the language changes), so evaluating
+        equivalent Lstrs repeatedly is cheap.
         """
-        return _babase.evaluate_lstr(self._get_json())
+        return _evaluate_lstr_json(self._get_json())
 
     def is_flat_value(self) -> bool:
         """Return whether the Lstr is a 'flat' value.
@@ -590,9 +582,40 @@ class Lstr:
         """
         return bool('v' in self.args and not self.args.get('s', []))
 
+    @classmethod
+    def interned(cls, **keywds: Any) -> Lstr:
+        """Return a shared Lstr instance for the provided args.
+
+        Takes the same keyword args as the Lstr constructor. Equivalent
+        Lstrs created this way are all the same instance as long as
+        someone is holding on to one (nodes don't hold the Lstrs they
+        are given). So code rebuilding the same string periodically can
+        keep the last result around; while the string is unchanged it
+        gets that same instance back without anything being constructed
+        or serialized, and can skip work with an 'is' check.
+
+        Interned instances are shared; don't modify them.
+        """
+        try:
+            key = _intern_key(keywds)
+            existing = _interned_lstrs.get(key)
+        except TypeError:
+            # Something unhashable in there; just hand out a fresh one.
+            return cls(**keywds)
+        if existing is not None:
+            return existing
+        lstr = _interned_lstrs[key] = cls(**keywds)
+        return lstr
+
     def _get_json(self) -> str:
+        # Our json is cached; just need to watch for args being replaced
+        # (as from_json() does).
+        if self._json is not None and self._json_args is self.args:
+            return self._json
         try:
-            return json.dumps(self.args, separators=(',', ':'))
+            self._json = json.dumps(self.args, separators=(',', ':'))
+            self._json_args = self.args
+            return self._json
         except Exception:
             from babase import _error
 
@@ -615,6 +638,194 @@ class Lstr:
         return lstr
 
 
+# Bump this if the format of compiled language caches changes.
+_LANGUAGE_CACHE_VERSION = 1
+
+
+class _LanguageTable:
+    """Compiled language data.
+
+    Leaf values are stored in a flat dict keyed by dotted resource
+    path so they can be looked up directly. Dicts are built lazily
+    (per top level key) from their marshalled forms when asked for.
+    """
+
+    def __init__(
+        self,
+        values: dict[str, Any],
+        dict_keys: set[str],
+        subtrees: dict[str, bytes],
+    ) -> None:
+        self._values = values
+        self._dict_keys = dict_keys
+        self._subtrees = subtrees
+        self._subtrees_loaded: dict[str, AttrDict] = {}
+
+    def get(self, resource: str) -> Any:
+        """Return the value at a dotted resource path.
+
+        Raises KeyError if it is not present.
+        """
+        try:
+            return self._values[resource]
+        except KeyError:
+            pass
+        if resource not in self._dict_keys:
+            raise KeyError(resource)
+        topkey, _, subpath = resource.partition('.')
+        subtree = self._subtrees_loaded.get(topkey)
+        if subtree is None:
+            subtree = self._subtrees_loaded[topkey] = AttrDict()
+            _add_to_attr_dict(subtree, marshal.loads(self._subtrees[topkey]))
+        value: Any = subtree
+        if subpath:
+            for key in subpath.split('.'):
+                value = value[key]
+        return value
+
+    @staticmethod
+    def compile(tree: AttrDict) -> tuple[dict, list[str], dict]:
+        """Flatten a language tree to marshallable table data."""
+        values: dict[str, Any] = {}
+        dict_keys: list[str] = []
+
+        def _add(src: dict, prefix: str) -> None:
+            for key, value in src.items():
+                # Keys containing dots are not reachable via dotted
+                # paths (they can still be found by digging through
+                # dicts).
+                if '.' in key:
+                    continue
+                fullkey = sys.intern(prefix + key)
+                if isinstance(value, dict):
+                    dict_keys.append(fullkey)
+                    _add(value, fullkey + '.')
+                else:
+                    values[fullkey] = value
+
+        _add(tree, '')
+        subtrees = {
+            key: marshal.dumps(_plain_dict(value))
+            for key, value in tree.items()
+            if isinstance(value, dict)
+        }
+        return values, dict_keys, subtrees
+
+    @classmethod
+    def from_compiled(
+        cls, data: tuple[dict, list[str], dict]
+    ) -> _LanguageTable:
+        """Create a table from compile() results."""
+        values, dict_keys, subtrees = data
+        return cls(values, set(dict_keys), subtrees)
+
+
+def _plain_dict(src: dict) -> dict:
+    return {
+        key: _plain_dict(value) if isinstance(value, dict) else value
+        for key, value in src.items()
+    }
+
+
+def _get_language_tables(
+    language: str,
+) -> tuple[_LanguageTable, _LanguageTable]:
+    """Return target-only and merged-over-english tables for a language.
+
+    Compiled tables are cached on disk and only rebuilt when the
+    language files they came from change.
+    """
+    langdir = os.path.join(
+        _babase.app.env.data_directory, 'ba_data', 'data', 'languages'
+    )
+    paths = [os.path.join(langdir, 'english.json')]
+    if language != 'English':
+        paths.append(os.path.join(langdir, language.lower() + '.json'))
+    stats = [os.stat(path) for path in paths]
+    cache_key = (
+        _LANGUAGE_CACHE_VERSION,
+        tuple(sys.version_info[:2]),
+        tuple((stat.st_size, stat.st_mtime_ns) for stat in stats),
+    )
+    cache_path = os.path.join(
+        _babase.get_volatile_data_directory(),
+        'languages',
+        language.lower() + '.cache',
+    )
+    compiled: Any = None
+    try:
+        with open(cache_path, 'rb') as infile:
+            data = marshal.loads(infile.read())
+        if data[0] == cache_key:
+            compiled = data[1]
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logging.warning(
+            'Error loading language cache %s; ignoring.',
+            cache_path,
+            exc_info=True,
+        )
+
+    if compiled is None:
+        compiled = _compile_language(paths)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmppath = f'{cache_path}.tmp'
+            with open(tmppath, 'wb') as outfile:
+                outfile.write(marshal.dumps((cache_key, compiled)))
+            os.replace(tmppath, cache_path)
+        except Exception:
+            logging.warning(
+                'Error writing language cache %s.', cache_path, exc_info=True
+            )
+
+    merged = _LanguageTable.from_compiled(compiled[0])
+    target = (
+        merged
+        if compiled[1] is None
+        else _LanguageTable.from_compiled(compiled[1])
+    )
+    return target, merged
+
+
+def _compile_language(paths: list[str]) -> tuple[Any, Any]:
+    """Compile merged and (if different) target tables from json files."""
+    languages: list[dict] = []
+    for path in paths:
+        with open(path, encoding='utf-8') as infile:
+            languages.append(json.loads(infile.read()))
+
+    lfull = AttrDict()
+    for lmod in languages:
+        _add_to_attr_dict(lfull, lmod)
+    if len(languages) == 1:
+        return _LanguageTable.compile(lfull), None
+
+    langtarget = AttrDict()
+    _add_to_attr_dict(langtarget, languages[-1])
+    return _LanguageTable.compile(lfull), _LanguageTable.compile(langtarget)
+
+
+def _intern_key(value: Any) -> Any:
+    """Return a hashable key for Lstr.interned() args."""
+    if isinstance(value, Lstr):
+        return (Lstr, value._get_json())
+    if isinstance(value, dict):
+        return tuple(
+            sorted((key, _intern_key(val)) for key, val in value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_intern_key(val) for val in value)
+    return value
+
+
+# Lstr instances returned by Lstr.interned() keyed by their args.
+_interned_lstrs: weakref.WeakValueDictionary[Any, Lstr] = (
+    weakref.WeakValueDictionary()
+)
+
+
 def _add_to_attr_dict(dst: AttrDict, src: dict) -> None:
     for key, value in list(src.items()):
         if isinstance(value, dict):
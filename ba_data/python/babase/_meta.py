@@ -5,10 +5,11 @@
 from __future__ import annotations
 
 import os
+import json
 import time
 import logging
 from pathlib import Path
-from threading import Thread
+from threading import Thread, Event
 from functools import partial
 from typing import TYPE_CHECKING, TypeVar
 from dataclasses import dataclass, field
@@ -31,6 +32,14 @@ EXPORT_CLASS_NAME_SHORTCUTS: dict[str, str] = {
 
 T = TypeVar('T')
 
+# Bump this if the format of the meta-scan cache changes.
+_SCAN_CACHE_VERSION = 1
+
+# Files modified this recently (relative to when the scan cache is
+# written) are left out of the cache; a same-size edit within the
+# filesystem's mtime granularity could otherwise go unnoticed.
+_SCAN_CACHE_RACY_WINDOW_NS = 2_000_000_000
+
 
 @dataclass
 class ScanResults:
@@ -61,6 +70,7 @@ class MetadataSubsystem:
 
         # Results populated once scan is complete.
         self.scanresults: ScanResults | None = None
+        self._scanresults_event = Event()
 
         self._scan_complete_cb: Callable[[], None] | None = None
 
@@ -84,7 +94,10 @@ class MetadataSubsystem:
                     env.python_directory_user,
                 ]
                 if path is not None
-            ]
+            ],
+            cache_path=Path(
+                _babase.get_volatile_data_directory(), 'metascan_cache.json'
+            ),
         )
 
         Thread(target=self._run_scan_in_bg, daemon=True).start()
@@ -163,13 +176,9 @@ class MetadataSubsystem:
 
             # Now wait a bit for the scan to complete.
             # Eventually error though if it doesn't.
-            starttime = time.time()
-            while self.scanresults is None:
-                time.sleep(0.05)
-                if time.time() - starttime > 10.0:
-                    raise TimeoutError(
-                        'timeout waiting for meta scan to complete.'
-                    )
+            if not self._scanresults_event.wait(timeout=10.0):
+                raise TimeoutError('timeout waiting for meta scan to complete.')
+        assert self.scanresults is not None
         return self.scanresults
 
     def _run_scan_in_bg(self) -> None:
@@ -185,6 +194,7 @@ class MetadataSubsystem:
 
         # Place results and tell the logic thread they're ready.
         self.scanresults = results
+        self._scanresults_event.set()
         _babase.pushcall(self._handle_scan_results, from_other_thread=True)
 
     def _handle_scan_results(self) -> None:
@@ -243,32 +253,51 @@ class MetadataSubsystem:
 class DirectoryScan:
     """Scans directories for metadata."""
 
-    def __init__(self, paths: list[str]):
+    def __init__(self, paths: list[str], cache_path: Path | None = None):
         """Given one or more paths, parses available meta information.
 
         It is assumed that these paths are also in PYTHONPATH.
         It is also assumed that any subdirectories are Python packages.
+
+        If 'cache_path' is passed, the ba_meta tags found in each file
+        are stored there keyed by file path, size, and mtime, and only
+        files that have changed since are re-read on subsequent scans.
         """
 
         # Skip non-existent paths completely.
         self.base_paths = [Path(p) for p in paths if os.path.isdir(p)]
         self.extra_paths: list[Path] = []
         self.extra_paths_set = False
+        self._extra_paths_event = Event()
         self.results = ScanResults()
+        self._cache_path = cache_path
+
+        # File info from the previous scan and from this one, keyed by
+        # file path: [size, mtime_ns, [[lineindex, tokens, classname]]]
+        self._cache_in: dict[str, list] = {}
+        self._cache_out: dict[str, list] = {}
+        self._files_read = 0
 
     def set_extras(self, paths: list[str]) -> None:
         """Set extra portion."""
         # Skip non-existent paths completely.
         self.extra_paths += [Path(p) for p in paths if os.path.isdir(p)]
         self.extra_paths_set = True
+        self._extra_paths_event.set()
 
     def run(self) -> None:
         """Do the thing."""
+        starttime = time.monotonic()
+        if self._cache_path is not None:
+            self._load_cache(self._cache_path)
+
         for pathlist in [self.base_paths, self.extra_paths]:
-            # Spin and wait until extra paths are provided before doing them.
+            # Wait until extra paths are provided before doing them.
             if pathlist is self.extra_paths:
-                while not self.extra_paths_set:
-                    time.sleep(0.001)
+                # (don't count time spent waiting on the app)
+                waitstart = time.monotonic()
+                self._extra_paths_event.wait()
+                starttime += time.monotonic() - waitstart
 
             modules: list[tuple[Path, Path]] = []
             for path in pathlist:
@@ -283,6 +312,96 @@ class DirectoryScan:
         for exportlist in self.results.exports.values():
             exportlist.sort()
 
+        if self._cache_path is not None:
+            self._save_cache(self._cache_path)
+
+        logging.debug(
+            'metascan: scanned %d modules (%d read, %d cached) in %.3fs.',
+            len(self._cache_out),
+            self._files_read,
+            len(self._cache_out) - self._files_read,
+            time.monotonic() - starttime,
+        )
+
+    def _load_cache(self, path: Path) -> None:
+        try:
+            with open(path, encoding='utf-8') as infile:
+                cache = json.load(infile)
+            if cache.get('v') == _SCAN_CACHE_VERSION:
+                files = cache['f']
+                assert isinstance(files, dict)
+                self._cache_in = files
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # A busted cache just means we read everything.
+            logging.warning(
+                'metascan: Error loading cache at %s; ignoring.',
+                path,
+                exc_info=True,
+            )
+
+    def _save_cache(self, path: Path) -> None:
+        cutoff = time.time_ns() - _SCAN_CACHE_RACY_WINDOW_NS
+        files = {
+            fpath: entry
+            for fpath, entry in self._cache_out.items()
+            if entry[1] < cutoff
+        }
+        # No need to write anything if nothing changed.
+        if files == self._cache_in:
+            return
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            tmppath = f'{path}.tmp'
+            with open(tmppath, 'w', encoding='utf-8') as outfile:
+                json.dump(
+                    {'v': _SCAN_CACHE_VERSION, 'f': files},
+                    outfile,
+                    separators=(',', ':'),
+                )
+            os.replace(tmppath, path)
+        except Exception:
+            logging.warning(
+                'metascan: Error writing cache at %s.', path, exc_info=True
+            )
+
+    def _get_module_meta(
+        self, fpath: Path
+    ) -> tuple[dict[int, list[str]], dict[int, str | None]]:
+        """Return ba_meta lines and the class names defined below them.
+
+        Both are keyed by line index. Files unchanged since the last
+        scan are pulled from the cache instead of being read.
+        """
+        fpathstr = str(fpath)
+        fstat = os.stat(fpathstr)
+        entry = self._cache_in.get(fpathstr)
+        if (
+            entry is None
+            or entry[0] != fstat.st_size
+            or entry[1] != fstat.st_mtime_ns
+        ):
+            with fpath.open(encoding='utf-8') as infile:
+                flines = infile.readlines()
+            self._files_read += 1
+            entry = [
+                fstat.st_size,
+                fstat.st_mtime_ns,
+                [
+                    [lnum, l[1:].split(), self._get_class_name(flines, lnum)]
+                    for lnum, l in enumerate(flines)
+                    if '# ba_meta ' in l
+                ],
+            ]
+        self._cache_out[fpathstr] = entry
+        meta_lines: dict[int, list[str]] = {}
+        class_names: dict[int, str | None] = {}
+        for lnum, mline, classname in entry[2]:
+            meta_lines[lnum] = mline
+            class_names[lnum] = classname
+        return meta_lines, class_names
+
     def _get_path_module_entries(
         self, path: Path, subpath: str | Path, modules: list[tuple[Path, Path]]
     ) -> None:
@@ -322,13 +441,7 @@ class DirectoryScan:
         else:
             fpath = Path(moduledir, subpath, '__init__.py')
             ispackage = True
-        with fpath.open(encoding='utf-8') as infile:
-            flines = infile.readlines()
-        meta_lines = {
-            lnum: l[1:].split()
-            for lnum, l in enumerate(flines)
-            if '# ba_meta ' in l
-        }
+        meta_lines, class_names = self._get_module_meta(fpath)
         is_top_level = len(subpath.parts) <= 1
         required_api = self._get_api_requirement(
             subpath, meta_lines, is_top_level
@@ -357,7 +470,7 @@ class DirectoryScan:
             return
 
         # Ok; can proceed with a full scan of this module.
-        self._process_module_meta_tags(subpath, flines, meta_lines)
+        self._process_module_meta_tags(subpath, meta_lines, class_names)
 
         # If its a package, recurse into its subpackages.
         if ispackage:
@@ -377,7 +490,10 @@ class DirectoryScan:
         return '.'.join(subpath.parts).removesuffix('.py')
 
     def _process_module_meta_tags(
-        self, subpath: Path, flines: list[str], meta_lines: dict[int, list[str]]
+        self,
+        subpath: Path,
+        meta_lines: dict[int, list[str]],
+        class_names: dict[int, str | None],
     ) -> None:
         """Pull data from a module based on its ba_meta tags."""
         for lindex, mline in meta_lines.items():
@@ -408,10 +524,16 @@ class DirectoryScan:
                 # Looks like we've got a valid export line!
                 modulename = self._module_name_for_subpath(subpath)
                 exporttypestr = mline[2]
-                export_class_name = self._get_export_class_name(
-                    subpath, flines, lindex
-                )
-                if export_class_name is not None:
+                export_class_name = class_names[lindex]
+                if export_class_name is None:
+                    logging.warning(
+                        'metascan: %s:%d: class definition not found below'
+                        " 'ba_meta export' statement.",
+                        subpath,
+                        lindex + 1,
+                    )
+                    self.results.announce_errors_occurred = True
+                else:
                     classname = modulename + '.' + export_class_name
 
                     # Migrating away from the 'keyboard' name shortcut
@@ -436,11 +558,9 @@ class DirectoryScan:
                         classname
                     )
 
-    def _get_export_class_name(
-        self, subpath: Path, lines: list[str], lindex: int
-    ) -> str | None:
+    @staticmethod
+    def _get_class_name(lines: list[str], lindex: int) -> str | None:
         """Given line num of an export tag, returns its operand class name."""
-        lindexorig = lindex
         classname = None
         while True:
             lindex += 1
@@ -456,14 +576,6 @@ class DirectoryScan:
                 if len(cbits) > 1 and cbits[0].isidentifier():
                     classname = cbits[0]
                     break  # Success!
-        if classname is None:
-            logging.warning(
-                'metascan: %s:%d: class definition not found below'
-                " 'ba_meta export' statement.",
-                subpath,
-                lindexorig + 1,
-            )
-            self.results.announce_errors_occurred = True
         return classname
 
     def _get_api_requirement(
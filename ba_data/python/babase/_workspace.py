@@ -6,13 +6,16 @@ from __future__ import annotations
 
 import os
 import sys
+import time
+import shutil
 import logging
 from pathlib import Path
 from threading import Thread
 from functools import partial
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from efro.error import CleanError
+from efro.error import CleanError, CommunicationError
 import _babase
 import bacommon.cloud
 from bacommon.transfer import DirectoryManifest
@@ -22,6 +25,37 @@ if TYPE_CHECKING:
 
     import babase
 
+# How many times we retry a fetch that failed due to communication
+# issues before giving up on a sync.
+_FETCH_RETRY_COUNT = 3
+
+# How many syncs in a row can fail while resuming from a saved fetch
+# state before we throw that state out and start from scratch.
+_RESUME_FAILURE_LIMIT = 3
+
+
+@dataclass
+class WorkspaceSyncStats:
+    """Progress/throughput stats for a workspace sync.
+
+    Category: **App Classes**
+    """
+
+    iterations: int = 0
+    downloads: int = 0
+    download_bytes: int = 0
+    deletes: int = 0
+    fetch_retries: int = 0
+    fetch_duration: float = 0.0
+    apply_duration: float = 0.0
+
+    @property
+    def apply_throughput(self) -> float:
+        """Bytes per second written while applying downloads."""
+        if self.apply_duration <= 0.0:
+            return 0.0
+        return self.download_bytes / self.apply_duration
+
 
 class WorkspaceSubsystem:
     """Subsystem for workspace handling in the app.
@@ -29,10 +63,25 @@ class WorkspaceSubsystem:
     Category: **App Classes**
 
     Access the single shared instance of this class at `ba.app.workspaces`.
+
+    Downloaded files are written to a staging dir and moved into place
+    atomically, so an interrupted sync never leaves partial files
+    behind. If a sync fails partway through, the next activation of
+    the same workspace by the same account resumes from the last fetch
+    state instead of starting over.
     """
 
     def __init__(self) -> None:
-        pass
+        # Fetch state to resume from per (account-id, workspace-id) (for
+        # syncs that failed partway through), and how many syncs in a
+        # row have failed with it.
+        self._resume_states: dict[
+            tuple[str, str], bacommon.cloud.WorkspaceFetchState
+        ] = {}
+        self._resume_failures: dict[tuple[str, str], int] = {}
+
+        # Stats for the most recent sync per workspace-id.
+        self.sync_stats: dict[str, WorkspaceSyncStats] = {}
 
     def set_active_workspace(
         self,
@@ -82,6 +131,7 @@ class WorkspaceSubsystem:
         wspath = Path(
             _babase.get_volatile_data_directory(), 'workspaces', workspaceid
         )
+        resumekey = (account.accountid, workspaceid)
         try:
             # If it seems we're offline, don't even attempt a sync,
             # but allow using the previous synced state.
@@ -89,20 +139,36 @@ class WorkspaceSubsystem:
             if not plus.cloud.is_connected():
                 raise _SkipSyncError()
 
-            manifest = DirectoryManifest.create_from_disk(wspath)
+            stats = self.sync_stats[workspaceid] = WorkspaceSyncStats()
+            state = self._resume_states.get(resumekey)
+            if state is None:
+                # Keep our hash cache next to (not in) the workspace so
+                # it doesn't become part of the manifest.
+                manifest = DirectoryManifest.create_from_disk(
+                    wspath,
+                    cache_path=wspath.with_name(
+                        f'{workspaceid}.manifestcache'
+                    ),
+                )
 
-            # FIXME: Should implement a way to pass account credentials in
-            # from the logic thread.
-            state = bacommon.cloud.WorkspaceFetchState(manifest=manifest)
+                # FIXME: Should implement a way to pass account
+                # credentials in from the logic thread.
+                state = bacommon.cloud.WorkspaceFetchState(manifest=manifest)
+            else:
+                logging.info(
+                    "Resuming sync of workspace '%s' at iteration %d.",
+                    workspacename,
+                    state.iteration,
+                )
 
             while True:
-                with account:
-                    response = plus.cloud.send_message(
-                        bacommon.cloud.WorkspaceFetchMessage(
-                            workspaceid=workspaceid, state=state
-                        )
-                    )
+                # Applying a fetch response is idempotent, so if
+                # anything fails from here on out we can pick back up
+                # by re-sending this same state.
+                self._resume_states[resumekey] = state
+                response = self._fetch(account, workspaceid, state, stats)
                 state = response.state
+                starttime = time.monotonic()
                 self._handle_deletes(
                     workspace_dir=wspath, deletes=response.deletes
                 )
@@ -110,6 +176,23 @@ class WorkspaceSubsystem:
                     workspace_dir=wspath,
                     downloads_inline=response.downloads_inline,
                 )
+                stats.apply_duration += time.monotonic() - starttime
+                stats.iterations += 1
+                stats.deletes += len(response.deletes)
+                stats.downloads += len(response.downloads_inline)
+                stats.download_bytes += sum(
+                    len(d) for d in response.downloads_inline.values()
+                )
+                logging.debug(
+                    "Workspace '%s' sync iteration %d: %d downloads,"
+                    ' %d deletes (%.1f KB total at %.1f KB/s).',
+                    workspacename,
+                    state.iteration,
+                    len(response.downloads_inline),
+                    len(response.deletes),
+                    stats.download_bytes / 1024,
+                    stats.apply_throughput / 1024,
+                )
                 if response.done:
                     # Server only deals in files; let's clean up any
                     # leftover empty dirs after the dust has cleared.
@@ -117,6 +200,21 @@ class WorkspaceSubsystem:
                     break
                 state.iteration += 1
 
+            self._clear_resume_state(resumekey)
+            logging.info(
+                "Synced workspace '%s' in %d iteration(s):"
+                ' %d downloads (%.1f KB), %d deletes;'
+                ' fetch %.2fs, apply %.2fs (%.1f KB/s).',
+                workspacename,
+                stats.iterations,
+                stats.downloads,
+                stats.download_bytes / 1024,
+                stats.deletes,
+                stats.fetch_duration,
+                stats.apply_duration,
+                stats.apply_throughput / 1024,
+            )
+
             _babase.pushcall(
                 partial(
                     self._successmsg,
@@ -144,6 +242,10 @@ class WorkspaceSubsystem:
             # Avoid reusing existing if we fail in the middle; could
             # be in wonky state.
             set_path = False
+
+            # The server turned us down outright; resending the same
+            # state won't go any better.
+            self._clear_resume_state(resumekey)
             _babase.pushcall(
                 partial(self._errmsg, Lstr(value=str(exc))),
                 from_other_thread=True,
@@ -152,6 +254,18 @@ class WorkspaceSubsystem:
             # Ditto.
             set_path = False
             logging.exception("Error syncing workspace '%s'.", workspacename)
+            if resumekey in self._resume_states:
+                failures = self._resume_failures.get(resumekey, 0) + 1
+                if failures >= _RESUME_FAILURE_LIMIT:
+                    logging.info(
+                        "Workspace '%s' sync failed %d times in a row;"
+                        ' next sync will start from scratch.',
+                        workspacename,
+                        failures,
+                    )
+                    self._clear_resume_state(resumekey)
+                else:
+                    self._resume_failures[resumekey] = failures
             _babase.pushcall(
                 partial(
                     self._errmsg,
@@ -172,13 +286,58 @@ class WorkspaceSubsystem:
         # Job's done!
         _babase.pushcall(on_completed, from_other_thread=True)
 
+    def _clear_resume_state(self, resumekey: tuple[str, str]) -> None:
+        self._resume_states.pop(resumekey, None)
+        self._resume_failures.pop(resumekey, None)
+
+    def _fetch(
+        self,
+        account: babase.AccountV2Handle,
+        workspaceid: str,
+        state: bacommon.cloud.WorkspaceFetchState,
+        stats: WorkspaceSyncStats,
+    ) -> bacommon.cloud.WorkspaceFetchResponse:
+        """Fetch a workspace sync iteration, retrying on comm errors."""
+        plus = _babase.app.plus
+        assert plus is not None
+
+        attempt = 0
+        while True:
+            starttime = time.monotonic()
+            try:
+                with account:
+                    return plus.cloud.send_message(
+                        bacommon.cloud.WorkspaceFetchMessage(
+                            workspaceid=workspaceid, state=state
+                        )
+                    )
+            except CommunicationError:
+                attempt += 1
+                if attempt > _FETCH_RETRY_COUNT:
+                    raise
+                stats.fetch_retries += 1
+                time.sleep(float(attempt))
+            finally:
+                stats.fetch_duration += time.monotonic() - starttime
+
     def _handle_deletes(self, workspace_dir: Path, deletes: list[str]) -> None:
         """Handle file deletes."""
-        for fname in deletes:
+
+        def _delete(fname: str) -> None:
             fname = os.path.join(workspace_dir, fname)
             # Server shouldn't be sending us dir paths here.
             assert not os.path.isdir(fname)
-            os.unlink(fname)
+            try:
+                os.unlink(fname)
+            except FileNotFoundError:
+                # Can happen when resuming an interrupted sync.
+                pass
+
+        if len(deletes) < 2:
+            for fname in deletes:
+                _delete(fname)
+            return
+        list(_babase.app.threadpool.map(_delete, deletes))
 
     def _handle_downloads_inline(
         self,
@@ -186,22 +345,50 @@ class WorkspaceSubsystem:
         downloads_inline: dict[str, bytes],
     ) -> None:
         """Handle inline file data to be saved to the client."""
-        for fname, fdata in downloads_inline.items():
+        if not downloads_inline:
+            return
+
+        # Files get written to a staging dir alongside the workspace
+        # (so on the same filesystem) and then renamed into place, so
+        # nothing in the workspace is ever partially written.
+        staging_dir = workspace_dir.with_name(f'{workspace_dir.name}.staging')
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        dirnames: set[str] = set()
+        for fname in downloads_inline:
             fname = os.path.join(workspace_dir, fname)
             # If there's a directory where we want our file to go, clear it
             # out first. File deletes should have run before this so
             # everything under it should be empty and thus killable via rmdir.
             if os.path.isdir(fname):
-                for basename, dirnames, _fn in os.walk(fname, topdown=False):
-                    for dirname in dirnames:
-                        os.rmdir(os.path.join(basename, dirname))
+                for basename, subdirs, _fn in os.walk(fname, topdown=False):
+                    for subdir in subdirs:
+                        os.rmdir(os.path.join(basename, subdir))
                 os.rmdir(fname)
+            dirnames.add(os.path.dirname(fname))
 
-            dirname = os.path.dirname(fname)
+        # Create each needed dir just once (makedirs covers parents).
+        for dirname in sorted(dirnames):
             if dirname:
                 os.makedirs(dirname, exist_ok=True)
-            with open(fname, 'wb') as outfile:
+
+        def _write(item: tuple[int, tuple[str, bytes]]) -> None:
+            index, (fname, fdata) = item
+            tmpname = os.path.join(staging_dir, str(index))
+            with open(tmpname, 'wb') as outfile:
                 outfile.write(fdata)
+            os.replace(tmpname, os.path.join(workspace_dir, fname))
+
+        try:
+            items = enumerate(downloads_inline.items())
+            if len(downloads_inline) < 2:
+                for item in items:
+                    _write(item)
+            else:
+                list(_babase.app.threadpool.map(_write, items))
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
 
     def _handle_dir_prune_empty(self, prunedir: str) -> None:
         """Handle pruning empty directories."""
@@ -81,6 +81,9 @@ class AchievementSubsystem:
         self.achievement_display_timer: bascenev1.BaseTimer | None = None
         self.last_achievement_display_time: float = 0.0
         self.achievement_completion_banner_slots: set[int] = set()
+        self._achievements_by_name: dict[str, Achievement] = {}
+        self._achievements_by_level: dict[str, list[Achievement]] = {}
+        self._coop_level_achievements: dict[str, list[Achievement]] = {}
         self._init_achievements()
 
     def _init_achievements(self) -> None:
@@ -510,6 +513,15 @@ class AchievementSubsystem:
             )
         )
 
+        # Index everything for quick lookups; this list doesn't change
+        # after this point.
+        for ach in achs:
+            assert ach.name not in self._achievements_by_name
+            self._achievements_by_name[ach.name] = ach
+            self._achievements_by_level.setdefault(ach.level_name, []).append(
+                ach
+            )
+
     def award_local_achievement(self, achname: str) -> None:
         """For non-game-based achievements such as controller-connection."""
         plus = babase.app.plus
@@ -564,19 +576,29 @@ class AchievementSubsystem:
         # us which achievements we currently have.  We always defer to them,
         # even if that means we have to un-set an achievement we think we have.
 
+        # Build the new state in one go (this can be a long list) and
+        # only hit the disk if the set of completed ones changed. (The
+        # stored state also picks up {'Complete': False} entries as
+        # achievements get looked at, so we can't just compare dicts.)
+        completed = {self.get_achievement(a_name).name for a_name in achs}
         cfg = babase.app.config
-        cfg['Achievements'] = {}
-        for a_name in achs:
-            self.get_achievement(a_name).set_complete(True)
-        cfg.commit()
+        current = cfg.get('Achievements')
+        if not isinstance(current, dict) or completed != {
+            name
+            for name, val in current.items()
+            if isinstance(val, dict) and val.get('Complete')
+        }:
+            cfg['Achievements'] = {
+                name: {'Complete': True} for name in completed
+            }
+            cfg.commit()
 
     def get_achievement(self, name: str) -> Achievement:
         """Return an Achievement by name."""
-        achs = [a for a in self.achievements if a.name == name]
-        assert len(achs) < 2
-        if not achs:
+        ach = self._achievements_by_name.get(name)
+        if ach is None:
             raise ValueError("Invalid achievement name: '" + name + "'")
-        return achs[0]
+        return ach
 
     def achievements_for_coop_level(self, level_name: str) -> list[Achievement]:
         """Given a level name, return achievements available for it."""
@@ -584,12 +606,20 @@ class AchievementSubsystem:
         # For the Easy campaign we return achievements for the Default
         # campaign too. (want the user to see what achievements are part of the
         # level even if they can't unlock them all on easy mode).
-        return [
-            a
-            for a in self.achievements
-            if a.level_name
-            in (level_name, level_name.replace('Easy', 'Default'))
-        ]
+        achs = self._coop_level_achievements.get(level_name)
+        if achs is None:
+            level_names = dict.fromkeys(
+                (level_name, level_name.replace('Easy', 'Default'))
+            )
+            achs = self._coop_level_achievements[level_name] = sorted(
+                (
+                    a
+                    for lname in level_names
+                    for a in self._achievements_by_level.get(lname, ())
+                ),
+                key=self.achievements.index,
+            )
+        return list(achs)
 
     def _test(self) -> None:
         """For testing achievement animations."""
@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 import os
+import stat
 from pathlib import Path
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Annotated
@@ -14,6 +15,11 @@ from efro.dataclassio import ioprepped, IOAttrs
 if TYPE_CHECKING:
     pass
 
+# Files modified this recently (relative to when a manifest cache is
+# written) are left out of the cache; a same-size write within the
+# filesystem's mtime granularity could otherwise go unnoticed.
+_MANIFEST_CACHE_RACY_WINDOW_NS = 2_000_000_000
+
 
 @ioprepped
 @dataclass
@@ -36,9 +42,16 @@ class DirectoryManifest:
     exists: Annotated[bool, IOAttrs('e', soft_default=True)]
 
     @classmethod
-    def create_from_disk(cls, path: Path) -> DirectoryManifest:
-        """Create a manifest from a directory on disk."""
-        import hashlib
+    def create_from_disk(
+        cls, path: Path, cache_path: Path | None = None
+    ) -> DirectoryManifest:
+        """Create a manifest from a directory on disk.
+
+        If 'cache_path' is passed, file hashes are stored there keyed by
+        path along with file size, mtime, and inode, and files whose
+        stats match the cache on subsequent calls are not rehashed.
+        The cache file should live outside of 'path'.
+        """
         from concurrent.futures import ThreadPoolExecutor
 
         pathstr = str(path)
@@ -59,30 +72,54 @@ class DirectoryManifest:
             # Just return a single file entry if path is not a dir.
             paths.append(path.as_posix())
 
-        def _get_file_info(filepath: str) -> tuple[str, DirectoryManifestFile]:
-            sha = hashlib.sha256()
+        cache = (
+            {} if cache_path is None else _load_manifest_cache(cache_path)
+        )
+
+        def _get_file_info(
+            filepath: str,
+        ) -> tuple[str, _ManifestCacheEntry]:
             fullfilepath = os.path.join(pathstr, filepath)
-            if not os.path.isfile(fullfilepath):
+            try:
+                fstat = os.stat(fullfilepath)
+            except FileNotFoundError:
+                fstat = None
+            if fstat is None or not stat.S_ISREG(fstat.st_mode):
                 raise RuntimeError(f'File not found: "{fullfilepath}".')
-            with open(fullfilepath, 'rb') as infile:
-                filebytes = infile.read()
-                filesize = len(filebytes)
-                sha.update(filebytes)
-            return (
-                filepath,
-                DirectoryManifestFile(
-                    hash_sha256=sha.hexdigest(), size=filesize
-                ),
-            )
+            entry = cache.get(filepath)
+            if (
+                entry is None
+                or entry.size != fstat.st_size
+                or entry.mtime_ns != fstat.st_mtime_ns
+                or entry.inode != fstat.st_ino
+            ):
+                entry = _ManifestCacheEntry(
+                    hash_sha256=_hash_file(fullfilepath),
+                    size=fstat.st_size,
+                    mtime_ns=fstat.st_mtime_ns,
+                    inode=fstat.st_ino,
+                )
+            return filepath, entry
 
         # Now use all procs to hash the files efficiently.
         cpus = os.cpu_count()
         if cpus is None:
             cpus = 4
         with ThreadPoolExecutor(max_workers=cpus) as executor:
-            return cls(
-                files=dict(executor.map(_get_file_info, paths)), exists=exists
-            )
+            entries = dict(executor.map(_get_file_info, paths))
+
+        if cache_path is not None:
+            _save_manifest_cache(cache_path, entries)
+
+        return cls(
+            files={
+                fpath: DirectoryManifestFile(
+                    hash_sha256=entry.hash_sha256, size=entry.size
+                )
+                for fpath, entry in entries.items()
+            },
+            exists=exists,
+        )
 
     def validate(self) -> None:
         """Log any odd data in the manifest; for debugging."""
@@ -107,3 +144,80 @@ class DirectoryManifest:
     #         sha = hashlib.sha256()
     #         cls._empty_hash = sha.hexdigest()
     #     return cls._empty_hash
+
+
+@ioprepped
+@dataclass
+class _ManifestCacheEntry:
+    """Cached hash for a file along with the stats it applies to."""
+
+    hash_sha256: Annotated[str, IOAttrs('h')]
+    size: Annotated[int, IOAttrs('s')]
+    mtime_ns: Annotated[int, IOAttrs('m')]
+    inode: Annotated[int, IOAttrs('i')]
+
+
+@ioprepped
+@dataclass
+class _ManifestCache:
+    """Persistent file hash cache for DirectoryManifest.create_from_disk."""
+
+    entries: Annotated[dict[str, _ManifestCacheEntry], IOAttrs('e')]
+
+
+def _hash_file(path: str) -> str:
+    """Return the sha256 of a file, streaming its contents."""
+    import hashlib
+
+    with open(path, 'rb') as infile:
+        return hashlib.file_digest(infile, 'sha256').hexdigest()
+
+
+def _load_manifest_cache(path: Path) -> dict[str, _ManifestCacheEntry]:
+    from efro.dataclassio import dataclass_from_json
+
+    try:
+        with open(path, encoding='utf-8') as infile:
+            return dataclass_from_json(_ManifestCache, infile.read()).entries
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # A missing or busted cache just means we rehash everything.
+        import logging
+
+        logging.warning(
+            'Error loading manifest cache at %s; ignoring.',
+            path,
+            exc_info=True,
+        )
+    return {}
+
+
+def _save_manifest_cache(
+    path: Path, entries: dict[str, _ManifestCacheEntry]
+) -> None:
+    import time
+    from efro.dataclassio import dataclass_to_json
+
+    cutoff = time.time_ns() - _MANIFEST_CACHE_RACY_WINDOW_NS
+    cache = _ManifestCache(
+        entries={
+            fpath: entry
+            for fpath, entry in entries.items()
+            if entry.mtime_ns < cutoff
+        }
+    )
+    try:
+        # Write to a temp file and move it into place so an interrupted
+        # write never leaves a truncated cache behind.
+        os.makedirs(path.parent, exist_ok=True)
+        tmppath = f'{path}.tmp'
+        with open(tmppath, 'w', encoding='utf-8') as outfile:
+            outfile.write(dataclass_to_json(cache))
+        os.replace(tmppath, path)
+    except Exception:
+        import logging
+
+        logging.warning(
+            'Error writing manifest cache at %s.', path, exc_info=True
+        )
@@ -10,7 +10,7 @@ from typing import TYPE_CHECKING, overload
 import babase
 
 if TYPE_CHECKING:
-    from typing import Callable, Any
+    from typing import Callable, Any, Awaitable, Sequence
 
     from efro.message import Message, Response
     import bacommon.cloud
@@ -168,6 +168,20 @@ class CloudSubsystem(babase.AppSubsystem):
         """
         raise RuntimeError('Cloud functionality is not available.')
 
+    def send_messages_async(
+        self, msgs: Sequence[Message]
+    ) -> list[Awaitable[Response | None]]:
+        """Asynchronously send multiple messages to the cloud at once.
+
+        Returns an awaitable for each message which results in its
+        response (or raises its error). This default just sends each
+        message on its own; implementations with a batch-capable
+        sender (see efro.message.MessageSender.send_batch_async) can
+        send them all in a single round trip instead. Must be called
+        from the logic thread.
+        """
+        return [self.send_message_async(msg) for msg in msgs]
+
 
 def cloud_console_exec(code: str) -> None:
     """Called by the cloud console to run code in the logic thread."""
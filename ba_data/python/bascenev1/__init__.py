@@ -148,11 +148,11 @@ from _bascenev1 import (
 )
 from bascenev1._activity import Activity
 from bascenev1._activitytypes import JoinActivity, ScoreScreenActivity
-from bascenev1._actor import Actor
+from bascenev1._actor import Actor, messagehandler
 from bascenev1._appmode import SceneV1AppMode
 from bascenev1._campaign import init_campaigns, Campaign
 from bascenev1._collision import Collision, getcollision
-from bascenev1._coopgame import CoopGameActivity
+from bascenev1._coopgame import AchievementEvaluator, CoopGameActivity
 from bascenev1._coopsession import CoopSession
 from bascenev1._debug import print_live_object_warnings
 from bascenev1._dependency import (
@@ -168,9 +168,12 @@ from bascenev1._gameresults import GameResults
 from bascenev1._gameutils import (
     animate,
     animate_array,
+    AnimationCurve,
+    AnimationStats,
     BaseTime,
     cameraflash,
     GameTip,
+    get_animation_stats,
     get_trophy_string,
     show_damage_count,
     Time,
@@ -238,19 +241,24 @@ from bascenev1._settings import (
 )
 from bascenev1._session import (
     Session,
+    register_activity_preloader,
     set_player_rejoin_cooldown,
     set_max_players_override,
 )
 from bascenev1._stats import PlayerScoredMessage, PlayerRecord, Stats
 from bascenev1._team import SessionTeam, Team, EmptyTeam
 from bascenev1._teamgame import TeamGameActivity
+from bascenev1._timerwheel import TimerWheel, TimerWheelStats
 
 __all__ = [
+    'AchievementEvaluator',
     'Activity',
     'ActivityData',
     'Actor',
     'animate',
     'animate_array',
+    'AnimationCurve',
+    'AnimationStats',
     'app',
     'AppIntent',
     'AppIntentDefault',
@@ -315,6 +323,7 @@ __all__ = [
     'GameActivity',
     'GameResults',
     'GameTip',
+    'get_animation_stats',
     'get_chat_messages',
     'get_connection_to_host_info',
     'get_connection_to_host_info_2',
@@ -375,6 +384,7 @@ __all__ = [
     'Map',
     'Material',
     'Mesh',
+    'messagehandler',
     'MultiTeamSession',
     'MusicType',
     'new_host_session',
@@ -404,6 +414,7 @@ __all__ = [
     'printnodes',
     'protocol_version',
     'pushcall',
+    'register_activity_preloader',
     'register_map',
     'release_gamepad_input',
     'release_keyboard_input',
@@ -458,6 +469,8 @@ __all__ = [
     'Time',
     'timer',
     'Timer',
+    'TimerWheel',
+    'TimerWheelStats',
     'timestring',
     'UIScale',
     'UNHANDLED',
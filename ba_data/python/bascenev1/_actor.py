@@ -19,11 +19,42 @@ from bascenev1._messages import (
 )
 
 if TYPE_CHECKING:
-    from typing import Any, Literal
+    from typing import Any, Literal, Callable
 
     import bascenev1
 
 ActorT = TypeVar('ActorT', bound='Actor')
+HandlerT = TypeVar('HandlerT', bound='Callable[..., Any]')
+
+# Attr name used to tag methods registered via messagehandler().
+_HANDLER_TYPES_ATTR = '_actor_message_types'
+
+
+def messagehandler(*msgtypes: type) -> Callable[[HandlerT], HandlerT]:
+    """Register an Actor method as the handler for some message types.
+
+    Category: **Gameplay Functions**
+
+    bascenev1.Actor.handlemessage() looks up handlers by the message's
+    type (including its base classes) in a table built once per Actor
+    class, so adding handlers costs nothing for other message types.
+    Tables are inherited; subclasses can override a handler either by
+    redefining the method under the same name or by registering a new
+    method for the same type. A message with no registered handler
+    falls through to the default bascenev1.Actor.handlemessage() logic.
+
+    ##### Example
+    >>> class MyActor(bascenev1.Actor):
+    ...     @bascenev1.messagehandler(bascenev1.DieMessage)
+    ...     def _handle_die(self, msg: bascenev1.DieMessage) -> None:
+    ...         self.node.delete()
+    """
+
+    def _decorate(call: HandlerT) -> HandlerT:
+        setattr(call, _HANDLER_TYPES_ATTR, msgtypes)
+        return call
+
+    return _decorate
 
 
 class Actor:
@@ -76,6 +107,28 @@ class Actor:
     >>> self.flag.handlemessage(bascenev1.DieMessage())
     """
 
+    # Message-type to handler-method-name tables built by
+    # __init_subclass__ from bascenev1.messagehandler() registrations.
+    # The cache additionally holds lookups resolved through message base
+    # classes (or None). We store names rather than functions so that
+    # overrides and monkey-patches applied after class creation still
+    # take effect. A lookup here costs about as much as a few isinstance()
+    # checks; a type that used to sit first in an isinstance chain
+    # dispatches a bit slower, while everything further down (and
+    # anything unhandled) comes out well ahead.
+    _message_handlers: dict[type, str] = {}
+    _message_handler_cache: dict[type, str | None] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        handlers: dict[type, str] = {}
+        for base in reversed(cls.__mro__):
+            for name, attr in vars(base).items():
+                for msgtype in getattr(attr, _HANDLER_TYPES_ATTR, ()):
+                    handlers[msgtype] = name
+        cls._message_handlers = handlers
+        cls._message_handler_cache = dict(handlers)
+
     def __init__(self) -> None:
         """Instantiates an Actor in the current bascenev1.Activity."""
 
@@ -98,9 +151,27 @@ class Actor:
             )
 
     def handlemessage(self, msg: Any) -> Any:
-        """General message handling; can be passed any message object."""
+        """General message handling; can be passed any message object.
+
+        Messages are first routed to any handler registered for their
+        type via bascenev1.messagehandler().
+        """
         assert not self.expired
 
+        cls = type(self)
+        msgtype = type(msg)
+        try:
+            handler = cls._message_handler_cache[msgtype]
+        except KeyError:
+            handler = None
+            for basetype in msgtype.__mro__:
+                handler = cls._message_handlers.get(basetype)
+                if handler is not None:
+                    break
+            cls._message_handler_cache[msgtype] = handler
+        if handler is not None:
+            return getattr(self, handler)(msg)
+
         # By default, actors going out-of-bounds simply kill themselves.
         if isinstance(msg, OutOfBoundsMessage):
             return self.handlemessage(DieMessage(how=DeathType.OUT_OF_BOUNDS))
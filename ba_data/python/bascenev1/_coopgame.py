@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, TypeVar, override
 
 import babase
@@ -12,7 +13,7 @@ import _bascenev1
 from bascenev1._gameactivity import GameActivity
 
 if TYPE_CHECKING:
-    from typing import Sequence
+    from typing import Sequence, Callable, Hashable, Any
 
     from bascenev1lib.actor.playersilly import PlayerSilly
 
@@ -22,6 +23,113 @@ PlayerT = TypeVar('PlayerT', bound='bascenev1.Player')
 TeamT = TypeVar('TeamT', bound='bascenev1.Team')
 
 
+@dataclass
+class _AchievementRule:
+    achievement: str
+    count: int
+    delay: float
+    sound: bool
+
+
+class AchievementEvaluator:
+    """Awards achievements from a stream of game events.
+
+    Category: **Gameplay Classes**
+
+    Games register rules up front (an event key, an achievement, and how
+    many times the event needs to happen) and then simply feed events
+    as they occur. Rules are indexed by event and dropped once they
+    fire, so feeding events is cheap and never has to look achievements
+    up. One-off awards (completion achievements and the like) can be
+    passed in directly. Awards that come due together are handed to the
+    award call as one batch.
+    """
+
+    def __init__(self, award: Callable[[Sequence[str], bool], Any]) -> None:
+        self._award = award
+        self._rules: dict[Hashable, list[_AchievementRule]] = {}
+        self._counts: dict[Hashable, int] = {}
+        self._pending: dict[tuple[float, bool], list[str]] = {}
+
+    def add_rule(
+        self,
+        event: Hashable,
+        achievement: str,
+        count: int = 1,
+        delay: float = 0.0,
+        sound: bool = True,
+    ) -> None:
+        """Award an achievement once an event has been fed 'count' times.
+
+        The award happens 'delay' seconds after the final event.
+        """
+        assert count > 0
+        self._rules.setdefault(event, []).append(
+            _AchievementRule(achievement, count, delay, sound)
+        )
+
+    def feed(self, event: Hashable, amount: int = 1) -> None:
+        """Note that an event happened (possibly several times)."""
+        if event in self._rules:
+            self._update(event, self._counts.get(event, 0) + amount)
+
+    def feed_total(self, event: Hashable, total: int) -> None:
+        """Note a running total for an event (such as a score).
+
+        Rules for the event fire once the highest total fed reaches
+        their count.
+        """
+        if event in self._rules:
+            self._update(event, max(self._counts.get(event, 0), total))
+
+    def award(
+        self,
+        achievements: Sequence[str],
+        delay: float = 0.0,
+        sound: bool = True,
+    ) -> None:
+        """Award some achievements directly, as a single batch."""
+        for achievement in achievements:
+            self._queue(achievement, delay, sound)
+        self._flush_immediate()
+
+    def _update(self, event: Hashable, count: int) -> None:
+        self._counts[event] = count
+        remaining: list[_AchievementRule] = []
+        for rule in self._rules[event]:
+            if count >= rule.count:
+                self._queue(rule.achievement, rule.delay, rule.sound)
+            else:
+                remaining.append(rule)
+        if remaining:
+            self._rules[event] = remaining
+        else:
+            del self._rules[event]
+        self._flush_immediate()
+
+    def _queue(self, achievement: str, delay: float, sound: bool) -> None:
+        key = (delay, sound)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = []
+            if delay > 0.0:
+                _bascenev1.timer(delay, babase.WeakCall(self._flush, key))
+        pending.append(achievement)
+
+    def _flush_immediate(self) -> None:
+        for key in [k for k in self._pending if k[0] == 0.0]:
+            self._flush(key)
+
+    def _flush(self, key: tuple[float, bool]) -> None:
+        achievements = self._pending.pop(key, None)
+        if not achievements:
+            return
+        try:
+            self._award(achievements, key[1])
+        except Exception:
+            logging.exception('Error awarding %s.', achievements)
+
+
 class CoopGameActivity(GameActivity[PlayerT, TeamT]):
     """Base class for cooperative-mode games.
 
@@ -46,6 +154,12 @@ class CoopGameActivity(GameActivity[PlayerT, TeamT]):
         # Cache these for efficiency.
         self._achievements_awarded: set[str] = set()
 
+        # Subclasses can register achievement rules on this and feed it
+        # events instead of checking for achievements inline.
+        self.achievement_evaluator = AchievementEvaluator(
+            babase.WeakCall(self._award_achievements)
+        )
+
         self._life_warning_beep: bascenev1.Actor | None = None
         self._life_warning_beep_timer: bascenev1.Timer | None = None
         self._warn_beeps_sound = _bascenev1.getsound('warnBeeps')
@@ -158,42 +272,47 @@ class CoopGameActivity(GameActivity[PlayerT, TeamT]):
     def _award_achievement(
         self, achievement_name: str, sound: bool = True
     ) -> None:
-        """Award an achievement.
+        """Award an achievement."""
+        self._award_achievements([achievement_name], sound=sound)
 
-        Returns True if a banner will be shown;
-        False otherwise
+    def _award_achievements(
+        self, achievement_names: Sequence[str], sound: bool = True
+    ) -> None:
+        """Award a batch of achievements.
+
+        Anything new gets reported to the game service, added as an
+        account transaction and announced. The transactions get run
+        (and completion confirmed by the server) at the score screen.
         """
 
         classic = babase.app.classic
         plus = babase.app.plus
         if classic is None or plus is None:
             logging.warning(
-                '_award_achievement is a no-op without classic and plus.'
+                '_award_achievements is a no-op without classic and plus.'
             )
             return
 
-        if achievement_name in self._achievements_awarded:
-            return
-
-        ach = classic.ach.get_achievement(achievement_name)
-
-        # If we're in the easy campaign and this achievement is hard-mode-only,
-        # ignore it.
-        try:
-            campaign = self.session.campaign
-            assert campaign is not None
-            if ach.hard_mode_only and campaign.name == 'Easy':
-                return
-        except Exception:
-            logging.exception('Error in _award_achievement.')
-
-        # If we haven't awarded this one, check to see if we've got it.
-        # If not, set it through the game service *and* add a transaction
-        # for it.
-        if not ach.complete:
+        for achievement_name in achievement_names:
+            if achievement_name in self._achievements_awarded:
+                continue
+            ach = classic.ach.get_achievement(achievement_name)
+
+            # If we're in the easy campaign and this achievement is
+            # hard-mode-only, ignore it.
+            try:
+                campaign = self.session.campaign
+                assert campaign is not None
+                if ach.hard_mode_only and campaign.name == 'Easy':
+                    continue
+            except Exception:
+                logging.exception('Error in _award_achievements.')
+
+            if ach.complete:
+                continue
             self._achievements_awarded.add(achievement_name)
 
-            # Report new achievements to the game-service.
+            # Report new achievements to the game-service...
             plus.report_achievement(achievement_name)
 
             # ...and to our account.
@@ -11,7 +11,7 @@ import babase
 import _bascenev1
 
 if TYPE_CHECKING:
-    from typing import Sequence
+    from typing import Sequence, Any
 
     import bascenev1
 
@@ -47,63 +47,308 @@ def get_trophy_string(trophy_id: str) -> str:
     return '?'
 
 
+# Cap on cached keyframe tables (dropped wholesale when exceeded).
+_KEYFRAME_CACHE_SIZE = 512
+
+# How often (in seconds) pools check for finished or orphaned curves.
+_ANIM_SWEEP_INTERVAL = 1.0
+
+# Max idle curve rigs kept per pool for reuse.
+_ANIM_POOL_MAX_FREE = 64
+
+_keyframe_tables: dict[tuple, tuple[list[int], list[list[float]]]] = {}
+
+
+@dataclass
+class AnimationStats:
+    """Counters for the animation node pools behind bascenev1.animate.
+
+    Category: **Gameplay Classes**
+    """
+
+    curves_created: int = 0
+    curves_reused: int = 0
+    combines_created: int = 0
+    combines_reused: int = 0
+    released: int = 0
+    deleted: int = 0
+    table_hits: int = 0
+    table_misses: int = 0
+
+
+_animation_stats = AnimationStats()
+
+
+def get_animation_stats() -> AnimationStats:
+    """Return counters for animation node creation and reuse.
+
+    Category: **Gameplay Functions**
+    """
+    return _animation_stats
+
+
+def _get_keyframe_table(
+    keys: dict[float, Any], size: int | None
+) -> tuple[list[int], list[list[float]]]:
+    """Return (times-in-ms, per-component values) for a keyframe dict.
+
+    Tables are immutable once built and shared between calls with the
+    same keys (node attrs copy them on assignment).
+    """
+    if size is None:
+        cachekey: tuple = (None, *keys.items())
+    else:
+        cachekey = (size, *((t, tuple(v)) for t, v in keys.items()))
+    table = _keyframe_tables.get(cachekey)
+    if table is not None:
+        _animation_stats.table_hits += 1
+        return table
+    _animation_stats.table_misses += 1
+
+    items = sorted(keys.items())
+
+    # We take seconds but operate on milliseconds internally.
+    times = [int(1000 * time) for time, _val in items]
+    if size is None:
+        values = [[val for _time, val in items]]
+    else:
+        values = [[val[i] for _time, val in items] for i in range(size)]
+    if len(_keyframe_tables) >= _KEYFRAME_CACHE_SIZE:
+        _keyframe_tables.clear()
+    table = _keyframe_tables[cachekey] = (times, values)
+    return table
+
+
+class _CurveRig:
+    """A set of animcurve nodes (plus a combine for arrays)."""
+
+    def __init__(
+        self, curves: list[bascenev1.Node], combine: bascenev1.Node | None
+    ) -> None:
+        self.curves = curves
+        self.combine = combine
+        self.target: bascenev1.Node | None = None
+        self.expire_time: float | None = None
+
+        # Bumped each time we go back in the pool; AnimationCurve
+        # handles from earlier uses go stale at that point.
+        self.generation = 0
+
+    def exists(self) -> bool:
+        """Whether all our nodes are still alive."""
+        return all(self.curves) and (self.combine is None or bool(self.combine))
+
+    def delete(self) -> None:
+        """Kill all our nodes."""
+        for curve in self.curves:
+            if curve:
+                curve.delete()
+        if self.combine:
+            self.combine.delete()
+
+
+class AnimationCurve:
+    """A handle to the curve driving a bascenev1.animate() animation.
+
+    Category: **Gameplay Classes**
+
+    Curve nodes are pooled and handed out again once their target dies,
+    so this does not hold the node directly. It goes stale when the
+    curve is released, after which it no longer exists and deleting it
+    does nothing.
+    """
+
+    def __init__(self, rig: _CurveRig) -> None:
+        self._rig = rig
+        self._generation = rig.generation
+
+    @property
+    def node(self) -> bascenev1.Node | None:
+        """The animcurve node, or None if this handle has gone stale."""
+        if self.exists():
+            return self._rig.curves[0]
+        return None
+
+    def exists(self) -> bool:
+        """Whether the curve is still driving our animation."""
+        return self._rig.generation == self._generation and self._rig.exists()
+
+    def __bool__(self) -> bool:
+        return self.exists()
+
+    def delete(self) -> None:
+        """Stop the animation by killing its curve (if we still can)."""
+        if self.exists():
+            self._rig.delete()
+
+
+class _AnimationPool:
+    """Per-activity (or per-session) pool of animation nodes.
+
+    Curves are not owned by their targets so that once a target dies
+    they can be handed out again instead of dying along with it.
+    Finished non-looping curves on still-living targets get deleted in
+    batches by a periodic sweep.
+    """
+
+    _STORENAME = babase.storagename()
+
+    def __init__(self, globalsnode: bascenev1.Node) -> None:
+        self._globalsnode = globalsnode
+        self._active: list[_CurveRig] = []
+
+        # Idle rigs keyed by combine size (0 for single curves), and
+        # how many of each were asked for since the last sweep.
+        self._free: dict[int, list[_CurveRig]] = {}
+        self._demand: dict[int, int] = {}
+        self._sweep_timer: bascenev1.Timer | None = None
+
+    @classmethod
+    def get(cls) -> _AnimationPool:
+        """Get/create the pool for the current activity or session."""
+        # We operate in either activities or sessions..
+        host: bascenev1.Activity | bascenev1.Session
+        try:
+            host = _bascenev1.getactivity()
+            globalsnode = host.globalsnode
+        except babase.ActivityNotFoundError:
+            host = _bascenev1.getsession()
+            globalsnode = host.sessionglobalsnode
+        pool = host.customdata.get(cls._STORENAME)
+        if pool is None:
+            pool = host.customdata[cls._STORENAME] = _AnimationPool(
+                globalsnode
+            )
+        assert isinstance(pool, _AnimationPool)
+        return pool
+
+    def acquire(self, size: int) -> _CurveRig:
+        """Return a rig of 'size' curves (0 for a single bare curve)."""
+        self._demand[size] = self._demand.get(size, 0) + 1
+        free = self._free.get(size)
+        while free:
+            rig = free.pop()
+            if rig.exists():
+                if size:
+                    _animation_stats.combines_reused += 1
+                _animation_stats.curves_reused += len(rig.curves)
+                return rig
+        globalsnode = self._globalsnode
+        curves = []
+        for _i in range(max(1, size)):
+            curve = _bascenev1.newnode('animcurve', name='Pooled animcurve')
+            globalsnode.connectattr('time', curve, 'in')
+            curves.append(curve)
+        _animation_stats.curves_created += len(curves)
+        combine: bascenev1.Node | None = None
+        if size:
+            combine = _bascenev1.newnode('combine', attrs={'size': size})
+            for i, curve in enumerate(curves):
+                curve.connectattr('out', combine, 'input' + str(i))
+            _animation_stats.combines_created += 1
+        return _CurveRig(curves, combine)
+
+    def activate(
+        self, rig: _CurveRig, target: bascenev1.Node, duration: float | None
+    ) -> None:
+        """Start tracking a rig driving a target.
+
+        Pass a duration for non-looping rigs; they are deleted once
+        that much time has passed.
+        """
+        rig.target = target
+        rig.expire_time = (
+            None if duration is None else _bascenev1.time() + duration
+        )
+        self._active.append(rig)
+        if self._sweep_timer is None:
+            self._sweep_timer = _bascenev1.Timer(
+                _ANIM_SWEEP_INTERVAL, babase.WeakCall(self._sweep), repeat=True
+            )
+
+    def _sweep(self) -> None:
+        now = _bascenev1.time()
+        still_active: list[_CurveRig] = []
+        for rig in self._active:
+            if not rig.target:
+                # Target is gone so nothing is connected to us anymore;
+                # we can go back in the pool (looping or not).
+                rig.target = None
+                rig.generation += 1
+                size = 0 if rig.combine is None else len(rig.curves)
+                free = self._free.setdefault(size, [])
+                if rig.exists() and len(free) < _ANIM_POOL_MAX_FREE:
+                    free.append(rig)
+                    _animation_stats.released += 1
+                else:
+                    rig.delete()
+                    _animation_stats.deleted += 1
+            elif rig.expire_time is not None and now >= rig.expire_time:
+                # Done but still hooked up; deleting is the only way to
+                # let go of our target.
+                rig.delete()
+                _animation_stats.deleted += 1
+            elif not rig.exists():
+                # Someone killed us themselves.
+                rig.delete()
+            else:
+                still_active.append(rig)
+        self._active = still_active
+
+        # Don't hang on to more idle rigs than recently needed.
+        for size, free in self._free.items():
+            keep = min(_ANIM_POOL_MAX_FREE, self._demand.get(size, 0))
+            while len(free) > keep:
+                free.pop().delete()
+                _animation_stats.deleted += 1
+        self._demand.clear()
+
+        if not self._active:
+            self._sweep_timer = None
+
+
+def _active_duration(times: list[int], offset: float) -> float:
+    # Give a bit of slack past the last key so the final value is sure
+    # to get pushed through before we go away.
+    return max(0.0, times[-1] / 1000.0 + offset) + 1.0
+
+
 def animate(
     node: bascenev1.Node,
     attr: str,
     keys: dict[float, float],
     loop: bool = False,
     offset: float = 0,
-) -> bascenev1.Node:
+) -> AnimationCurve:
     """Animate values on a target bascenev1.Node.
 
     Category: **Gameplay Functions**
 
-    Creates an 'animcurve' node with the provided values and time as an input,
-    connect it to the provided attribute, and set it to die with the target.
-    Key values are provided as time:value dictionary pairs.  Time values are
-    relative to the current time. By default, times are specified in seconds,
-    but timeformat can also be set to MILLISECONDS to recreate the old behavior
-    (prior to ba 1.5) of taking milliseconds. Returns the animcurve node.
-    """
-    items = list(keys.items())
-    items.sort()
-
-    curve = _bascenev1.newnode(
-        'animcurve',
-        owner=node,
-        name='Driving ' + str(node) + ' \'' + attr + '\'',
-    )
-
-    # We take seconds but operate on milliseconds internally.
-    mult = 1000
+    Drives the attribute with an 'animcurve' node using the provided
+    values and time as an input. Key values are provided as time:value
+    dictionary pairs. Time values are relative to the current time and
+    specified in seconds. Returns a bascenev1.AnimationCurve handle.
 
-    curve.times = [int(mult * time) for time, val in items]
-    curve.offset = int(_bascenev1.time() * 1000.0) + int(mult * offset)
-    curve.values = [val for time, val in items]
+    Curve nodes are pooled; they are released once the target dies (even
+    when looping) or deleted a short while after a non-looping animation
+    completes. Callers may delete the returned handle to stop the
+    animation early; once the curve has been released the handle goes
+    stale and deleting it does nothing.
+    """
+    times, values = _get_keyframe_table(keys, None)
+    pool = _AnimationPool.get()
+    rig = pool.acquire(0)
+    curve = rig.curves[0]
+    curve.times = times
+    curve.offset = int(_bascenev1.time() * 1000.0) + int(1000 * offset)
+    curve.values = values[0]
     curve.loop = loop
 
-    # If we're not looping, set a timer to kill this curve
-    # after its done its job.
-    # FIXME: Even if we are looping we should have a way to die once we
-    #  get disconnected.
-    if not loop:
-        # noinspection PyUnresolvedReferences
-        _bascenev1.timer(
-            (int(mult * items[-1][0]) + 1000) / 1000.0, curve.delete
-        )
-
-    # Do the connects last so all our attrs are in place when we push initial
-    # values through.
-
-    # We operate in either activities or sessions..
-    try:
-        globalsnode = _bascenev1.getactivity().globalsnode
-    except babase.ActivityNotFoundError:
-        globalsnode = _bascenev1.getsession().sessionglobalsnode
-
-    globalsnode.connectattr('time', curve, 'in')
+    # Do the connect last so all our attrs are in place when we push
+    # initial values through.
     curve.connectattr('out', node, attr)
-    return curve
+    pool.activate(rig, node, None if loop else _active_duration(times, offset))
+    return AnimationCurve(rig)
 
 
 def animate_array(
@@ -120,55 +365,18 @@ def animate_array(
 
     Like bs.animate, but operates on array attributes.
     """
-    combine = _bascenev1.newnode('combine', owner=node, attrs={'size': size})
-    items = list(keys.items())
-    items.sort()
-
-    # We take seconds but operate on milliseconds internally.
-    mult = 1000
-
-    # We operate in either activities or sessions..
-    try:
-        globalsnode = _bascenev1.getactivity().globalsnode
-    except babase.ActivityNotFoundError:
-        globalsnode = _bascenev1.getsession().sessionglobalsnode
-
-    for i in range(size):
-        curve = _bascenev1.newnode(
-            'animcurve',
-            owner=node,
-            name=(
-                'Driving ' + str(node) + ' \'' + attr + '\' member ' + str(i)
-            ),
-        )
-        globalsnode.connectattr('time', curve, 'in')
-        curve.times = [int(mult * time) for time, val in items]
-        curve.values = [val[i] for time, val in items]
-        curve.offset = int(_bascenev1.time() * 1000.0) + int(mult * offset)
+    times, values = _get_keyframe_table(keys, size)
+    pool = _AnimationPool.get()
+    rig = pool.acquire(size)
+    curveoffset = int(_bascenev1.time() * 1000.0) + int(1000 * offset)
+    for i, curve in enumerate(rig.curves):
+        curve.times = times
+        curve.values = values[i]
+        curve.offset = curveoffset
         curve.loop = loop
-        curve.connectattr('out', combine, 'input' + str(i))
-
-        # If we're not looping, set a timer to kill this
-        # curve after its done its job.
-        if not loop:
-            # (PyCharm seems to think item is a float, not a tuple)
-            # noinspection PyUnresolvedReferences
-            _bascenev1.timer(
-                (int(mult * items[-1][0]) + 1000) / 1000.0,
-                curve.delete,
-            )
-    combine.connectattr('output', node, attr)
-
-    # If we're not looping, set a timer to kill the combine once
-    # the job is done.
-    # FIXME: Even if we are looping we should have a way to die
-    #  once we get disconnected.
-    if not loop:
-        # (PyCharm seems to think item is a float, not a tuple)
-        # noinspection PyUnresolvedReferences
-        _bascenev1.timer(
-            (int(mult * items[-1][0]) + 1000) / 1000.0, combine.delete
-        )
+    assert rig.combine is not None
+    rig.combine.connectattr('output', node, attr)
+    pool.activate(rig, node, None if loop else _active_duration(times, offset))
 
 
 def show_damage_count(
@@ -14,7 +14,7 @@ import _bascenev1
 from bascenev1._player import Player
 
 if TYPE_CHECKING:
-    from typing import Sequence, Any
+    from typing import Sequence, Any, Callable
 
     import bascenev1
 
@@ -26,6 +26,10 @@ _g_player_rejoin_cooldown: float = 0.0
 # overrides the session's decision of max_players
 _max_players_override: int | None = None
 
+# Calls run against an incoming activity while the previous one is
+# transitioning out (see register_activity_preloader()).
+_activity_preloaders: list[Callable[[bascenev1.Activity], None]] = []
+
 
 def set_player_rejoin_cooldown(cooldown: float) -> None:
     """Set the cooldown for individual players rejoining after leaving."""
@@ -39,6 +43,34 @@ def set_max_players_override(max_players: int | None) -> None:
     _max_players_override = max_players
 
 
+def register_activity_preloader(
+    call: Callable[[bascenev1.Activity], None]
+) -> None:
+    """Register a call to warm up resources for an incoming activity.
+
+    Category: **Gameplay Functions**
+
+    When a session switches activities, registered calls are run in the
+    incoming activity's context shortly after the outgoing activity
+    starts transitioning out. This lets factories and other shared
+    resources get built while the screen is fading instead of all at
+    once when the new activity begins.
+    """
+    if call not in _activity_preloaders:
+        _activity_preloaders.append(call)
+
+
+def _preload_activity(activityref: weakref.ref[bascenev1.Activity]) -> None:
+    activity = activityref()
+    if activity is None or activity.expired:
+        return
+    for call in list(_activity_preloaders):
+        try:
+            call(activity)
+        except Exception:
+            logging.exception('Error preloading for %s.', activity)
+
+
 class Session:
     """Defines a high level series of bascenev1.Activity-es.
 
@@ -574,6 +606,16 @@ class Session:
         if prev_activity is not None:
             prev_activity.transition_out()
 
+            # Warm up stuff the incoming activity will need while the
+            # outgoing one fades; this runs on its own sim step so it
+            # doesn't pile onto this one.
+            if _activity_preloaders:
+                with activity.context:
+                    _bascenev1.timer(
+                        0.0,
+                        babase.Call(_preload_activity, weakref.ref(activity)),
+                    )
+
             # Setting this to None should free up the old activity to die,
             # which will call begin_next_activity.
             # We can still access our old activity through
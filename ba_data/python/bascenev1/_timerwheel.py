@@ -0,0 +1,295 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Python-side timer wheel for lots of short-lived gameplay timers."""
+
+from __future__ import annotations
+
+import math
+import types
+import weakref
+import logging
+import functools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import babase
+
+import _bascenev1
+
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+    import bascenev1
+
+# Wheel geometry: an inner wheel of single ticks, an outer wheel of
+# inner-wheel rotations, and an unsorted overflow for anything further
+# out than that (at the default tick that's ~160 seconds).
+_INNER_BITS = 8
+_OUTER_BITS = 6
+_INNER_SIZE = 1 << _INNER_BITS
+_OUTER_SIZE = 1 << _OUTER_BITS
+_INNER_MASK = _INNER_SIZE - 1
+_OUTER_MASK = _OUTER_SIZE - 1
+_SPAN_BITS = _INNER_BITS + _OUTER_BITS
+
+
+@dataclass
+class TimerWheelStats:
+    """Counters for a bascenev1.TimerWheel.
+
+    Category: **Gameplay Classes**
+    """
+
+    scheduled: int = 0
+    fired: int = 0
+    cancelled: int = 0
+    dead: int = 0
+    errors: int = 0
+    ticks: int = 0
+    peak_live: int = 0
+
+
+class _Entry:
+    __slots__ = ['due', 'call', 'args', 'owner', 'handle', 'objref']
+
+    def __init__(
+        self,
+        due: int,
+        call: Callable[..., Any] | None,
+        args: tuple,
+        owner: str,
+        handle: int,
+        objref: weakref.ref | None,
+    ) -> None:
+        self.due = due
+        self.call = call
+        self.args = args
+        self.owner = owner
+        self.handle = handle
+        self.objref = objref
+
+
+class TimerWheel:
+    """Runs many short timers off a single repeating native timer.
+
+    Category: **Gameplay Classes**
+
+    Gameplay code tends to create lots of tiny one-shot timers (short
+    deferrals, delayed effects, etc). Rather than each of those being
+    its own native timer holding a Python callable, they can be
+    scheduled here; everything due on a tick is fired as a batch from
+    one bascenev1.Timer, which only runs while timers are pending.
+
+    Timers are rounded up to the next tick, so this is not the place
+    for anything needing finer timing than that. Use
+    bascenev1.TimerWheel.get() to return the shared wheel for the
+    current activity.
+    """
+
+    _STORENAME = babase.storagename()
+
+    def __init__(self, tick: float = 0.01) -> None:
+        assert tick > 0.0
+        self.tick = tick
+        self.stats = TimerWheelStats()
+        self._inner: list[list[_Entry]] = [[] for _ in range(_INNER_SIZE)]
+        self._outer: list[list[_Entry]] = [[] for _ in range(_OUTER_SIZE)]
+        self._overflow: list[_Entry] = []
+        self._entries: dict[int, _Entry] = {}
+        self._owner_counts: dict[str, int] = {}
+        self._next_handle = 1
+        self._ticknum = 0
+        self._timer: bascenev1.Timer | None = None
+
+        # Our driver timer always runs in the context we were made in.
+        self._context = babase.ContextRef()
+
+    @classmethod
+    def get(cls) -> TimerWheel:
+        """Get/create the shared bascenev1.TimerWheel for the activity."""
+        activity = _bascenev1.getactivity()
+        wheel = activity.customdata.get(cls._STORENAME)
+        if wheel is None:
+            wheel = activity.customdata[cls._STORENAME] = TimerWheel()
+        assert isinstance(wheel, TimerWheel)
+        return wheel
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(
+        self,
+        delay: float,
+        call: Callable[[], Any],
+        owner: str | None = None,
+    ) -> int:
+        """Schedule a call to run after a delay; returns a handle.
+
+        The owner name is used for instrumentation only (see
+        live_counts()); by default it is derived from the call.
+        """
+        if owner is None:
+            owner = _owner_name(call)
+        return self._add(delay, call, (), owner, None)
+
+    def schedule_weak(
+        self, delay: float, method: Callable[..., Any], *args: Any
+    ) -> int:
+        """Schedule a bound method without keeping its object alive.
+
+        Like scheduling a bascenev1.WeakCall, except that the timer
+        is cancelled as soon as the object dies instead of lingering
+        until it is due.
+        """
+        assert isinstance(method, types.MethodType)
+        obj = method.__self__
+        objref = weakref.ref(
+            obj, functools.partial(self._obj_died, self._next_handle)
+        )
+        return self._add(
+            delay, method.__func__, args, type(obj).__name__, objref
+        )
+
+    def cancel(self, handle: int) -> bool:
+        """Cancel a scheduled timer; returns whether it was pending."""
+        entry = self._entries.get(handle)
+        if entry is None:
+            return False
+        self._release(entry)
+        self.stats.cancelled += 1
+        return True
+
+    def live_counts(self) -> dict[str, int]:
+        """Return the number of pending timers per owner."""
+        return dict(self._owner_counts)
+
+    def _add(
+        self,
+        delay: float,
+        call: Callable[..., Any],
+        args: tuple,
+        owner: str,
+        objref: weakref.ref | None,
+    ) -> int:
+        if self._timer is None:
+            # We've been idle; pick the clock back up from now.
+            with self._context:
+                self._ticknum = math.floor(_bascenev1.time() / self.tick)
+                self._timer = _bascenev1.Timer(
+                    self.tick, babase.WeakCall(self._on_timer), repeat=True
+                )
+        handle = self._next_handle
+        self._next_handle += 1
+        due = self._ticknum + max(1, math.ceil(delay / self.tick))
+        entry = _Entry(due, call, args, owner, handle, objref)
+        self._entries[handle] = entry
+        self._owner_counts[owner] = self._owner_counts.get(owner, 0) + 1
+        self._place(entry)
+        self.stats.scheduled += 1
+        self.stats.peak_live = max(self.stats.peak_live, len(self._entries))
+        return handle
+
+    def _place(self, entry: _Entry) -> None:
+        due = entry.due
+        if due >> _INNER_BITS == self._ticknum >> _INNER_BITS:
+            self._inner[due & _INNER_MASK].append(entry)
+        elif due >> _SPAN_BITS == self._ticknum >> _SPAN_BITS:
+            self._outer[(due >> _INNER_BITS) & _OUTER_MASK].append(entry)
+        else:
+            self._overflow.append(entry)
+
+    def _release(self, entry: _Entry) -> None:
+        # Cancelled entries stay in their slot (cheaper than digging
+        # them out) and are skipped when reached.
+        entry.call = None
+        del self._entries[entry.handle]
+        count = self._owner_counts[entry.owner] - 1
+        if count:
+            self._owner_counts[entry.owner] = count
+        else:
+            del self._owner_counts[entry.owner]
+
+    def _obj_died(self, handle: int, _ref: weakref.ref) -> None:
+        entry = self._entries.get(handle)
+        if entry is not None and entry.objref is _ref:
+            self._release(entry)
+            self.stats.dead += 1
+
+    def _on_timer(self) -> None:
+        target = math.floor(_bascenev1.time() / self.tick)
+        while self._ticknum < target and self._entries:
+            self._ticknum += 1
+            self._advance()
+        if not self._entries:
+            # Go idle; clear out any cancelled leftovers since we'll
+            # be starting from a new tick when we wake back up.
+            self._timer = None
+            self._inner = [[] for _ in range(_INNER_SIZE)]
+            self._outer = [[] for _ in range(_OUTER_SIZE)]
+            self._overflow = []
+
+    def _advance(self) -> None:
+        ticknum = self._ticknum
+        self.stats.ticks += 1
+
+        # At each inner-wheel rotation, pull the next batch in from
+        # further out.
+        if not ticknum & _INNER_MASK:
+            if not (ticknum >> _INNER_BITS) & _OUTER_MASK:
+                overflow = self._overflow
+                self._overflow = []
+                for entry in overflow:
+                    if entry.call is not None:
+                        self._place(entry)
+            slot = (ticknum >> _INNER_BITS) & _OUTER_MASK
+            entries = self._outer[slot]
+            self._outer[slot] = []
+            for entry in entries:
+                if entry.call is not None:
+                    self._place(entry)
+
+        slot = ticknum & _INNER_MASK
+        entries = self._inner[slot]
+        if not entries:
+            return
+        self._inner[slot] = []
+        for entry in entries:
+            call = entry.call
+            if call is None:
+                continue
+            objref = entry.objref
+            obj = None if objref is None else objref()
+            self._release(entry)
+            if objref is not None and obj is None:
+                self.stats.dead += 1
+                continue
+            self.stats.fired += 1
+            try:
+                if objref is None:
+                    call(*entry.args)
+                else:
+                    call(obj, *entry.args)
+            except Exception:
+                self.stats.errors += 1
+                logging.exception('Error in TimerWheel call %s.', call)
+
+
+def _owner_name(call: Callable[..., Any]) -> str:
+    """Return a type name to attribute a call to for instrumentation."""
+    # Unwrap babase.Call/WeakCall and functools.partial wrappers.
+    while True:
+        inner = getattr(call, 'func', None)
+        if inner is None:
+            inner = getattr(call, '_call', None)
+        if inner is None:
+            break
+        call = inner
+    obj = getattr(call, '__self__', None)
+    if obj is None:
+        # Could be a babase.WeakMethod.
+        objref = getattr(call, '_obj', None)
+        if isinstance(objref, weakref.ref):
+            obj = objref()
+    if obj is not None and not isinstance(obj, types.ModuleType):
+        return type(obj).__name__
+    return getattr(call, '__qualname__', type(call).__name__)
@@ -8,6 +8,7 @@
 from __future__ import annotations
 
 import random
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, TypeVar, override
 
 import bascenev1 as bs
@@ -42,6 +43,16 @@ class BombFactory:
         assert isinstance(factory, BombFactory)
         return factory
 
+    @classmethod
+    def preload(cls, activity: bs.Activity) -> None:
+        """Build the shared factory ahead of time for an incoming game.
+
+        Registered via bs.register_activity_preloader() so this happens
+        while the previous activity is transitioning out.
+        """
+        if isinstance(activity, bs.GameActivity):
+            cls.get()
+
     def random_explode_sound(self) -> bs.Sound:
         """Return a random explosion bs.Sound from the factory."""
         return self.explode_sounds[random.randrange(len(self.explode_sounds))]
@@ -227,6 +238,331 @@ class ExplodeHitMessage:
     """Tell an object it was hit by an explosion."""
 
 
+@dataclass
+class BlastFXStats:
+    """Counters for effects handled by a BlastFX instance.
+
+    Category: **Gameplay Classes**
+    """
+
+    fx_requested: int = 0
+    fx_emitted: int = 0
+    fx_merged: int = 0
+    fx_dropped: int = 0
+    particles_requested: int = 0
+    particles_emitted: int = 0
+    sounds_requested: int = 0
+    sounds_played: int = 0
+    peak_lod: int = 0
+
+
+@dataclass
+class _FXRequest:
+    position: tuple[float, float, float]
+    velocity: tuple[float, float, float]
+    count: int | None
+    optional: bool
+    kwargs: dict[str, Any]
+    key: tuple
+    maxcount: int | None = None
+    merged: int = 1
+
+
+class _FXStep:
+    """Effects due on a single step."""
+
+    def __init__(self) -> None:
+        self.fx: list[_FXRequest] = []
+        self.sounds: list[
+            tuple[bs.Sound, tuple[float, float, float], int | None]
+        ] = []
+        self.shake = 0.0
+
+
+class BlastFX:
+    """Schedules and budgets explosion effects for an activity.
+
+    Category: **Gameplay Classes**
+
+    Blasts queue their particles, sounds and camera shakes here instead
+    of firing them directly. Requests due on the same step are merged
+    when they are close together and use the same emit params, and a
+    per-step budget is then enforced by stepping through LOD tiers:
+
+    0: Everything is emitted.
+    1: Optional effects (extra sparks, splinters, etc.) are dropped.
+    2: Particle counts are scaled down to fit the budget.
+    3: Remaining emissions past the budget are dropped.
+
+    Requests with no delay are held until flush() is called (blasts
+    do so at the end of their setup) and then go out immediately;
+    budgets for a step are shared by everything emitted on it, flushed
+    or not.
+
+    A single instance of this is shared between all blasts and can be
+    retrieved via BlastFX.get(); adjust its budgets there.
+    """
+
+    particle_budget = 48
+    """Max particles (summed emitfx counts) emitted per step."""
+
+    emit_budget = 24
+    """Max emitfx calls made per step."""
+
+    sound_budget = 6
+    """Max sounds played per step."""
+
+    merge_distance = 1.5
+    """Same-step effects closer than this are merged together."""
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        self.stats = BlastFXStats()
+        self.lod = 0
+        self._steps: dict[float, _FXStep] = {}
+        self._immediate = _FXStep()
+
+        # What's been used of the budgets on the current step.
+        self._budget_time = -1.0
+        self._emits_used = 0
+        self._particles_used = 0
+        self._played: list[
+            tuple[bs.Sound, tuple[float, float, float], int | None]
+        ] = []
+
+    @classmethod
+    def get(cls) -> BlastFX:
+        """Get/create a shared bascenev1lib.actor.bomb.BlastFX object."""
+        activity = bs.getactivity()
+        fx = activity.customdata.get(cls._STORENAME)
+        if fx is None:
+            fx = activity.customdata[cls._STORENAME] = BlastFX()
+        assert isinstance(fx, BlastFX)
+        return fx
+
+    def emitfx(
+        self,
+        position: Sequence[float],
+        velocity: Sequence[float] | None = None,
+        count: int | None = None,
+        delay: float = 0.0,
+        optional: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Queue a bs.emitfx() call.
+
+        Extra keyword args are passed along to bs.emitfx(). Optional
+        effects are the first to go when over budget.
+        """
+        self.stats.fx_requested += 1
+        self.stats.particles_requested += 1 if count is None else count
+        pos = (position[0], position[1], position[2])
+        vel = (
+            (0.0, 0.0, 0.0)
+            if velocity is None
+            else (velocity[0], velocity[1], velocity[2])
+        )
+        self._step(delay).fx.append(
+            _FXRequest(
+                position=pos,
+                velocity=vel,
+                count=count,
+                optional=optional,
+                kwargs=kwargs,
+                key=tuple(sorted(kwargs.items())),
+                maxcount=None if count is None else count * 2,
+            )
+        )
+
+    def playsound(
+        self,
+        sound: bs.Sound,
+        position: Sequence[float],
+        delay: float = 0.0,
+        source: int | None = None,
+    ) -> None:
+        """Queue a sound to be played at a position.
+
+        The same sound requested close by on the same step only plays
+        once, unless both requests come from the same source (an id
+        supplied by the requester, such as a blast asking for the same
+        sound twice on purpose).
+        """
+        self.stats.sounds_requested += 1
+        self._step(delay).sounds.append(
+            (sound, (position[0], position[1], position[2]), source)
+        )
+
+    def camerashake(self, intensity: float) -> None:
+        """Queue a camera shake; only the strongest per step is used."""
+        step = self._step(0.0)
+        step.shake = max(step.shake, intensity)
+
+    def flush(self) -> None:
+        """Emit all requests made with no delay right now."""
+        step = self._immediate
+        self._immediate = _FXStep()
+        self._run(step)
+
+    def _step(self, delay: float) -> _FXStep:
+        if delay <= 0.0:
+            return self._immediate
+
+        # Bucket requests by when they're due so everything landing on
+        # the same step is handled together (and shares one timer).
+        now = bs.time()
+        due = round(now + delay, 2)
+        step = self._steps.get(due)
+        if step is None:
+            step = self._steps[due] = _FXStep()
+            bs.TimerWheel.get().schedule_weak(
+                max(0.0, due - now), self._run_step, due
+            )
+        return step
+
+    def _run_step(self, due: float) -> None:
+        step = self._steps.pop(due, None)
+        if step is not None:
+            self._run(step)
+
+    def _run(self, step: _FXStep) -> None:
+        now = bs.time()
+        if now != self._budget_time:
+            self._budget_time = now
+            self._emits_used = 0
+            self._particles_used = 0
+            self._played = []
+        if step.fx:
+            self._emit(self._merge_fx(step.fx))
+        if step.sounds:
+            self._play_sounds(step.sounds)
+        if step.shake > 0.0:
+            bs.camerashake(intensity=step.shake)
+
+    def _is_near(
+        self, pos1: tuple[float, float, float], pos2: tuple[float, float, float]
+    ) -> bool:
+        return (
+            (pos1[0] - pos2[0]) ** 2
+            + (pos1[1] - pos2[1]) ** 2
+            + (pos1[2] - pos2[2]) ** 2
+        ) <= self.merge_distance**2
+
+    def _merge_fx(self, requests: list[_FXRequest]) -> list[_FXRequest]:
+        merged: list[_FXRequest] = []
+        for req in requests:
+            for other in merged:
+                if other.key != req.key or not self._is_near(
+                    other.position, req.position
+                ):
+                    continue
+                num = other.merged
+                other.position = (
+                    (other.position[0] * num + req.position[0]) / (num + 1),
+                    (other.position[1] * num + req.position[1]) / (num + 1),
+                    (other.position[2] * num + req.position[2]) / (num + 1),
+                )
+                other.velocity = (
+                    (other.velocity[0] * num + req.velocity[0]) / (num + 1),
+                    (other.velocity[1] * num + req.velocity[1]) / (num + 1),
+                    (other.velocity[2] * num + req.velocity[2]) / (num + 1),
+                )
+
+                # Piling particles onto the same spot doesn't read as
+                # much more, so merged emissions grow only so far.
+                if other.count is not None and req.count is not None:
+                    assert other.maxcount is not None
+                    other.count = min(other.count + req.count, other.maxcount)
+                other.optional = other.optional and req.optional
+                other.merged += 1
+                self.stats.fx_merged += 1
+                break
+            else:
+                merged.append(req)
+        return merged
+
+    def _emit(self, requests: list[_FXRequest]) -> None:
+        def _total() -> int:
+            return sum(1 if r.count is None else r.count for r in requests)
+
+        # Whatever was already emitted this step counts against us.
+        emit_budget = self.emit_budget - self._emits_used
+        particle_budget = self.particle_budget - self._particles_used
+
+        lod = 0
+        total = _total()
+        if len(requests) > emit_budget or total > particle_budget:
+            lod = 1
+            kept = [r for r in requests if not r.optional]
+            self.stats.fx_dropped += len(requests) - len(kept)
+            requests = kept
+            total = _total()
+            if total > particle_budget:
+                lod = 2
+                scale = particle_budget / total
+                for req in requests:
+                    if req.count is not None:
+                        req.count = max(1, int(req.count * scale))
+                total = _total()
+            if len(requests) > emit_budget or total > particle_budget:
+                lod = 3
+                kept = []
+                total = 0
+                for req in requests:
+                    cost = 1 if req.count is None else req.count
+                    if (
+                        len(kept) >= emit_budget
+                        or total + cost > particle_budget
+                    ):
+                        continue
+                    kept.append(req)
+                    total += cost
+                self.stats.fx_dropped += len(requests) - len(kept)
+                requests = kept
+
+        self.lod = lod
+        self.stats.peak_lod = max(self.stats.peak_lod, lod)
+        self._emits_used += len(requests)
+        self._particles_used += total
+        for req in requests:
+            if req.count is None:
+                bs.emitfx(
+                    position=req.position, velocity=req.velocity, **req.kwargs
+                )
+                self.stats.particles_emitted += 1
+            else:
+                bs.emitfx(
+                    position=req.position,
+                    velocity=req.velocity,
+                    count=req.count,
+                    **req.kwargs,
+                )
+                self.stats.particles_emitted += req.count
+        self.stats.fx_emitted += len(requests)
+
+    def _play_sounds(
+        self,
+        sounds: list[tuple[bs.Sound, tuple[float, float, float], int | None]],
+    ) -> None:
+        played = self._played
+        count = 0
+        for sound, pos, source in sounds:
+            if len(played) >= self.sound_budget:
+                break
+            if any(
+                sound is psound
+                and (source is None or source != psource)
+                and self._is_near(pos, ppos)
+                for psound, ppos, psource in played
+            ):
+                continue
+            sound.play(position=pos)
+            played.append((sound, pos, source))
+            count += 1
+        self.stats.sounds_played += count
+
+
 class Blast(bs.Actor):
     """An explosion, as generated by a bomb or some other object.
 
@@ -291,194 +627,195 @@ class Blast(bs.Actor):
 
         bs.timer(1.0, explosion.delete)
 
+        # Effects go through our shared BlastFX so that big chain
+        # reactions get merged and kept within budget.
+        fx = BlastFX.get()
+
         if self.blast_type != 'ice':
-            bs.emitfx(
+            fx.emitfx(
                 position=position,
                 velocity=velocity,
                 count=2,
+                optional=True,
                 emit_type='tendrils',
                 tendril_type='thin_smoke',
             )
-        bs.emitfx(
+        fx.emitfx(
             position=position,
             velocity=velocity,
             count=2,
             emit_type='tendrils',
             tendril_type='ice' if self.blast_type == 'ice' else 'smoke',
         )
-        bs.emitfx(
+        fx.emitfx(
             position=position,
             emit_type='distortion',
             spread=1.0 if self.blast_type == 'tnt' else 2.0,
         )
 
-        # And emit some shrapnel.
+        # And emit some shrapnel (it looks better if we delay a bit).
+        delay = 0.05
         if self.blast_type == 'ice':
-
-            def emit() -> None:
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=3,
-                    spread=2.0,
-                    scale=0.4,
-                    chunk_type='ice',
-                    emit_type='stickers',
-                )
-
-            # It looks better if we delay a bit.
-            bs.timer(0.05, emit)
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=3,
+                delay=delay,
+                spread=2.0,
+                scale=0.4,
+                chunk_type='ice',
+                emit_type='stickers',
+            )
 
         elif self.blast_type == 'sticky':
-
-            def emit() -> None:
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=2,
-                    spread=0.7,
-                    chunk_type='slime',
-                )
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=2,
-                    scale=0.5,
-                    spread=0.7,
-                    chunk_type='slime',
-                )
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=2,
-                    scale=0.6,
-                    chunk_type='slime',
-                    emit_type='stickers',
-                )
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=2,
-                    scale=0.7,
-                    chunk_type='spark',
-                    emit_type='stickers',
-                )
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=2,
-                    scale=0.8,
-                    spread=1.5,
-                    chunk_type='spark',
-                )
-
-            # It looks better if we delay a bit.
-            bs.timer(0.05, emit)
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                spread=0.7,
+                chunk_type='slime',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                optional=True,
+                scale=0.5,
+                spread=0.7,
+                chunk_type='slime',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                scale=0.6,
+                chunk_type='slime',
+                emit_type='stickers',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                scale=0.7,
+                chunk_type='spark',
+                emit_type='stickers',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                optional=True,
+                scale=0.8,
+                spread=1.5,
+                chunk_type='spark',
+            )
 
         elif self.blast_type == 'impact':
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                scale=0.8,
+                chunk_type='metal',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                optional=True,
+                scale=0.4,
+                chunk_type='metal',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                scale=0.7,
+                chunk_type='spark',
+                emit_type='stickers',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                optional=True,
+                scale=0.8,
+                spread=1.5,
+                chunk_type='spark',
+            )
 
-            def emit() -> None:
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=2,
-                    scale=0.8,
-                    chunk_type='metal',
-                )
-                bs.emitfx(
+        else:  # Regular or land mine bomb shrapnel.
+            if self.blast_type != 'tnt':
+                fx.emitfx(
                     position=position,
                     velocity=velocity,
                     count=2,
-                    scale=0.4,
-                    chunk_type='metal',
+                    delay=delay,
+                    chunk_type='rock',
                 )
-                bs.emitfx(
+                fx.emitfx(
                     position=position,
                     velocity=velocity,
                     count=2,
-                    scale=0.7,
-                    chunk_type='spark',
-                    emit_type='stickers',
+                    delay=delay,
+                    optional=True,
+                    scale=0.5,
+                    chunk_type='rock',
                 )
-                bs.emitfx(
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=3,
+                delay=delay,
+                scale=1.0 if self.blast_type == 'tnt' else 0.7,
+                chunk_type='spark',
+                emit_type='stickers',
+            )
+            fx.emitfx(
+                position=position,
+                velocity=velocity,
+                count=2,
+                delay=delay,
+                scale=1.0 if self.blast_type == 'tnt' else 0.8,
+                spread=1.5,
+                chunk_type='spark',
+            )
+
+            # TNT throws splintery chunks.
+            if self.blast_type == 'tnt':
+                fx.emitfx(
                     position=position,
                     velocity=velocity,
                     count=2,
+                    delay=delay + 0.01,
+                    optional=True,
                     scale=0.8,
-                    spread=1.5,
-                    chunk_type='spark',
+                    spread=1.0,
+                    chunk_type='splinter',
                 )
 
-            # It looks better if we delay a bit.
-            bs.timer(0.05, emit)
-
-        else:  # Regular or land mine bomb shrapnel.
-
-            def emit() -> None:
-                if self.blast_type != 'tnt':
-                    bs.emitfx(
-                        position=position,
-                        velocity=velocity,
-                        count=2,
-                        chunk_type='rock',
-                    )
-                    bs.emitfx(
-                        position=position,
-                        velocity=velocity,
-                        count=2,
-                        scale=0.5,
-                        chunk_type='rock',
-                    )
-                bs.emitfx(
-                    position=position,
-                    velocity=velocity,
-                    count=3,
-                    scale=1.0 if self.blast_type == 'tnt' else 0.7,
-                    chunk_type='spark',
-                    emit_type='stickers',
-                )
-                bs.emitfx(
+            # Every now and then do a sparky one.
+            if self.blast_type == 'tnt' or random.random() < 0.1:
+                fx.emitfx(
                     position=position,
                     velocity=velocity,
                     count=2,
-                    scale=1.0 if self.blast_type == 'tnt' else 0.8,
+                    delay=delay + 0.02,
+                    optional=True,
+                    scale=0.8,
                     spread=1.5,
                     chunk_type='spark',
                 )
 
-                # TNT throws splintery chunks.
-                if self.blast_type == 'tnt':
-
-                    def emit_splinters() -> None:
-                        bs.emitfx(
-                            position=position,
-                            velocity=velocity,
-                            count=2,
-                            scale=0.8,
-                            spread=1.0,
-                            chunk_type='splinter',
-                        )
-
-                    bs.timer(0.01, emit_splinters)
-
-                # Every now and then do a sparky one.
-                if self.blast_type == 'tnt' or random.random() < 0.1:
-
-                    def emit_extra_sparks() -> None:
-                        bs.emitfx(
-                            position=position,
-                            velocity=velocity,
-                            count=2,
-                            scale=0.8,
-                            spread=1.5,
-                            chunk_type='spark',
-                        )
-
-                    bs.timer(0.02, emit_extra_sparks)
-
-            # It looks better if we delay a bit.
-            bs.timer(0.05, emit)
-
         lcolor = (0.6, 0.6, 1.0) if self.blast_type == 'ice' else (1, 0.3, 0.1)
         light = bs.newnode(
             'light',
@@ -540,29 +877,48 @@ class Blast(bs.Actor):
         bs.animate(scorch, 'presence', {3.000: 1, 13.000: 0})
         bs.timer(13.0, scorch.delete)
 
+        # Our sounds never get deduped against each other; only against
+        # other blasts'.
+        source = id(self)
         if self.blast_type == 'ice':
-            factory.hiss_sound.play(position=light.position)
+            fx.playsound(
+                factory.hiss_sound, position=light.position, source=source
+            )
 
         lpos = light.position
-        factory.random_explode_sound().play(position=lpos)
-        factory.debris_fall_sound.play(position=lpos)
+        fx.playsound(
+            factory.random_explode_sound(), position=lpos, source=source
+        )
+        fx.playsound(factory.debris_fall_sound, position=lpos, source=source)
 
-        bs.camerashake(intensity=5.0 if self.blast_type == 'tnt' else 1.0)
+        fx.camerashake(intensity=5.0 if self.blast_type == 'tnt' else 1.0)
 
         # TNT is more epic.
         if self.blast_type == 'tnt':
-            factory.random_explode_sound().play(position=lpos)
-
-            def _extra_boom() -> None:
-                factory.random_explode_sound().play(position=lpos)
-
-            bs.timer(0.25, _extra_boom)
-
-            def _extra_debris_sound() -> None:
-                factory.debris_fall_sound.play(position=lpos)
-                factory.wood_debris_fall_sound.play(position=lpos)
+            fx.playsound(
+                factory.random_explode_sound(), position=lpos, source=source
+            )
+            fx.playsound(
+                factory.random_explode_sound(),
+                position=lpos,
+                delay=0.25,
+                source=source,
+            )
+            fx.playsound(
+                factory.debris_fall_sound,
+                position=lpos,
+                delay=0.4,
+                source=source,
+            )
+            fx.playsound(
+                factory.wood_debris_fall_sound,
+                position=lpos,
+                delay=0.4,
+                source=source,
+            )
 
-            bs.timer(0.4, _extra_debris_sound)
+        # Anything not delayed goes out now, on this step.
+        fx.flush()
 
     @override
     def handlemessage(self, msg: Any) -> Any:
@@ -929,7 +1285,9 @@ class Bomb(bs.Actor):
 
         # We blew up so we need to go away.
         # NOTE TO SELF: do we actually need this delay?
-        bs.timer(0.001, bs.WeakCall(self.handlemessage, bs.DieMessage()))
+        bs.TimerWheel.get().schedule_weak(
+            0.001, self.handlemessage, bs.DieMessage()
+        )
 
     def _handle_warn(self) -> None:
         if self.texture_sequence and self.node:
@@ -1104,3 +1462,6 @@ class TNTSpawner:
                 self._wait_time = 0.0
             else:
                 self._wait_time += 1.1
+
+
+bs.register_activity_preloader(BombFactory.preload)
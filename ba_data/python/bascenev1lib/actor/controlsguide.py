@@ -57,6 +57,7 @@ class ControlsGuide(bs.Actor):
         self._cancel_timer: bs.Timer | None = None
         self._fade_in_timer: bs.Timer | None = None
         self._update_timer: bs.Timer | None = None
+        self._run_text_lstr: bs.Lstr | None = None
         self._title_text: bs.Node | None
         clr: Sequence[float]
         punch_pos = (position[0] - offs * 1.1, position[1])
@@ -448,7 +449,9 @@ class ControlsGuide(bs.Actor):
                 bomb_button_names.add('B')
                 pickup_button_names.add('Y')
 
-        run_text = bs.Lstr(
+        # We rebuild these every update but they rarely change, so we
+        # use interned ones; see below.
+        run_text = bs.Lstr.interned(
             value='${R}: ${B}',
             subs=[
                 ('${R}', bs.Lstr(resource='runText')),
@@ -477,7 +480,7 @@ class ControlsGuide(bs.Actor):
             down_text = list(down_button_names)[0]
             left_text = list(left_button_names)[0]
             right_text = list(right_button_names)[0]
-            run_text = bs.Lstr(
+            run_text = bs.Lstr.interned(
                 value='${M}: ${U}, ${L}, ${D}, ${R}\n${RUN}',
                 subs=[
                     ('${M}', bs.Lstr(resource='moveText')),
@@ -495,7 +498,11 @@ class ControlsGuide(bs.Actor):
             bomb_button_names.clear()
             pickup_button_names.clear()
 
-        self._run_text.text = run_text
+        # Since we hold on to the last one, an unchanged run text comes
+        # back as that same instance and we can skip re-setting it.
+        if run_text is not self._run_text_lstr:
+            self._run_text_lstr = run_text
+            self._run_text.text = run_text
         w_text: bs.Lstr | str
         if only_remote and self._lifespan is None:
             w_text = bs.Lstr(
@@ -42,6 +42,10 @@ class FlagFactory:
 
     _STORENAME = bs.storagename()
 
+    # Game types that have built one of these; only those get it
+    # preloaded.
+    _preload_game_types: set[type[bs.Activity]] = set()
+
     def __init__(self) -> None:
         """Instantiate a `FlagFactory`.
 
@@ -116,9 +120,22 @@ class FlagFactory:
         if factory is None:
             factory = FlagFactory()
             activity.customdata[cls._STORENAME] = factory
+            if isinstance(activity, bs.GameActivity):
+                cls._preload_game_types.add(type(activity))
         assert isinstance(factory, FlagFactory)
         return factory
 
+    @classmethod
+    def preload(cls, activity: bs.Activity) -> None:
+        """Build the shared factory ahead of time for an incoming game.
+
+        Registered via bs.register_activity_preloader() so this happens
+        while the previous activity is transitioning out. Only game
+        types that built the factory on an earlier run are preloaded.
+        """
+        if type(activity) in cls._preload_game_types:
+            cls.get()
+
 
 @dataclass
 class FlagPickedUpMessage:
@@ -379,3 +396,6 @@ class Flag(bs.Actor):
         """
         assert len(pos) == 3
         bs.emitfx(position=pos, emit_type='flag_stand')
+
+
+bs.register_activity_preloader(FlagFactory.preload)
@@ -182,118 +182,115 @@ class PlayerSilly(Silly):
                 ' non-connected player'
             )
 
+    # Keep track of if we're being held and by who most recently.
     @override
-    def handlemessage(self, msg: Any) -> Any:
-        # FIXME: Tidy this up.
-        # pylint: disable=too-many-branches
-        # pylint: disable=too-many-statements
-        # pylint: disable=too-many-nested-blocks
-        assert not self.expired
-
-        # Keep track of if we're being held and by who most recently.
-        if isinstance(msg, bs.PickedUpMessage):
-            # Augment standard behavior.
-            super().handlemessage(msg)
-            self.held_count += 1
-            picked_up_by = msg.node.source_player
-            if picked_up_by:
-                self.last_player_held_by = picked_up_by
-        elif isinstance(msg, bs.DroppedMessage):
-            # Augment standard behavior.
-            super().handlemessage(msg)
-            self.held_count -= 1
-            if self.held_count < 0:
-                print('ERROR: silly held_count < 0')
-
-            # Let's count someone dropping us as an attack.
-            picked_up_by = msg.node.source_player
-            if picked_up_by:
-                self.last_player_attacked_by = picked_up_by
-                self.last_attacked_time = bs.time()
-                self.last_attacked_type = ('picked_up', 'default')
-        elif isinstance(msg, bs.StandMessage):
-            super().handlemessage(msg)  # Augment standard behavior.
-
-            # Our Silly was just moved somewhere. Explicitly update
-            # our associated player's position in case it is being used
-            # for logic (otherwise it will be out of date until next step)
-            self._drive_player_position()
-
-        elif isinstance(msg, bs.DieMessage):
-            # Report player deaths to the game.
-            if not self._dead:
-                # Was this player killed while being held?
-                was_held = self.held_count > 0 and self.last_player_held_by
-                # Was this player attacked before death?
-                was_attacked_recently = (
-                    self.last_player_attacked_by
-                    and bs.time() - self.last_attacked_time < 4.0
-                )
-                # Leaving the game doesn't count as a kill *unless*
-                # someone does it intentionally while being attacked.
-                left_game_cleanly = msg.how is bs.DeathType.LEFT_GAME and not (
-                    was_held or was_attacked_recently
-                )
+    @bs.messagehandler(bs.PickedUpMessage)
+    def _handle_picked_up(self, msg: bs.PickedUpMessage) -> Any:
+        super()._handle_picked_up(msg)  # Augment standard behavior.
+        self.held_count += 1
+        picked_up_by = msg.node.source_player
+        if picked_up_by:
+            self.last_player_held_by = picked_up_by
+
+    @bs.messagehandler(bs.DroppedMessage)
+    def _handle_dropped(self, msg: bs.DroppedMessage) -> Any:
+        self.held_count -= 1
+        if self.held_count < 0:
+            print('ERROR: silly held_count < 0')
+
+        # Let's count someone dropping us as an attack.
+        picked_up_by = msg.node.source_player
+        if picked_up_by:
+            self.last_player_attacked_by = picked_up_by
+            self.last_attacked_time = bs.time()
+            self.last_attacked_type = ('picked_up', 'default')
 
-                killed = not (msg.immediate or left_game_cleanly)
+    @override
+    @bs.messagehandler(bs.StandMessage)
+    def _handle_stand(self, msg: bs.StandMessage) -> Any:
+        super()._handle_stand(msg)  # Augment standard behavior.
+
+        # Our Silly was just moved somewhere. Explicitly update
+        # our associated player's position in case it is being used
+        # for logic (otherwise it will be out of date until next step)
+        self._drive_player_position()
+
+    @override
+    @bs.messagehandler(bs.DieMessage)
+    def _handle_die(self, msg: bs.DieMessage) -> Any:
+        # Report player deaths to the game.
+        if not self._dead:
+            # Was this player killed while being held?
+            was_held = self.held_count > 0 and self.last_player_held_by
+            # Was this player attacked before death?
+            was_attacked_recently = (
+                self.last_player_attacked_by
+                and bs.time() - self.last_attacked_time < 4.0
+            )
+            # Leaving the game doesn't count as a kill *unless*
+            # someone does it intentionally while being attacked.
+            left_game_cleanly = msg.how is bs.DeathType.LEFT_GAME and not (
+                was_held or was_attacked_recently
+            )
 
-                activity = self._activity()
+            killed = not (msg.immediate or left_game_cleanly)
 
-                player = self.getplayer(bs.Player, False)
-                if not killed:
-                    killerplayer = None
+            activity = self._activity()
+
+            player = self.getplayer(bs.Player, False)
+            if not killed:
+                killerplayer = None
+            else:
+                # If this player was being held at the time of death,
+                # the holder is the killer.
+                if was_held:
+                    killerplayer = self.last_player_held_by
                 else:
-                    # If this player was being held at the time of death,
-                    # the holder is the killer.
-                    if was_held:
-                        killerplayer = self.last_player_held_by
+                    # Otherwise, if they were attacked by someone in the
+                    # last few seconds, that person is the killer.
+                    # Otherwise it was a suicide.
+                    # FIXME: Currently disabling suicides in Co-Op since
+                    #  all bot kills would register as suicides; need to
+                    #  change this from last_player_attacked_by to
+                    #  something like last_actor_attacked_by to fix that.
+                    if was_attacked_recently:
+                        killerplayer = self.last_player_attacked_by
                     else:
-                        # Otherwise, if they were attacked by someone in the
-                        # last few seconds, that person is the killer.
-                        # Otherwise it was a suicide.
-                        # FIXME: Currently disabling suicides in Co-Op since
-                        #  all bot kills would register as suicides; need to
-                        #  change this from last_player_attacked_by to
-                        #  something like last_actor_attacked_by to fix that.
-                        if was_attacked_recently:
-                            killerplayer = self.last_player_attacked_by
+                        # ok, call it a suicide unless we're in co-op
+                        if activity is not None and not isinstance(
+                            activity.session, bs.CoopSession
+                        ):
+                            killerplayer = player
                         else:
-                            # ok, call it a suicide unless we're in co-op
-                            if activity is not None and not isinstance(
-                                activity.session, bs.CoopSession
-                            ):
-                                killerplayer = player
-                            else:
-                                killerplayer = None
-
-                # We should never wind up with a dead-reference here;
-                # we want to use None in that case.
-                assert killerplayer is None or killerplayer
-
-                # Only report if both the player and the activity still exist.
-                if killed and activity is not None and player:
-                    activity.handlemessage(
-                        bs.PlayerDiedMessage(
-                            player, killed, killerplayer, msg.how
-                        )
+                            killerplayer = None
+
+            # We should never wind up with a dead-reference here;
+            # we want to use None in that case.
+            assert killerplayer is None or killerplayer
+
+            # Only report if both the player and the activity still exist.
+            if killed and activity is not None and player:
+                activity.handlemessage(
+                    bs.PlayerDiedMessage(
+                        player, killed, killerplayer, msg.how
                     )
+                )
 
-            super().handlemessage(msg)  # Augment standard behavior.
+        super()._handle_die(msg)  # Augment standard behavior.
 
-        # Keep track of the player who last hit us for point rewarding.
-        elif isinstance(msg, bs.HitMessage):
-            source_player = msg.get_source_player(type(self._player))
-            if source_player:
-                self.last_player_attacked_by = source_player
-                self.last_attacked_time = bs.time()
-                self.last_attacked_type = (msg.hit_type, msg.hit_subtype)
-            super().handlemessage(msg)  # Augment standard behavior.
-            activity = self._activity()
-            if activity is not None and self._player.exists():
-                activity.handlemessage(PlayerSillyHurtMessage(self))
-        else:
-            return super().handlemessage(msg)
-        return None
+    # Keep track of the player who last hit us for point rewarding.
+    @override
+    @bs.messagehandler(bs.HitMessage)
+    def _handle_hit(self, msg: bs.HitMessage) -> Any:
+        source_player = msg.get_source_player(type(self._player))
+        if source_player:
+            self.last_player_attacked_by = source_player
+            self.last_attacked_time = bs.time()
+            self.last_attacked_type = (msg.hit_type, msg.hit_subtype)
+        super()._handle_hit(msg)  # Augment standard behavior.
+        activity = self._activity()
+        if activity is not None and self._player.exists():
+            activity.handlemessage(PlayerSillyHurtMessage(self))
 
     def _drive_player_position(self) -> None:
         """Drive our bascenev1.Player's official position
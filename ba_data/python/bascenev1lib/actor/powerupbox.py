@@ -32,6 +32,10 @@ class PowerupBoxFactory:
 
     _STORENAME = bs.storagename()
 
+    # Game types that have built one of these; only those get it
+    # preloaded.
+    _preload_game_types: set[type[bs.Activity]] = set()
+
     def __init__(self) -> None:
         """Instantiate a PowerupBoxFactory.
 
@@ -133,9 +137,22 @@ class PowerupBoxFactory:
         factory = activity.customdata.get(cls._STORENAME)
         if factory is None:
             factory = activity.customdata[cls._STORENAME] = PowerupBoxFactory()
+            if isinstance(activity, bs.GameActivity):
+                cls._preload_game_types.add(type(activity))
         assert isinstance(factory, PowerupBoxFactory)
         return factory
 
+    @classmethod
+    def preload(cls, activity: bs.Activity) -> None:
+        """Build the shared factory ahead of time for an incoming game.
+
+        Registered via bs.register_activity_preloader() so this happens
+        while the previous activity is transitioning out. Only game
+        types that built the factory on an earlier run are preloaded.
+        """
+        if type(activity) in cls._preload_game_types:
+            cls.get()
+
 
 class PowerupBox(bs.Actor):
     """A box that grants a powerup.
@@ -209,9 +226,8 @@ class PowerupBox(bs.Actor):
             },
         )
 
-        # Animate in.
-        curve = bs.animate(self.node, 'mesh_scale', {0: 0, 0.14: 1.6, 0.2: 1})
-        bs.timer(0.2, curve.delete)
+        # Animate in. (The curve gets cleaned up once it has finished.)
+        bs.animate(self.node, 'mesh_scale', {0: 0, 0.14: 1.6, 0.2: 1})
 
         if expire:
             bs.timer(
@@ -268,3 +284,6 @@ class PowerupBox(bs.Actor):
         else:
             return super().handlemessage(msg)
         return None
+
+
+bs.register_activity_preloader(PowerupBoxFactory.preload)
@@ -412,6 +412,14 @@ class FootballCoopGame(bs.CoopGameActivity[Player, Team]):
         settings['map'] = 'Football Stadium'
         super().__init__(settings)
         self._preset = settings.get('preset', 'rookie')
+        if self._preset in ['rookie', 'rookie_easy']:
+            self.achievement_evaluator.add_rule(
+                'punch_damage', 'Super Punch', 500
+            )
+        elif self._preset in ['pro', 'pro_easy']:
+            self.achievement_evaluator.add_rule(
+                'punch_damage', 'Super Mega Punch', 1000
+            )
 
         # Load some media we need.
         self._cheer_sound = bs.getsound('cheer')
@@ -843,37 +851,28 @@ class FootballCoopGame(bs.CoopGameActivity[Player, Team]):
 
                         # Completion achievements.
                         assert self._bot_team is not None
+                        shutout = self._bot_team.score == 0
+                        achievements: list[str] = []
                         if self._preset in ['rookie', 'rookie_easy']:
-                            self._award_achievement(
-                                'Rookie Football Victory', sound=False
-                            )
-                            if self._bot_team.score == 0:
-                                self._award_achievement(
-                                    'Rookie Football Shutout', sound=False
-                                )
+                            achievements.append('Rookie Football Victory')
+                            if shutout:
+                                achievements.append('Rookie Football Shutout')
                         elif self._preset in ['pro', 'pro_easy']:
-                            self._award_achievement(
-                                'Pro Football Victory', sound=False
-                            )
-                            if self._bot_team.score == 0:
-                                self._award_achievement(
-                                    'Pro Football Shutout', sound=False
-                                )
+                            achievements.append('Pro Football Victory')
+                            if shutout:
+                                achievements.append('Pro Football Shutout')
                         elif self._preset in ['uber', 'uber_easy']:
-                            self._award_achievement(
-                                'Uber Football Victory', sound=False
-                            )
-                            if self._bot_team.score == 0:
-                                self._award_achievement(
-                                    'Uber Football Shutout', sound=False
-                                )
+                            achievements.append('Uber Football Victory')
+                            if shutout:
+                                achievements.append('Uber Football Shutout')
                             if (
                                 not self._player_has_dropped_bomb
                                 and not self._player_has_punched
                             ):
-                                self._award_achievement(
-                                    'Got the Moves', sound=False
-                                )
+                                achievements.append('Got the Moves')
+                        self.achievement_evaluator.award(
+                            achievements, sound=False
+                        )
                         self._bots.stop_moving()
                         self.show_zoom_message(
                             bs.Lstr(resource='victoryText'),
@@ -934,12 +933,7 @@ class FootballCoopGame(bs.CoopGameActivity[Player, Team]):
             bs.timer(3.0, bs.Call(self._spawn_bot, (type(msg.sillybot))))
 
         elif isinstance(msg, SillyBotPunchedMessage):
-            if self._preset in ['rookie', 'rookie_easy']:
-                if msg.damage >= 500:
-                    self._award_achievement('Super Punch')
-            elif self._preset in ['pro', 'pro_easy']:
-                if msg.damage >= 1000:
-                    self._award_achievement('Super Mega Punch')
+            self.achievement_evaluator.feed_total('punch_damage', msg.damage)
 
         # Respawn dead flags.
         elif isinstance(msg, FlagDiedMessage):
@@ -219,9 +219,7 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
         self._flawless_bonus: int | None = None
         self._wave_text: bs.NodeActor | None = None
         self._wave_update_timer: bs.Timer | None = None
-        self._throw_off_kills = 0
-        self._land_mine_kills = 0
-        self._tnt_kills = 0
+        self._add_achievement_rules()
 
     @override
     def on_transition_in(self) -> None:
@@ -1026,20 +1024,22 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
         )
 
     def _award_completion_achievements(self) -> None:
+        achievements: list[str] = []
         if self._preset in {Preset.TRAINING, Preset.TRAINING_EASY}:
-            self._award_achievement('Onslaught Training Victory', sound=False)
+            achievements.append('Onslaught Training Victory')
             if not self._player_has_dropped_bomb:
-                self._award_achievement('Boxer', sound=False)
+                achievements.append('Boxer')
         elif self._preset in {Preset.ROOKIE, Preset.ROOKIE_EASY}:
-            self._award_achievement('Rookie Onslaught Victory', sound=False)
+            achievements.append('Rookie Onslaught Victory')
             if not self._a_player_has_been_hurt:
-                self._award_achievement('Flawless Victory', sound=False)
+                achievements.append('Flawless Victory')
         elif self._preset in {Preset.PRO, Preset.PRO_EASY}:
-            self._award_achievement('Pro Onslaught Victory', sound=False)
+            achievements.append('Pro Onslaught Victory')
             if not self._player_has_dropped_bomb:
-                self._award_achievement('Pro Boxer', sound=False)
+                achievements.append('Pro Boxer')
         elif self._preset in {Preset.UBER, Preset.UBER_EASY}:
-            self._award_achievement('Uber Onslaught Victory', sound=False)
+            achievements.append('Uber Onslaught Victory')
+        self.achievement_evaluator.award(achievements, sound=False)
 
     def _update_waves(self) -> None:
         # If we have no living bots, go to the next wave.
@@ -1509,13 +1509,7 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
 
     def _update_scores(self) -> None:
         score = self._score
-        if self._preset is Preset.ENDLESS:
-            if score >= 500:
-                self._award_achievement('Onslaught Master')
-            if score >= 1000:
-                self._award_achievement('Onslaught Wizard')
-            if score >= 5000:
-                self._award_achievement('Onslaught God')
+        self.achievement_evaluator.feed_total('score', score)
         assert self._scoreboard is not None
         self._scoreboard.set_team_value(self.teams[0], score, max_score=None)
 
@@ -1547,7 +1541,9 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
         elif isinstance(msg, SillyBotDiedMessage):
             pts, importance = msg.sillybot.get_death_points(msg.how)
             if msg.killerplayer is not None:
-                self._handle_kill_achievements(msg)
+                self.achievement_evaluator.feed(
+                    msg.sillybot.last_attacked_type
+                )
                 target: Sequence[float] | None
                 if msg.sillybot.node:
                     target = msg.sillybot.node.position
@@ -1576,58 +1572,25 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
         else:
             super().handlemessage(msg)
 
-    def _handle_kill_achievements(self, msg: SillyBotDiedMessage) -> None:
+    def _add_achievement_rules(self) -> None:
+        # Kill achievements are keyed on how bots were killed
+        # (their last-attacked type).
+        evaluator = self.achievement_evaluator
+        land_mine = ('explosion', 'land_mine')
+        tnt = ('explosion', 'tnt')
         if self._preset in {Preset.TRAINING, Preset.TRAINING_EASY}:
-            self._handle_training_kill_achievements(msg)
+            evaluator.add_rule(('picked_up', 'default'), 'Off You Go Then', 3)
         elif self._preset in {Preset.ROOKIE, Preset.ROOKIE_EASY}:
-            self._handle_rookie_kill_achievements(msg)
+            evaluator.add_rule(land_mine, 'Mine Games', 3)
         elif self._preset in {Preset.PRO, Preset.PRO_EASY}:
-            self._handle_pro_kill_achievements(msg)
+            evaluator.add_rule(tnt, 'Boom Goes the Dynamite', 3, delay=0.5)
         elif self._preset in {Preset.UBER, Preset.UBER_EASY}:
-            self._handle_uber_kill_achievements(msg)
-
-    def _handle_uber_kill_achievements(self, msg: SillyBotDiedMessage) -> None:
-        # Uber mine achievement:
-        if msg.sillybot.last_attacked_type == ('explosion', 'land_mine'):
-            self._land_mine_kills += 1
-            if self._land_mine_kills >= 6:
-                self._award_achievement('Gold Miner')
-
-        # Uber tnt achievement:
-        if msg.sillybot.last_attacked_type == ('explosion', 'tnt'):
-            self._tnt_kills += 1
-            if self._tnt_kills >= 6:
-                bs.timer(
-                    0.5, bs.WeakCall(self._award_achievement, 'TNT Terror')
-                )
-
-    def _handle_pro_kill_achievements(self, msg: SillyBotDiedMessage) -> None:
-        # TNT achievement:
-        if msg.sillybot.last_attacked_type == ('explosion', 'tnt'):
-            self._tnt_kills += 1
-            if self._tnt_kills >= 3:
-                bs.timer(
-                    0.5,
-                    bs.WeakCall(
-                        self._award_achievement, 'Boom Goes the Dynamite'
-                    ),
-                )
-
-    def _handle_rookie_kill_achievements(self, msg: SillyBotDiedMessage) -> None:
-        # Land-mine achievement:
-        if msg.sillybot.last_attacked_type == ('explosion', 'land_mine'):
-            self._land_mine_kills += 1
-            if self._land_mine_kills >= 3:
-                self._award_achievement('Mine Games')
-
-    def _handle_training_kill_achievements(
-        self, msg: SillyBotDiedMessage
-    ) -> None:
-        # Toss-off-map achievement:
-        if msg.sillybot.last_attacked_type == ('picked_up', 'default'):
-            self._throw_off_kills += 1
-            if self._throw_off_kills >= 3:
-                self._award_achievement('Off You Go Then')
+            evaluator.add_rule(land_mine, 'Gold Miner', 6)
+            evaluator.add_rule(tnt, 'TNT Terror', 6, delay=0.5)
+        elif self._preset is Preset.ENDLESS:
+            evaluator.add_rule('score', 'Onslaught Master', 500)
+            evaluator.add_rule('score', 'Onslaught Wizard', 1000)
+            evaluator.add_rule('score', 'Onslaught God', 5000)
 
     def _set_can_end_wave(self) -> None:
         self._can_end_wave = True
@@ -138,6 +138,11 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
         super().__init__(settings)
         shared = SharedObjects.get()
         self._preset = Preset(settings.get('preset', 'pro'))
+        if self._preset is Preset.ENDLESS:
+            evaluator = self.achievement_evaluator
+            evaluator.add_rule('score', 'Runaround Master', 500)
+            evaluator.add_rule('score', 'Runaround Wizard', 1000)
+            evaluator.add_rule('score', 'Runaround God', 2000)
 
         self._player_death_sound = bs.getsound('playerDeath')
         self._new_wave_sound = bs.getsound('scoreHit01')
@@ -770,24 +775,20 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
 
             if won:
                 # Completion achievements:
+                achievements: list[str] = []
                 if self._preset in {Preset.PRO, Preset.PRO_EASY}:
-                    self._award_achievement(
-                        'Pro Runaround Victory', sound=False
-                    )
+                    achievements.append('Pro Runaround Victory')
                     if self._lives == self._start_lives:
-                        self._award_achievement('The Wall', sound=False)
+                        achievements.append('The Wall')
                     if not self._player_has_picked_up_powerup:
-                        self._award_achievement(
-                            'Precision Bombing', sound=False
-                        )
+                        achievements.append('Precision Bombing')
                 elif self._preset in {Preset.UBER, Preset.UBER_EASY}:
-                    self._award_achievement(
-                        'Uber Runaround Victory', sound=False
-                    )
+                    achievements.append('Uber Runaround Victory')
                     if self._lives == self._start_lives:
-                        self._award_achievement('The Great Wall', sound=False)
+                        achievements.append('The Great Wall')
                     if not self._a_player_has_been_killed:
-                        self._award_achievement('Stayin\' Alive', sound=False)
+                        achievements.append('Stayin\' Alive')
+                self.achievement_evaluator.award(achievements, sound=False)
 
                 # Give remaining players some points and have them celebrate.
                 self.show_zoom_message(
@@ -1248,13 +1249,7 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
 
     def _update_scores(self) -> None:
         score = self._score
-        if self._preset is Preset.ENDLESS:
-            if score >= 500:
-                self._award_achievement('Runaround Master')
-            if score >= 1000:
-                self._award_achievement('Runaround Wizard')
-            if score >= 2000:
-                self._award_achievement('Runaround God')
+        self.achievement_evaluator.feed_total('score', score)
 
         assert self._scoreboard is not None
         self._scoreboard.set_team_value(self.teams[0], score, max_score=None)
@@ -83,6 +83,13 @@ class TheLastStandGame(bs.CoopGameActivity[Player, Team]):
         self._powerup_center = (0, 7, -4.14)
         self._powerup_spread = (7, 2)
         self._preset = str(settings.get('preset', 'default'))
+
+        # Achievements apply to the default preset only.
+        if self._preset == 'default':
+            evaluator = self.achievement_evaluator
+            evaluator.add_rule('score', 'Last Stand Master', 250)
+            evaluator.add_rule('score', 'Last Stand Wizard', 500)
+            evaluator.add_rule('score', 'Last Stand God', 1000)
         self._excludepowerups: list[str] = []
         self._scoreboard: Scoreboard | None = None
         self._score = 0
@@ -282,15 +289,7 @@ class TheLastStandGame(bs.CoopGameActivity[Player, Team]):
 
     def _update_scores(self) -> None:
         score = self._score
-
-        # Achievements apply to the default preset only.
-        if self._preset == 'default':
-            if score >= 250:
-                self._award_achievement('Last Stand Master')
-            if score >= 500:
-                self._award_achievement('Last Stand Wizard')
-            if score >= 1000:
-                self._award_achievement('Last Stand God')
+        self.achievement_evaluator.feed_total('score', score)
         assert self._scoreboard is not None
         self._scoreboard.set_team_value(self.teams[0], score, max_score=None)
 
@@ -12,6 +12,7 @@ from enum import Enum
 import dataclasses
 import typing
 import types
+import base64
 import datetime
 from typing import TYPE_CHECKING
 
@@ -29,12 +30,21 @@ from efro.dataclassio._base import (
     IOMultiType,
 )
 from efro.dataclassio._prep import PrepSession
+from efro.dataclassio._outputter import _OutputCompiler
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Callable
 
     from efro.dataclassio._base import IOAttrs
-    from efro.dataclassio._outputter import _Outputter
+
+    # Compiled input functions take the class being built (for error
+    # messages), a field path, and a value.
+    _InFunc = Callable[[type, str, Any], Any]
+
+# Attr name for the per-class dict of compiled input functions (keyed
+# by input options). We look this up in each class' own __dict__ so
+# subclasses never pick up their parents' functions.
+INPUT_FUNCS_ATTR = '_DCIOINFUNCS'
 
 
 class _Inputter:
@@ -47,17 +57,15 @@ class _Inputter:
         discard_unknown_attrs: bool = False,
     ):
         self._cls = cls
-        self._codec = codec
-        self._coerce_to_float = coerce_to_float
-        self._allow_unknown_attrs = allow_unknown_attrs
-        self._discard_unknown_attrs = discard_unknown_attrs
-        self._soft_default_validator: _Outputter | None = None
 
         if not allow_unknown_attrs and discard_unknown_attrs:
             raise ValueError(
                 'discard_unknown_attrs cannot be True'
                 ' when allow_unknown_attrs is False.'
             )
+        self._compiler = _InputCompiler.get(
+            codec, coerce_to_float, allow_unknown_attrs, discard_unknown_attrs
+        )
 
     def run(self, values: dict) -> Any:
         """Do the thing."""
@@ -93,7 +101,7 @@ class _Inputter:
         else:
             is_ext = False
 
-        out = self._dataclass_from_input(outcls, '', values)
+        out = self._compiler.dataclass_from_input(outcls, '', values)
         assert isinstance(out, outcls)
 
         if is_ext:
@@ -101,132 +109,67 @@ class _Inputter:
 
         return out
 
-    def _value_from_input(
-        self,
-        cls: type,
-        fieldpath: str,
-        anntype: Any,
-        value: Any,
-        ioattrs: IOAttrs | None,
-    ) -> Any:
-        """Convert an assigned value to what a dataclass field expects."""
-        # pylint: disable=too-many-return-statements
-        # pylint: disable=too-many-branches
-
-        origin = _get_origin(anntype)
-
-        if origin is typing.Any:
-            if not _is_valid_for_codec(value, self._codec):
-                raise TypeError(
-                    f'Invalid value type for \'{fieldpath}\';'
-                    f' \'Any\' typed values must contain only'
-                    f' types directly supported by the specified'
-                    f' codec ({self._codec.name}); found'
-                    f' \'{type(value).__name__}\' which is not.'
-                )
-            return value
-
-        # noinspection PyPep8
-        if origin is typing.Union or origin is types.UnionType:
-            # Currently, the only unions we support are None/Value
-            # (translated from Optional), which we verified on prep. So
-            # let's treat this as a simple optional case.
-            if value is None:
-                return None
-            childanntypes_l = [
-                c for c in typing.get_args(anntype) if c is not type(None)
-            ]  # noqa (pycodestyle complains about *is* with type)
-            assert len(childanntypes_l) == 1
-            return self._value_from_input(
-                cls, fieldpath, childanntypes_l[0], value, ioattrs
-            )
-
-        # Everything below this point assumes the annotation type
-        # resolves to a concrete type. (This should have been verified
-        # at prep time).
-        assert isinstance(origin, type)
-
-        if origin in SIMPLE_TYPES:
-            if type(value) is not origin:
-                # Special case: if they want to coerce ints to floats,
-                # do so.
-                if (
-                    self._coerce_to_float
-                    and origin is float
-                    and type(value) is int
-                ):
-                    return float(value)
-                _raise_type_error(fieldpath, type(value), (origin,))
-            return value
-
-        if origin in {list, set}:
-            return self._sequence_from_input(
-                cls, fieldpath, anntype, value, origin, ioattrs
-            )
-
-        if origin is tuple:
-            return self._tuple_from_input(
-                cls, fieldpath, anntype, value, ioattrs
-            )
-
-        if origin is dict:
-            return self._dict_from_input(
-                cls, fieldpath, anntype, value, ioattrs
-            )
-
-        if dataclasses.is_dataclass(origin):
-            return self._dataclass_from_input(origin, fieldpath, value)
-
-        # ONLY consider something as a multi-type when it's not a
-        # dataclass (all dataclasses inheriting from the multi-type
-        # should just be processed as dataclasses).
-        if issubclass(origin, IOMultiType):
-            return self._dataclass_from_input(
-                _get_multitype_type(anntype, fieldpath, value),
-                fieldpath,
-                value,
-            )
-
-        if issubclass(origin, Enum):
-            return enum_by_value(origin, value)
 
-        if issubclass(origin, datetime.datetime):
-            return self._datetime_from_input(cls, fieldpath, value, ioattrs)
+class _InputCompiler:
+    """Builds and caches specialized input functions for dataclasses.
 
-        if issubclass(origin, datetime.timedelta):
-            return self._timedelta_from_input(cls, fieldpath, value, ioattrs)
+    There is one of these per combination of input options. For each
+    dataclass type it builds (once) a function running the exact checks
+    and conversions a generic walk of the type's annotations would, but
+    with all annotation parsing and type dispatch done up front.
+    """
 
-        if origin is bytes:
-            return self._bytes_from_input(origin, fieldpath, value)
+    _instances: dict[tuple[Codec, bool, bool, bool], _InputCompiler] = {}
 
-        raise TypeError(
-            f"Field '{fieldpath}' of type '{anntype}' is unsupported here."
+    def __init__(
+        self,
+        codec: Codec,
+        coerce_to_float: bool,
+        allow_unknown_attrs: bool,
+        discard_unknown_attrs: bool,
+    ) -> None:
+        self._key = (
+            codec,
+            coerce_to_float,
+            allow_unknown_attrs,
+            discard_unknown_attrs,
         )
+        self._codec = codec
+        self._coerce_to_float = coerce_to_float
+        self._allow_unknown_attrs = allow_unknown_attrs
+        self._discard_unknown_attrs = discard_unknown_attrs
 
-    def _bytes_from_input(self, cls: type, fieldpath: str, value: Any) -> bytes:
-        """Given input data, returns bytes."""
-        import base64
-
-        # For firestore, bytes are passed as-is. Otherwise, they're encoded
-        # as base64.
-        if self._codec is Codec.FIRESTORE:
-            if not isinstance(value, bytes):
-                raise TypeError(
-                    f'Expected a bytes object for {fieldpath}'
-                    f' on {cls.__name__}; got a {type(value)}.'
-                )
-
-            return value
+        # Counter-intuitively, we use an outputter as part of our
+        # inputting. Soft-default values are already internal types; we
+        # need to make sure they can go out from there.
+        self._soft_default_validator = _OutputCompiler.get(
+            create=False,
+            codec=codec,
+            coerce_to_float=coerce_to_float,
+            discard_extra_attrs=False,
+        )
 
-        assert self._codec is Codec.JSON
-        if not isinstance(value, str):
-            raise TypeError(
-                f'Expected a string object for {fieldpath}'
-                f' on {cls.__name__}; got a {type(value)}.'
-            )
-        return base64.b64decode(value)
+    @classmethod
+    def get(
+        cls,
+        codec: Codec,
+        coerce_to_float: bool,
+        allow_unknown_attrs: bool,
+        discard_unknown_attrs: bool,
+    ) -> _InputCompiler:
+        """Return the shared compiler for a set of options."""
+        key = (
+            codec,
+            coerce_to_float,
+            allow_unknown_attrs,
+            discard_unknown_attrs,
+        )
+        compiler = cls._instances.get(key)
+        if compiler is None:
+            compiler = cls._instances[key] = cls(*key)
+        return compiler
 
-    def _dataclass_from_input(
+    def dataclass_from_input(
         self, cls: type, fieldpath: str, values: dict
     ) -> Any:
         """Given a dict, instantiates a dataclass of the given type.
@@ -237,7 +180,20 @@ class _Inputter:
         associated values, and nested dataclasses should be passed as dicts.
         """
         try:
-            return self._do_dataclass_from_input(cls, fieldpath, values)
+            if not isinstance(values, dict):
+                raise TypeError(
+                    f'Expected a dict for {fieldpath} on {cls.__name__};'
+                    f' got a {type(values)}.'
+                )
+            funcs = cls.__dict__.get(INPUT_FUNCS_ATTR)
+            func = None if funcs is None else funcs.get(self._key)
+            if func is None:
+                func = self._compile_dataclass(cls)
+                if funcs is None:
+                    funcs = {}
+                    setattr(cls, INPUT_FUNCS_ATTR, funcs)
+                funcs[self._key] = func
+            return func(cls, fieldpath, values)
         except Exception as exc:
             # Extended data types can choose to sub default data in case
             # of failures (generally not a good idea but occasionally
@@ -255,27 +211,16 @@ class _Inputter:
                 return fallback
             raise
 
-    def _do_dataclass_from_input(
-        self, cls: type, fieldpath: str, values: dict
-    ) -> Any:
+    def _compile_dataclass(self, dcls: type) -> _InFunc:
         # pylint: disable=too-many-locals
         # pylint: disable=too-many-statements
-        # pylint: disable=too-many-branches
-        if not isinstance(values, dict):
-            raise TypeError(
-                f'Expected a dict for {fieldpath} on {cls.__name__};'
-                f' got a {type(values)}.'
-            )
-
         prep = PrepSession(explicit=False).prep_dataclass(
-            cls, recursion_level=0
+            dcls, recursion_level=0
         )
         assert prep is not None
 
-        extra_attrs = {}
-
         # noinspection PyDataclass
-        fields = dataclasses.fields(cls)
+        fields = dataclasses.fields(dcls)
         fields_by_name = {f.name: f for f in fields}
 
         # Preprocess all fields to convert Annotated[] to contained
@@ -287,8 +232,8 @@ class _Inputter:
         # Special case: if this is a multi-type class it probably has a
         # type attr. Ignore that while parsing since we already have a
         # definite type and it will just pollute extra-attrs otherwise.
-        if issubclass(cls, IOMultiType):
-            type_id_store_name = cls.get_type_id_storage_name()
+        if issubclass(dcls, IOMultiType):
+            type_id_store_name = dcls.get_type_id_storage_name()
 
             # However we do want to make sure the class we're loading
             # doesn't itself use this same name, as this could lead to
@@ -296,68 +241,99 @@ class _Inputter:
             # time because IOMultiTypes are lazy-loaded, so this is
             # the best we can do.
             if type_id_store_name in fields_by_name:
-                raise RuntimeError(
-                    f"{cls} contains a '{type_id_store_name}' field"
+                errstr = (
+                    f"{dcls} contains a '{type_id_store_name}' field"
                     ' which clashes with the type-id-storage-name of'
                     ' the IOMultiType it inherits from.'
                 )
 
+                def _clashing(cls: type, fieldpath: str, values: dict) -> Any:
+                    raise RuntimeError(errstr)
+
+                return _clashing
+
         else:
             type_id_store_name = None
 
-        # Go through all data in the input, converting it to either
-        # dataclass args or extra data.
-        args: dict[str, Any] = {}
-        for rawkey, value in values.items():
+        # Map every raw key we recognize to the field name it feeds and
+        # a function to convert its value. Keys can be storage-names or
+        # attr names (when no storage-name maps to the same string).
+        fieldfuncs = {
+            name: self._compile_value(anntype, ioattrs)
+            for name, (anntype, ioattrs) in parsed_field_annotations.items()
+        }
+        rawkeys: dict[str, tuple[str, _InFunc | None]] = {
+            name: (name, func) for name, func in fieldfuncs.items()
+        }
+        for rawkey, key in prep.storage_names_to_attr_names.items():
+            rawkeys[rawkey] = (key, fieldfuncs.get(key))
+
+        # Fields with soft-default values or factories to inject when
+        # absent from our data.
+        soft_defaults: list[tuple[str, Any, IOAttrs]] = [
+            (key, anntype, ioattrs)
+            for key, (anntype, ioattrs) in parsed_field_annotations.items()
+            if ioattrs is not None
+            and (
+                ioattrs.soft_default is not ioattrs.MISSING
+                or ioattrs.soft_default_factory is not ioattrs.MISSING
+            )
+        ]
 
-            # Ignore _dciotype or whatnot.
-            if type_id_store_name is not None and rawkey == type_id_store_name:
-                continue
+        codec = self._codec
+        allow_unknown_attrs = self._allow_unknown_attrs
+        discard_unknown_attrs = self._discard_unknown_attrs
+        soft_default_validator = self._soft_default_validator
 
-            key = prep.storage_names_to_attr_names.get(rawkey, rawkey)
-            field = fields_by_name.get(key)
+        def _dataclass(cls: type, fieldpath: str, values: dict) -> Any:
+            extra_attrs = {}
 
-            # Store unknown attrs off to the side (or error if desired).
-            if field is None:
-                if self._allow_unknown_attrs:
-                    if self._discard_unknown_attrs:
-                        continue
+            # Go through all data in the input, converting it to either
+            # dataclass args or extra data.
+            args: dict[str, Any] = {}
+            for rawkey, value in values.items():
 
-                    # Treat this like 'Any' data; ensure that it is
-                    # valid raw json.
-                    if not _is_valid_for_codec(value, self._codec):
-                        raise TypeError(
-                            f'Unknown attr \'{key}\''
-                            f' on {fieldpath} contains data type(s)'
-                            f' not supported by the specified codec'
-                            f' ({self._codec.name}).'
+                # Ignore _dciotype or whatnot.
+                if (
+                    type_id_store_name is not None
+                    and rawkey == type_id_store_name
+                ):
+                    continue
+
+                key, valfunc = rawkeys.get(rawkey, (rawkey, None))
+
+                # Store unknown attrs off to the side (or error if desired).
+                if valfunc is None:
+                    if allow_unknown_attrs:
+                        if discard_unknown_attrs:
+                            continue
+
+                        # Treat this like 'Any' data; ensure that it is
+                        # valid raw json.
+                        if not _is_valid_for_codec(value, codec):
+                            raise TypeError(
+                                f'Unknown attr \'{key}\''
+                                f' on {fieldpath} contains data type(s)'
+                                f' not supported by the specified codec'
+                                f' ({codec.name}).'
+                            )
+                        extra_attrs[key] = value
+                    else:
+                        raise AttributeError(
+                            f"'{cls.__name__}' has no '{key}' field."
                         )
-                    extra_attrs[key] = value
                 else:
-                    raise AttributeError(
-                        f"'{cls.__name__}' has no '{key}' field."
+                    args[key] = valfunc(
+                        cls, f'{fieldpath}.{key}' if fieldpath else key, value
                     )
-            else:
-                fieldname = field.name
-                anntype, ioattrs = parsed_field_annotations[fieldname]
-                subfieldpath = (
-                    f'{fieldpath}.{fieldname}' if fieldpath else fieldname
-                )
-                args[key] = self._value_from_input(
-                    cls, subfieldpath, anntype, value, ioattrs
-                )
 
-        # Go through all fields looking for any not yet present in our data.
-        # If we find any such fields with a soft-default value or factory
-        # defined, inject that soft value into our args.
-        for key, aparsed in parsed_field_annotations.items():
-            if key in args:
-                continue
-            ioattrs = aparsed[1]
-            if ioattrs is not None and (
-                ioattrs.soft_default is not ioattrs.MISSING
-                or ioattrs.soft_default_factory is not ioattrs.MISSING
-            ):
+            # Go through all fields looking for any not yet present in
+            # our data. If we find any such fields with a soft-default
+            # value or factory defined, inject that soft value into our
+            # args.
+            for key, anntype, ioattrs in soft_defaults:
+                if key in args:
+                    continue
                 if ioattrs.soft_default is not ioattrs.MISSING:
                     soft_default = ioattrs.soft_default
                 else:
@@ -367,89 +343,212 @@ class _Inputter:
 
                 # Make sure these values are valid since we didn't run
                 # them through our normal input type checking.
+                soft_default_validator.value_func(anntype)(
+                    type(soft_default),
+                    f'{fieldpath}.{key}' if fieldpath else key,
+                    soft_default,
+                )
+
+            try:
+                out = cls(**args)
+            except Exception as exc:
+                raise ValueError(
+                    f'Error instantiating class {cls.__name__}'
+                    f' at {fieldpath}: {exc}'
+                ) from exc
+            if extra_attrs:
+                setattr(out, EXTRA_ATTRS_ATTR, extra_attrs)
+            return out
+
+        return _dataclass
+
+    def _compile_value(self, anntype: Any, ioattrs: IOAttrs | None) -> _InFunc:
+        """Build a function converting input values for a field type."""
+        # pylint: disable=too-many-return-statements
+        # pylint: disable=too-many-branches
+        codec = self._codec
+
+        origin = _get_origin(anntype)
+
+        if origin is typing.Any:
+
+            def _any(cls: type, fieldpath: str, value: Any) -> Any:
+                if not _is_valid_for_codec(value, codec):
+                    raise TypeError(
+                        f'Invalid value type for \'{fieldpath}\';'
+                        f' \'Any\' typed values must contain only'
+                        f' types directly supported by the specified'
+                        f' codec ({codec.name}); found'
+                        f' \'{type(value).__name__}\' which is not.'
+                    )
+                return value
+
+            return _any
+
+        # noinspection PyPep8
+        if origin is typing.Union or origin is types.UnionType:
+            # Currently, the only unions we support are None/Value
+            # (translated from Optional), which we verified on prep. So
+            # let's treat this as a simple optional case.
+            childanntypes_l = [
+                c for c in typing.get_args(anntype) if c is not type(None)
+            ]  # noqa (pycodestyle complains about *is* with type)
+            assert len(childanntypes_l) == 1
+            childfunc = self._compile_value(childanntypes_l[0], ioattrs)
+
+            def _optional(cls: type, fieldpath: str, value: Any) -> Any:
+                if value is None:
+                    return None
+                return childfunc(cls, fieldpath, value)
+
+            return _optional
+
+        # Everything below this point assumes the annotation type
+        # resolves to a concrete type. (This should have been verified
+        # at prep time).
+        assert isinstance(origin, type)
+
+        if origin in SIMPLE_TYPES:
+            if self._coerce_to_float and origin is float:
 
-                self._type_check_soft_default(
-                    value=soft_default,
-                    anntype=aparsed[0],
-                    fieldpath=(f'{fieldpath}.{key}' if fieldpath else key),
+                def _float(cls: type, fieldpath: str, value: Any) -> Any:
+                    if type(value) is not float:
+                        # Special case: coerce ints to floats.
+                        if type(value) is int:
+                            return float(value)
+                        _raise_type_error(fieldpath, type(value), (float,))
+                    return value
+
+                return _float
+
+            def _simple(cls: type, fieldpath: str, value: Any) -> Any:
+                if type(value) is not origin:
+                    _raise_type_error(fieldpath, type(value), (origin,))
+                return value
+
+            return _simple
+
+        if origin in {list, set}:
+            return self._compile_sequence(anntype, origin, ioattrs)
+
+        if origin is tuple:
+            return self._compile_tuple(anntype, ioattrs)
+
+        if origin is dict:
+            return self._compile_dict(anntype, ioattrs)
+
+        if dataclasses.is_dataclass(origin):
+
+            def _dataclass(cls: type, fieldpath: str, value: Any) -> Any:
+                return self.dataclass_from_input(origin, fieldpath, value)
+
+            return _dataclass
+
+        # ONLY consider something as a multi-type when it's not a
+        # dataclass (all dataclasses inheriting from the multi-type
+        # should just be processed as dataclasses).
+        if issubclass(origin, IOMultiType):
+
+            def _multitype(cls: type, fieldpath: str, value: Any) -> Any:
+                return self.dataclass_from_input(
+                    _get_multitype_type(anntype, fieldpath, value),
+                    fieldpath,
+                    value,
                 )
 
-        try:
-            out = cls(**args)
-        except Exception as exc:
-            raise ValueError(
-                f'Error instantiating class {cls.__name__}'
-                f' at {fieldpath}: {exc}'
-            ) from exc
-        if extra_attrs:
-            setattr(out, EXTRA_ATTRS_ATTR, extra_attrs)
-        return out
+            return _multitype
 
-    def _type_check_soft_default(
-        self, value: Any, anntype: Any, fieldpath: str
-    ) -> None:
-        from efro.dataclassio._outputter import _Outputter
-
-        # Counter-intuitively, we create an outputter as part of
-        # our inputter. Soft-default values are already internal types;
-        # we need to make sure they can go out from there.
-        if self._soft_default_validator is None:
-            self._soft_default_validator = _Outputter(
-                obj=None,
-                create=False,
-                codec=self._codec,
-                coerce_to_float=self._coerce_to_float,
-                discard_extra_attrs=False,
+        if issubclass(origin, Enum):
+            return lambda cls, fieldpath, value: enum_by_value(origin, value)
+
+        if issubclass(origin, datetime.datetime):
+
+            def _datetime(cls: type, fieldpath: str, value: Any) -> Any:
+                return self._datetime_from_input(cls, fieldpath, value, ioattrs)
+
+            return _datetime
+
+        if issubclass(origin, datetime.timedelta):
+            return self._timedelta_from_input
+
+        if origin is bytes:
+            return lambda cls, fieldpath, value: self._bytes_from_input(
+                origin, fieldpath, value
             )
-        self._soft_default_validator.soft_default_check(
-            value=value, anntype=anntype, fieldpath=fieldpath
-        )
 
-    def _dict_from_input(
-        self,
-        cls: type,
-        fieldpath: str,
-        anntype: Any,
-        value: Any,
-        ioattrs: IOAttrs | None,
-    ) -> Any:
-        # pylint: disable=too-many-branches
-        # pylint: disable=too-many-locals
+        def _unsupported(cls: type, fieldpath: str, value: Any) -> Any:
+            raise TypeError(
+                f"Field '{fieldpath}' of type '{anntype}' is unsupported here."
+            )
 
-        if not isinstance(value, dict):
+        return _unsupported
+
+    def _bytes_from_input(self, cls: type, fieldpath: str, value: Any) -> bytes:
+        """Given input data, returns bytes."""
+        # For firestore, bytes are passed as-is. Otherwise, they're encoded
+        # as base64.
+        if self._codec is Codec.FIRESTORE:
+            if not isinstance(value, bytes):
+                raise TypeError(
+                    f'Expected a bytes object for {fieldpath}'
+                    f' on {cls.__name__}; got a {type(value)}.'
+                )
+
+            return value
+
+        assert self._codec is Codec.JSON
+        if not isinstance(value, str):
             raise TypeError(
-                f'Expected a dict for \'{fieldpath}\' on {cls.__name__};'
-                f' got a {type(value)}.'
+                f'Expected a string object for {fieldpath}'
+                f' on {cls.__name__}; got a {type(value)}.'
             )
+        return base64.b64decode(value)
+
+    def _compile_dict(self, anntype: Any, ioattrs: IOAttrs | None) -> _InFunc:
+        # pylint: disable=too-many-statements
+        codec = self._codec
+
+        def _check_dict(cls: type, fieldpath: str, value: Any) -> None:
+            if not isinstance(value, dict):
+                raise TypeError(
+                    f'Expected a dict for \'{fieldpath}\' on {cls.__name__};'
+                    f' got a {type(value)}.'
+                )
 
         childtypes = typing.get_args(anntype)
         assert len(childtypes) in (0, 2)
 
-        out: dict
-
         # We treat 'Any' dicts simply as json; we don't do any translating.
         if not childtypes or childtypes[0] is typing.Any:
-            value_any: Any = value
-            if not isinstance(value_any, dict) or not _is_valid_for_codec(
-                value, self._codec
-            ):
-                raise TypeError(
-                    f'Got invalid value for Dict[Any, Any]'
-                    f' at \'{fieldpath}\' on {cls.__name__};'
-                    f' all keys and values must be'
-                    f' compatible with the specified codec'
-                    f' ({self._codec.name}).'
-                )
-            out = value
-        else:
-            out = {}
-            keyanntype, valanntype = childtypes
 
-            # Ok; we've got definite key/value types (which we verified as
-            # valid during prep). Run all keys/values through it.
+            def _any_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(cls, fieldpath, value)
+                if not isinstance(value, dict) or not _is_valid_for_codec(
+                    value, codec
+                ):
+                    raise TypeError(
+                        f'Got invalid value for Dict[Any, Any]'
+                        f' at \'{fieldpath}\' on {cls.__name__};'
+                        f' all keys and values must be'
+                        f' compatible with the specified codec'
+                        f' ({codec.name}).'
+                    )
+                return value
+
+            return _any_dict
+
+        keyanntype, valanntype = childtypes
+        valfunc = self._compile_value(valanntype, ioattrs)
+
+        # Ok; we've got definite key/value types (which we verified as
+        # valid during prep). Run all keys/values through it.
 
-            # str keys we just take directly since that's supported by json.
-            if keyanntype is str:
+        # str keys we just take directly since that's supported by json.
+        if keyanntype is str:
+
+            def _str_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(cls, fieldpath, value)
+                out = {}
                 for key, val in value.items():
                     if not isinstance(key, str):
                         raise TypeError(
@@ -457,12 +556,17 @@ class _Inputter:
                             f' dict key at \'{fieldpath}\' on {cls.__name__};'
                             f' expected a str.'
                         )
-                    out[key] = self._value_from_input(
-                        cls, fieldpath, valanntype, val, ioattrs
-                    )
+                    out[key] = valfunc(cls, fieldpath, val)
+                return out
+
+            return _str_dict
 
-            # int keys are stored in json as str versions of themselves.
-            elif keyanntype is int:
+        # int keys are stored in json as str versions of themselves.
+        if keyanntype is int:
+
+            def _int_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(cls, fieldpath, value)
+                out = {}
                 for key, val in value.items():
                     if not isinstance(key, str):
                         raise TypeError(
@@ -478,152 +582,197 @@ class _Inputter:
                             f' dict key at \'{fieldpath}\' on {cls.__name__};'
                             f' expected an int in string form.'
                         ) from exc
-                    out[keyint] = self._value_from_input(
-                        cls, fieldpath, valanntype, val, ioattrs
-                    )
+                    out[keyint] = valfunc(cls, fieldpath, val)
+                return out
 
-            elif issubclass(keyanntype, Enum):
-                # In prep, we verified that all these enums' values have
-                # the same type, so we can just look at the first to see if
-                # this is a string enum or an int enum.
-                enumvaltype = type(next(iter(keyanntype)).value)
-                assert enumvaltype in (int, str)
-                if enumvaltype is str:
-                    for key, val in value.items():
-                        try:
-                            enumval = enum_by_value(keyanntype, key)
-                        except ValueError as exc:
-                            raise ValueError(
-                                f'Got invalid key value {key} for'
-                                f' dict key at \'{fieldpath}\''
-                                f' on {cls.__name__};'
-                                f' expected a value corresponding to'
-                                f' a {keyanntype}.'
-                            ) from exc
-                        out[enumval] = self._value_from_input(
-                            cls, fieldpath, valanntype, val, ioattrs
-                        )
-                else:
-                    for key, val in value.items():
-                        try:
-                            enumval = enum_by_value(keyanntype, int(key))
-                        except (ValueError, TypeError) as exc:
-                            raise ValueError(
-                                f'Got invalid key value {key} for'
-                                f' dict key at \'{fieldpath}\''
-                                f' on {cls.__name__};'
-                                f' expected {keyanntype} value (though'
-                                f' in string form).'
-                            ) from exc
-                        out[enumval] = self._value_from_input(
-                            cls, fieldpath, valanntype, val, ioattrs
-                        )
+            return _int_dict
 
-            else:
+        try:
+            is_enum = issubclass(keyanntype, Enum)
+        except TypeError:
+            # Keep failing at the same point a generic walk would.
+            def _bad_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(cls, fieldpath, value)
+                return issubclass(keyanntype, Enum)
+
+            return _bad_dict
+
+        if not is_enum:
+
+            def _unhandled_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(cls, fieldpath, value)
                 raise RuntimeError(f'Unhandled dict in-key-type {keyanntype}')
 
-        return out
+            return _unhandled_dict
 
-    def _sequence_from_input(
-        self,
-        cls: type,
-        fieldpath: str,
-        anntype: Any,
-        value: Any,
-        seqtype: type,
-        ioattrs: IOAttrs | None,
-    ) -> Any:
-        # Because we are json-centric, we expect a list for all sequences.
-        if type(value) is not list:
-            raise TypeError(
-                f'Invalid input value for "{fieldpath}";'
-                f' expected a list, got a {type(value).__name__}'
-            )
+        # In prep, we verified that all these enums' values have the
+        # same type, so we can just look at the first to see if this is
+        # a string enum or an int enum.
+        def _enum_dict(cls: type, fieldpath: str, value: Any) -> Any:
+            _check_dict(cls, fieldpath, value)
+            out = {}
+            enumvaltype = type(next(iter(keyanntype)).value)
+            assert enumvaltype in (int, str)
+            if enumvaltype is str:
+                for key, val in value.items():
+                    try:
+                        enumval = enum_by_value(keyanntype, key)
+                    except ValueError as exc:
+                        raise ValueError(
+                            f'Got invalid key value {key} for'
+                            f' dict key at \'{fieldpath}\''
+                            f' on {cls.__name__};'
+                            f' expected a value corresponding to'
+                            f' a {keyanntype}.'
+                        ) from exc
+                    out[enumval] = valfunc(cls, fieldpath, val)
+            else:
+                for key, val in value.items():
+                    try:
+                        enumval = enum_by_value(keyanntype, int(key))
+                    except (ValueError, TypeError) as exc:
+                        raise ValueError(
+                            f'Got invalid key value {key} for'
+                            f' dict key at \'{fieldpath}\''
+                            f' on {cls.__name__};'
+                            f' expected {keyanntype} value (though'
+                            f' in string form).'
+                        ) from exc
+                    out[enumval] = valfunc(cls, fieldpath, val)
+            return out
+
+        return _enum_dict
+
+    def _compile_sequence(
+        self, anntype: Any, seqtype: type, ioattrs: IOAttrs | None
+    ) -> _InFunc:
+        codec = self._codec
+
+        def _check_list(fieldpath: str, value: Any) -> None:
+            # Because we are json-centric, we expect a list for all
+            # sequences.
+            if type(value) is not list:
+                raise TypeError(
+                    f'Invalid input value for "{fieldpath}";'
+                    f' expected a list, got a {type(value).__name__}'
+                )
 
         childanntypes = typing.get_args(anntype)
 
         # 'Any' type children; make sure they are valid json values
         # and then just grab them.
         if len(childanntypes) == 0 or childanntypes[0] is typing.Any:
-            for i, child in enumerate(value):
-                if not _is_valid_for_codec(child, self._codec):
-                    raise TypeError(
-                        f'Item {i} of {fieldpath} contains'
-                        f' data type(s) not supported by json.'
-                    )
-            return value if type(value) is seqtype else seqtype(value)
+
+            def _any_seq(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
+                for i, child in enumerate(value):
+                    if not _is_valid_for_codec(child, codec):
+                        raise TypeError(
+                            f'Item {i} of {fieldpath} contains'
+                            f' data type(s) not supported by json.'
+                        )
+                return value if type(value) is seqtype else seqtype(value)
+
+            return _any_seq
 
         # We contain elements of some specified type.
         assert len(childanntypes) == 1
         childanntype = childanntypes[0]
 
+        try:
+            is_multitype = issubclass(childanntype, IOMultiType)
+        except TypeError:
+            # Some child annotations (unions, etc.) can't go through
+            # issubclass(); keep failing at the same point a generic
+            # walk of this type would.
+            def _bad_seq(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
+                return issubclass(childanntype, IOMultiType)
+
+            return _bad_seq
+
         # If our annotation type inherits from IOMultiType, use type-id
         # values to determine which type to load for each element.
-        if issubclass(childanntype, IOMultiType):
-            return seqtype(
-                self._dataclass_from_input(
-                    _get_multitype_type(childanntype, fieldpath, i),
-                    fieldpath,
-                    i,
+        if is_multitype:
+
+            def _multitype_seq(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
+                return seqtype(
+                    self.dataclass_from_input(
+                        _get_multitype_type(childanntype, fieldpath, i),
+                        fieldpath,
+                        i,
+                    )
+                    for i in value
                 )
-                for i in value
-            )
 
-        return seqtype(
-            self._value_from_input(cls, fieldpath, childanntype, i, ioattrs)
-            for i in value
-        )
+            return _multitype_seq
 
-    def _tuple_from_input(
-        self,
-        cls: type,
-        fieldpath: str,
-        anntype: Any,
-        value: Any,
-        ioattrs: IOAttrs | None,
-    ) -> Any:
-        out: list = []
+        childfunc = self._compile_value(childanntype, ioattrs)
 
-        # Because we are json-centric, we expect a list for all sequences.
-        if type(value) is not list:
-            raise TypeError(
-                f'Invalid input value for "{fieldpath}";'
-                f' expected a list, got a {type(value).__name__}'
-            )
+        if seqtype is list:
+
+            def _list(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
+                return [childfunc(cls, fieldpath, i) for i in value]
+
+            return _list
 
+        def _seq(cls: type, fieldpath: str, value: Any) -> Any:
+            _check_list(fieldpath, value)
+            return seqtype(childfunc(cls, fieldpath, i) for i in value)
+
+        return _seq
+
+    def _compile_tuple(self, anntype: Any, ioattrs: IOAttrs | None) -> _InFunc:
+        codec = self._codec
         childanntypes = typing.get_args(anntype)
 
         # We should have verified this to be non-zero at prep-time.
         assert childanntypes
+        childcount = len(childanntypes)
 
-        if len(value) != len(childanntypes):
-            raise ValueError(
-                f'Invalid tuple input for "{fieldpath}";'
-                f' expected {len(childanntypes)} values,'
-                f' found {len(value)}.'
-            )
+        # 'Any' type children get checked for json-validity and then
+        # grabbed as-is; they get None here.
+        childfuncs = [
+            None if c is typing.Any else self._compile_value(c, ioattrs)
+            for c in childanntypes
+        ]
 
-        for i, childanntype in enumerate(childanntypes):
-            childval = value[i]
+        def _tuple(cls: type, fieldpath: str, value: Any) -> Any:
+            out: list = []
 
-            # 'Any' type children; make sure they are valid json values
-            # and then just grab them.
-            if childanntype is typing.Any:
-                if not _is_valid_for_codec(childval, self._codec):
-                    raise TypeError(
-                        f'Item {i} of {fieldpath} contains'
-                        f' data type(s) not supported by json.'
-                    )
-                out.append(childval)
-            else:
-                out.append(
-                    self._value_from_input(
-                        cls, fieldpath, childanntype, childval, ioattrs
-                    )
+            # Because we are json-centric, we expect a list for all
+            # sequences.
+            if type(value) is not list:
+                raise TypeError(
+                    f'Invalid input value for "{fieldpath}";'
+                    f' expected a list, got a {type(value).__name__}'
                 )
 
-        assert len(out) == len(childanntypes)
-        return tuple(out)
+            if len(value) != childcount:
+                raise ValueError(
+                    f'Invalid tuple input for "{fieldpath}";'
+                    f' expected {childcount} values,'
+                    f' found {len(value)}.'
+                )
+
+            for i, childfunc in enumerate(childfuncs):
+                childval = value[i]
+                if childfunc is None:
+                    if not _is_valid_for_codec(childval, codec):
+                        raise TypeError(
+                            f'Item {i} of {fieldpath} contains'
+                            f' data type(s) not supported by json.'
+                        )
+                    out.append(childval)
+                else:
+                    out.append(childfunc(cls, fieldpath, childval))
+
+            assert len(out) == childcount
+            return tuple(out)
+
+        return _tuple
 
     def _datetime_from_input(
         self, cls: type, fieldpath: str, value: Any, ioattrs: IOAttrs | None
@@ -662,9 +811,8 @@ class _Inputter:
         return out
 
     def _timedelta_from_input(
-        self, cls: type, fieldpath: str, value: Any, ioattrs: IOAttrs | None
+        self, cls: type, fieldpath: str, value: Any
     ) -> Any:
-        del ioattrs  # Unused.
         # We expect a list of 3 ints.
         if type(value) is not list:
             raise TypeError(
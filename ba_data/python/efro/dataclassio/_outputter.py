@@ -13,6 +13,7 @@ import dataclasses
 import typing
 import types
 import json
+import base64
 import datetime
 from typing import TYPE_CHECKING, cast, Any
 
@@ -31,8 +32,23 @@ from efro.dataclassio._base import (
 from efro.dataclassio._prep import PrepSession
 
 if TYPE_CHECKING:
+    from typing import Callable
+
     from efro.dataclassio._base import IOAttrs
 
+    # Compiled output functions take the top level class being output
+    # (for error messages), a field path, and a value.
+    _OutFunc = Callable[[type, str, Any], Any]
+
+# Attr name for the per-class dict of compiled output functions (keyed
+# by output options). We look this up in each class' own __dict__ so
+# subclasses never pick up their parents' functions.
+OUTPUT_FUNCS_ATTR = '_DCIOOUTFUNCS'
+
+
+def _json_sort_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
 
 class _Outputter:
     """Validates or exports data contained in a dataclass instance."""
@@ -46,10 +62,9 @@ class _Outputter:
         discard_extra_attrs: bool,
     ) -> None:
         self._obj = obj
-        self._create = create
-        self._codec = codec
-        self._coerce_to_float = coerce_to_float
-        self._discard_extra_attrs = discard_extra_attrs
+        self._compiler = _OutputCompiler.get(
+            create, codec, coerce_to_float, discard_extra_attrs
+        )
 
     def run(self) -> Any:
         """Do the thing."""
@@ -66,161 +81,258 @@ class _Outputter:
         if isinstance(obj, IOExtendedData):
             obj.will_output()
 
-        return self._process_dataclass(type(obj), obj, '')
+        return self._compiler.process_dataclass(type(obj), obj, '')
 
     def soft_default_check(
         self, value: Any, anntype: Any, fieldpath: str
     ) -> None:
         """(internal)"""
-        self._process_value(
-            type(value),
-            fieldpath=fieldpath,
-            anntype=anntype,
-            value=value,
-            ioattrs=None,
-        )
+        self._compiler.value_func(anntype)(type(value), fieldpath, value)
+
+
+class _OutputCompiler:
+    """Builds and caches specialized output functions for dataclasses.
+
+    There is one of these per combination of output options. For each
+    dataclass type it builds (once) a function running the exact checks
+    and conversions a generic walk of the type's annotations would, but
+    with all annotation parsing and type dispatch done up front.
+    """
+
+    _instances: dict[tuple[bool, Codec, bool, bool], _OutputCompiler] = {}
 
-    def _process_dataclass(self, cls: type, obj: Any, fieldpath: str) -> Any:
+    def __init__(
+        self,
+        create: bool,
+        codec: Codec,
+        coerce_to_float: bool,
+        discard_extra_attrs: bool,
+    ) -> None:
+        self._key = (create, codec, coerce_to_float, discard_extra_attrs)
+        self._create = create
+        self._codec = codec
+        self._coerce_to_float = coerce_to_float
+        self._discard_extra_attrs = discard_extra_attrs
+
+        # Bare (non-annotated) value functions; used for soft-defaults.
+        self._value_funcs: dict[Any, _OutFunc] = {}
+
+    @classmethod
+    def get(
+        cls,
+        create: bool,
+        codec: Codec,
+        coerce_to_float: bool,
+        discard_extra_attrs: bool,
+    ) -> _OutputCompiler:
+        """Return the shared compiler for a set of options."""
+        key = (create, codec, coerce_to_float, discard_extra_attrs)
+        compiler = cls._instances.get(key)
+        if compiler is None:
+            compiler = cls._instances[key] = cls(*key)
+        return compiler
+
+    def process_dataclass(self, cls: type, obj: Any, fieldpath: str) -> Any:
+        """Output a dataclass instance; 'cls' is the top level type."""
+        objtype = type(obj)
+        funcs = objtype.__dict__.get(OUTPUT_FUNCS_ATTR)
+        func = None if funcs is None else funcs.get(self._key)
+        if func is None:
+            func = self._compile_dataclass(objtype)
+            if funcs is None:
+                funcs = {}
+                setattr(objtype, OUTPUT_FUNCS_ATTR, funcs)
+            funcs[self._key] = func
+        return func(cls, obj, fieldpath)
+
+    def value_func(self, anntype: Any) -> _OutFunc:
+        """Return a (cached) function for a bare annotation type."""
+        try:
+            func = self._value_funcs.get(anntype)
+        except TypeError:
+            # Unhashable annotation; just don't cache it.
+            return self._compile_value(anntype, None)
+        if func is None:
+            func = self._value_funcs[anntype] = self._compile_value(
+                anntype, None
+            )
+        return func
+
+    def _compile_dataclass(self, objtype: type) -> _OutFunc:
         # pylint: disable=too-many-locals
-        # pylint: disable=too-many-branches
         # pylint: disable=too-many-statements
         prep = PrepSession(explicit=False).prep_dataclass(
-            type(obj), recursion_level=0
+            objtype, recursion_level=0
         )
         assert prep is not None
-        fields = dataclasses.fields(obj)
-        out: dict[str, Any] | None = {} if self._create else None
+        fields = dataclasses.fields(objtype)
+        entries: list[
+            tuple[str, str, Callable[[type, Any], bool] | None, _OutFunc]
+        ] = []
         for field in fields:
             fieldname = field.name
-            if fieldpath:
-                subfieldpath = f'{fieldpath}.{fieldname}'
-            else:
-                subfieldpath = fieldname
-            anntype = prep.annotations[fieldname]
-            value = getattr(obj, fieldname)
-
-            anntype, ioattrs = _parse_annotated(anntype)
-
-            # If we're not storing default values for this fella,
-            # we can skip all output processing if we've got a default value.
-            if ioattrs is not None and not ioattrs.store_default:
-                # If both soft_defaults and regular field defaults
-                # are present we want to go with soft_defaults since
-                # those same values would be re-injected when reading
-                # the same data back in if we've omitted the field.
-                default_factory: Any = field.default_factory
-                if ioattrs.soft_default is not ioattrs.MISSING:
-                    if ioattrs.soft_default == value:
-                        continue
-                elif ioattrs.soft_default_factory is not ioattrs.MISSING:
-                    assert callable(ioattrs.soft_default_factory)
-                    if ioattrs.soft_default_factory() == value:
-                        continue
-                elif field.default is not dataclasses.MISSING:
-                    if field.default == value:
-                        continue
-                elif default_factory is not dataclasses.MISSING:
-                    if default_factory() == value:
-                        continue
-                else:
-                    raise RuntimeError(
-                        f'Field {fieldname} of {cls.__name__} has'
-                        f' no source of default values; store_default=False'
-                        f' cannot be set for it. (AND THIS SHOULD HAVE BEEN'
-                        f' CAUGHT IN PREP!)'
-                    )
-
-            outvalue = self._process_value(
-                cls, subfieldpath, anntype, value, ioattrs
+            anntype, ioattrs = _parse_annotated(prep.annotations[fieldname])
+            storagename = (
+                fieldname
+                if (ioattrs is None or ioattrs.storagename is None)
+                else ioattrs.storagename
             )
-            if self._create:
-                assert out is not None
-                storagename = (
-                    fieldname
-                    if (ioattrs is None or ioattrs.storagename is None)
-                    else ioattrs.storagename
+            entries.append(
+                (
+                    fieldname,
+                    storagename,
+                    self._compile_default_check(field, ioattrs),
+                    self._compile_value(anntype, ioattrs),
                 )
-                out[storagename] = outvalue
+            )
 
-        # If there's extra-attrs stored on us, check/include them.
-        if not self._discard_extra_attrs:
-            extra_attrs = getattr(obj, EXTRA_ATTRS_ATTR, None)
-            if isinstance(extra_attrs, dict):
-                if not _is_valid_for_codec(extra_attrs, self._codec):
-                    raise TypeError(
-                        f'Extra attrs on \'{fieldpath}\' contains data type(s)'
-                        f' not supported by \'{self._codec.value}\' codec:'
-                        f' {extra_attrs}.'
-                    )
-                if self._create:
-                    assert out is not None
-                    out.update(extra_attrs)
-
-        # If this obj inherits from multi-type, store its type id.
-        if isinstance(obj, IOMultiType):
-            type_id = obj.get_type_id()
-
-            # Sanity checks; make sure looking up this id gets us this
-            # type.
-            assert isinstance(type_id.value, str)
-            if obj.get_type(type_id) is not type(obj):
-                raise RuntimeError(
-                    f'dataclassio: object of type {type(obj)}'
-                    f' gives type-id {type_id} but that id gives type'
-                    f' {obj.get_type(type_id)}. Something is out of sync.'
+        create = self._create
+        codec = self._codec
+        discard_extra_attrs = self._discard_extra_attrs
+        is_multitype = issubclass(objtype, IOMultiType)
+
+        def _process(cls: type, obj: Any, fieldpath: str) -> Any:
+            out: dict[str, Any] | None = {} if create else None
+            for fieldname, storagename, is_default, valfunc in entries:
+                value = getattr(obj, fieldname)
+
+                # If we're not storing default values for this fella,
+                # we can skip all output processing if we've got a
+                # default value.
+                if is_default is not None and is_default(cls, value):
+                    continue
+
+                outvalue = valfunc(
+                    cls,
+                    f'{fieldpath}.{fieldname}' if fieldpath else fieldname,
+                    value,
                 )
-            assert obj.get_type(type_id) is type(obj)
-            if self._create:
-                assert out is not None
-                storagename = obj.get_type_id_storage_name()
-                if any(f.name == storagename for f in fields):
+                if create:
+                    assert out is not None
+                    out[storagename] = outvalue
+
+            # If there's extra-attrs stored on us, check/include them.
+            if not discard_extra_attrs:
+                extra_attrs = getattr(obj, EXTRA_ATTRS_ATTR, None)
+                if isinstance(extra_attrs, dict):
+                    if not _is_valid_for_codec(extra_attrs, codec):
+                        raise TypeError(
+                            f'Extra attrs on \'{fieldpath}\' contains data'
+                            f' type(s) not supported by \'{codec.value}\''
+                            f' codec: {extra_attrs}.'
+                        )
+                    if create:
+                        assert out is not None
+                        out.update(extra_attrs)
+
+            # If this obj inherits from multi-type, store its type id.
+            if is_multitype:
+                type_id = obj.get_type_id()
+
+                # Sanity checks; make sure looking up this id gets us
+                # this type.
+                assert isinstance(type_id.value, str)
+                if obj.get_type(type_id) is not type(obj):
                     raise RuntimeError(
-                        f'dataclassio: {type(obj)} contains a'
-                        f" '{storagename}' field which clashes with"
-                        f' the type-id-storage-name of the IOMulticlass'
-                        f' it inherits from.'
+                        f'dataclassio: object of type {type(obj)}'
+                        f' gives type-id {type_id} but that id gives type'
+                        f' {obj.get_type(type_id)}. Something is out of'
+                        f' sync.'
                     )
-                out[storagename] = type_id.value
+                assert obj.get_type(type_id) is type(obj)
+                if create:
+                    assert out is not None
+                    storagename = obj.get_type_id_storage_name()
+                    if any(f.name == storagename for f in fields):
+                        raise RuntimeError(
+                            f'dataclassio: {type(obj)} contains a'
+                            f" '{storagename}' field which clashes with"
+                            f' the type-id-storage-name of the IOMulticlass'
+                            f' it inherits from.'
+                        )
+                    out[storagename] = type_id.value
 
-        return out
+            return out
 
-    def _process_value(
-        self,
-        cls: type,
-        fieldpath: str,
-        anntype: Any,
-        value: Any,
-        ioattrs: IOAttrs | None,
-    ) -> Any:
+        return _process
+
+    @staticmethod
+    def _compile_default_check(
+        field: dataclasses.Field, ioattrs: IOAttrs | None
+    ) -> Callable[[type, Any], bool] | None:
+        """Return a call telling if a value can be skipped as default."""
+        if ioattrs is None or ioattrs.store_default:
+            return None
+
+        # If both soft_defaults and regular field defaults are present
+        # we want to go with soft_defaults since those same values would
+        # be re-injected when reading the same data back in if we've
+        # omitted the field.
+        default_factory: Any = field.default_factory
+        if ioattrs.soft_default is not ioattrs.MISSING:
+            soft_default = ioattrs.soft_default
+            return lambda cls, value: bool(soft_default == value)
+        if ioattrs.soft_default_factory is not ioattrs.MISSING:
+            soft_default_factory = ioattrs.soft_default_factory
+            assert callable(soft_default_factory)
+            return lambda cls, value: bool(soft_default_factory() == value)
+        if field.default is not dataclasses.MISSING:
+            default = field.default
+            return lambda cls, value: bool(default == value)
+        if default_factory is not dataclasses.MISSING:
+            return lambda cls, value: bool(default_factory() == value)
+
+        fieldname = field.name
+
+        def _no_default(cls: type, value: Any) -> bool:
+            raise RuntimeError(
+                f'Field {fieldname} of {cls.__name__} has'
+                f' no source of default values; store_default=False'
+                f' cannot be set for it. (AND THIS SHOULD HAVE BEEN'
+                f' CAUGHT IN PREP!)'
+            )
+
+        return _no_default
+
+    def _compile_value(self, anntype: Any, ioattrs: IOAttrs | None) -> _OutFunc:
         # pylint: disable=too-many-return-statements
         # pylint: disable=too-many-branches
         # pylint: disable=too-many-statements
+        create = self._create
+        codec = self._codec
 
         origin = _get_origin(anntype)
 
         if origin is typing.Any:
-            if not _is_valid_for_codec(value, self._codec):
-                raise TypeError(
-                    f'Invalid value type for \'{fieldpath}\';'
-                    f" 'Any' typed values must contain types directly"
-                    f' supported by the specified codec ({self._codec.name});'
-                    f' found \'{type(value).__name__}\' which is not.'
-                )
-            return value if self._create else None
+
+            def _any(cls: type, fieldpath: str, value: Any) -> Any:
+                if not _is_valid_for_codec(value, codec):
+                    raise TypeError(
+                        f'Invalid value type for \'{fieldpath}\';'
+                        f" 'Any' typed values must contain types directly"
+                        f' supported by the specified codec ({codec.name});'
+                        f' found \'{type(value).__name__}\' which is not.'
+                    )
+                return value if create else None
+
+            return _any
 
         if origin is typing.Union or origin is types.UnionType:
             # Currently, the only unions we support are None/Value
             # (translated from Optional), which we verified on prep.
             # So let's treat this as a simple optional case.
-            if value is None:
-                return None
             childanntypes_l = [
                 c for c in typing.get_args(anntype) if c is not type(None)
             ]  # noqa (pycodestyle complains about *is* with type)
             assert len(childanntypes_l) == 1
-            return self._process_value(
-                cls, fieldpath, childanntypes_l[0], value, ioattrs
-            )
+            childfunc = self._compile_value(childanntypes_l[0], ioattrs)
+
+            def _optional(cls: type, fieldpath: str, value: Any) -> Any:
+                if value is None:
+                    return None
+                return childfunc(cls, fieldpath, value)
+
+            return _optional
 
         # Everything below this point assumes the annotation type resolves
         # to a concrete type. (This should have been verified at prep time).
@@ -228,74 +340,223 @@ class _Outputter:
 
         # For simple flat types, look for exact matches:
         if origin in SIMPLE_TYPES:
-            if type(value) is not origin:
-                # Special case: if they want to coerce ints to floats, do so.
-                if (
-                    self._coerce_to_float
-                    and origin is float
-                    and type(value) is int
-                ):
-                    return float(value) if self._create else None
-                _raise_type_error(fieldpath, type(value), (origin,))
-            return value if self._create else None
+            if self._coerce_to_float and origin is float:
+
+                def _float(cls: type, fieldpath: str, value: Any) -> Any:
+                    if type(value) is not float:
+                        # Special case: coerce ints to floats.
+                        if type(value) is int:
+                            return float(value) if create else None
+                        _raise_type_error(fieldpath, type(value), (float,))
+                    return value if create else None
+
+                return _float
+
+            def _simple(cls: type, fieldpath: str, value: Any) -> Any:
+                if type(value) is not origin:
+                    _raise_type_error(fieldpath, type(value), (origin,))
+                return value if create else None
+
+            return _simple
 
         if origin is tuple:
+            return self._compile_tuple(anntype, ioattrs)
+
+        if origin is list:
+            return self._compile_list(anntype, ioattrs)
+
+        if origin is set:
+            return self._compile_set(anntype, ioattrs)
+
+        if origin is dict:
+            return self._compile_dict(anntype, ioattrs)
+
+        if dataclasses.is_dataclass(origin):
+            origin_any = cast(Any, origin)
+
+            def _dataclass(cls: type, fieldpath: str, value: Any) -> Any:
+                if not isinstance(value, origin_any):
+                    raise TypeError(
+                        f'Expected a {origin} for {fieldpath};'
+                        f' found a {type(value)}.'
+                    )
+                return self.process_dataclass(cls, value, fieldpath)
+
+            return _dataclass
+
+        # ONLY consider something as a multi-type when it's not a
+        # dataclass (all dataclasses inheriting from the multi-type should
+        # just be processed as dataclasses).
+        if issubclass(origin, IOMultiType):
+
+            def _multitype(cls: type, fieldpath: str, value: Any) -> Any:
+                # In the multi-type case, we use each object's own type
+                # to do its conversion, but lets at least make sure each
+                # of those types inherits from the annotated multi-type
+                # class.
+                if not isinstance(value, origin):
+                    raise ValueError(
+                        f"Found a {type(value)} value at '{fieldpath}'."
+                        f' It is expected to inherit from {origin}.'
+                    )
+                return self.process_dataclass(cls, value, fieldpath)
+
+            return _multitype
+
+        if issubclass(origin, Enum):
+
+            def _enum(cls: type, fieldpath: str, value: Any) -> Any:
+                if not isinstance(value, origin):
+                    raise TypeError(
+                        f'Expected a {origin} for {fieldpath};'
+                        f' found a {type(value)}.'
+                    )
+                # At prep-time we verified that these enums had valid
+                # value types, so we can blindly return it here.
+                return value.value if create else None
+
+            return _enum
+
+        if issubclass(origin, datetime.datetime):
+
+            def _datetime(cls: type, fieldpath: str, value: Any) -> Any:
+                if not isinstance(value, origin):
+                    raise TypeError(
+                        f'Expected a {origin} for {fieldpath};'
+                        f' found a {type(value)}.'
+                    )
+                check_utc(value)
+                if ioattrs is not None:
+                    ioattrs.validate_datetime(value, fieldpath)
+                if codec is Codec.FIRESTORE:
+                    return value
+                assert codec is Codec.JSON
+                return (
+                    [
+                        value.year,
+                        value.month,
+                        value.day,
+                        value.hour,
+                        value.minute,
+                        value.second,
+                        value.microsecond,
+                    ]
+                    if create
+                    else None
+                )
+
+            return _datetime
+
+        if issubclass(origin, datetime.timedelta):
+
+            def _timedelta(cls: type, fieldpath: str, value: Any) -> Any:
+                if not isinstance(value, origin):
+                    raise TypeError(
+                        f'Expected a {origin} for {fieldpath};'
+                        f' found a {type(value)}.'
+                    )
+                return (
+                    [value.days, value.seconds, value.microseconds]
+                    if create
+                    else None
+                )
+
+            return _timedelta
+
+        if origin is bytes:
+            return self._process_bytes
+
+        def _unsupported(cls: type, fieldpath: str, value: Any) -> Any:
+            raise TypeError(
+                f"Field '{fieldpath}' of type '{anntype}' is unsupported here."
+            )
+
+        return _unsupported
+
+    def _compile_tuple(self, anntype: Any, ioattrs: IOAttrs | None) -> _OutFunc:
+        create = self._create
+        childanntypes = typing.get_args(anntype)
+
+        # We should have verified this was non-zero at prep-time
+        assert childanntypes
+        childfuncs = [self._compile_value(c, ioattrs) for c in childanntypes]
+        childcount = len(childanntypes)
+
+        def _tuple(cls: type, fieldpath: str, value: Any) -> Any:
             if not isinstance(value, tuple):
                 raise TypeError(
                     f'Expected a tuple for {fieldpath};'
                     f' found a {type(value)}'
                 )
-            childanntypes = typing.get_args(anntype)
-
-            # We should have verified this was non-zero at prep-time
-            assert childanntypes
-            if len(value) != len(childanntypes):
+            if len(value) != childcount:
                 raise TypeError(
                     f'Tuple at {fieldpath} contains'
                     f' {len(value)} values; type specifies'
-                    f' {len(childanntypes)}.'
+                    f' {childcount}.'
                 )
-            if self._create:
+            if create:
                 return [
-                    self._process_value(
-                        cls, fieldpath, childanntypes[i], x, ioattrs
-                    )
+                    childfuncs[i](cls, fieldpath, x)
                     for i, x in enumerate(value)
                 ]
             for i, x in enumerate(value):
-                self._process_value(
-                    cls, fieldpath, childanntypes[i], x, ioattrs
-                )
+                childfuncs[i](cls, fieldpath, x)
             return None
 
-        if origin is list:
+        return _tuple
+
+    def _compile_list(self, anntype: Any, ioattrs: IOAttrs | None) -> _OutFunc:
+        create = self._create
+        codec = self._codec
+        childanntypes = typing.get_args(anntype)
+
+        def _check_list(fieldpath: str, value: Any) -> None:
             if not isinstance(value, list):
                 raise TypeError(
                     f'Expected a list for {fieldpath};'
                     f' found a {type(value)}'
                 )
 
-            childanntypes = typing.get_args(anntype)
+        # 'Any' type children; make sure they are valid values for
+        # the specified codec.
+        if len(childanntypes) == 0 or childanntypes[0] is typing.Any:
 
-            # 'Any' type children; make sure they are valid values for
-            # the specified codec.
-            if len(childanntypes) == 0 or childanntypes[0] is typing.Any:
+            def _any_list(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
                 for i, child in enumerate(value):
-                    if not _is_valid_for_codec(child, self._codec):
+                    if not _is_valid_for_codec(child, codec):
                         raise TypeError(
                             f'Item {i} of {fieldpath} contains'
                             f' data type(s) not supported by the specified'
-                            f' codec ({self._codec.name}).'
+                            f' codec ({codec.name}).'
                         )
                 # Hmm; should we do a copy here?
-                return value if self._create else None
+                return value if create else None
 
-            # We contain elements of some single specified type.
-            assert len(childanntypes) == 1
-            childanntype = childanntypes[0]
+            return _any_list
+
+        # We contain elements of some single specified type.
+        assert len(childanntypes) == 1
+        childanntype = childanntypes[0]
+
+        try:
+            is_multitype = issubclass(childanntype, IOMultiType)
+        except TypeError:
+            # Some child annotations (unions, etc.) can't go through
+            # issubclass(); keep failing at the same point a generic
+            # walk of this type would.
+            def _bad_list(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
+                return issubclass(childanntype, IOMultiType)
+
+            return _bad_list
+
+        # If that type is a multi-type, we determine our type per-object.
+        if is_multitype:
+
+            def _multitype_list(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_list(fieldpath, value)
 
-            # If that type is a multi-type, we determine our type per-object.
-            if issubclass(childanntype, IOMultiType):
                 # In the multi-type case, we use each object's own type
                 # to do its conversion, but lets at least make sure each
                 # of those types inherits from the annotated multi-type
@@ -308,47 +569,54 @@ class _Outputter:
                             f' {childanntype}.'
                         )
 
-                if self._create:
-                    out: list[Any] = []
-                    for x in value:
-                        # We know these are dataclasses so no need to do
-                        # the generic _process_value.
-                        out.append(self._process_dataclass(cls, x, fieldpath))
-                    return out
+                # We know these are dataclasses so no need to do the
+                # generic value processing.
+                if create:
+                    return [
+                        self.process_dataclass(cls, x, fieldpath)
+                        for x in value
+                    ]
                 for x in value:
-                    # We know these are dataclasses so no need to do
-                    # the generic _process_value.
-                    self._process_dataclass(cls, x, fieldpath)
+                    self.process_dataclass(cls, x, fieldpath)
+                return None
 
-            # Normal non-multitype case; everything's got the same type.
-            if self._create:
-                return [
-                    self._process_value(
-                        cls, fieldpath, childanntypes[0], x, ioattrs
-                    )
-                    for x in value
-                ]
+            return _multitype_list
+
+        # Normal non-multitype case; everything's got the same type.
+        childfunc = self._compile_value(childanntype, ioattrs)
+
+        def _list(cls: type, fieldpath: str, value: Any) -> Any:
+            _check_list(fieldpath, value)
+            if create:
+                return [childfunc(cls, fieldpath, x) for x in value]
             for x in value:
-                self._process_value(
-                    cls, fieldpath, childanntypes[0], x, ioattrs
-                )
+                childfunc(cls, fieldpath, x)
             return None
 
-        if origin is set:
+        return _list
+
+    def _compile_set(self, anntype: Any, ioattrs: IOAttrs | None) -> _OutFunc:
+        create = self._create
+        codec = self._codec
+        childanntypes = typing.get_args(anntype)
+
+        def _check_set(fieldpath: str, value: Any) -> None:
             if not isinstance(value, set):
                 raise TypeError(
                     f'Expected a set for {fieldpath};' f' found a {type(value)}'
                 )
-            childanntypes = typing.get_args(anntype)
 
-            # 'Any' type children; make sure they are valid Any values.
-            if len(childanntypes) == 0 or childanntypes[0] is typing.Any:
+        # 'Any' type children; make sure they are valid Any values.
+        if len(childanntypes) == 0 or childanntypes[0] is typing.Any:
+
+            def _any_set(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_set(fieldpath, value)
                 for child in value:
-                    if not _is_valid_for_codec(child, self._codec):
+                    if not _is_valid_for_codec(child, codec):
                         raise TypeError(
                             f'Set at {fieldpath} contains'
                             f' data type(s) not supported by the'
-                            f' specified codec ({self._codec.name}).'
+                            f' specified codec ({codec.name}).'
                         )
                 # We output json-friendly values so this becomes a list.
                 # We need to sort the list so our output is
@@ -362,131 +630,45 @@ class _Outputter:
                 # good reason to avoid set[Any] though. Perhaps we
                 # should just disallow it altogether.
                 return (
-                    sorted(value, key=lambda v: json.dumps(v, sort_keys=True))
-                    if self._create
-                    else None
+                    sorted(value, key=_json_sort_key) if create else None
                 )
 
-            # We contain elements of some specified type.
-            assert len(childanntypes) == 1
-            if self._create:
-                # We output json-friendly values so this becomes a list.
-                # We need to sort the list so our output is
-                # deterministic and can be meaningfully compared with
-                # others, across processes, etc.
-                #
-                # In this case we have a single concrete type, and for
-                # most incarnations of that (str, int, etc.) we can just
-                # sort our final output. For more complex cases,
-                # however, such as optional values or dataclasses, we
-                # need to convert everything to a json string (itself
-                # with keys sorted) and sort based on those strings.
-                # This is probably a good reason to avoid sets
-                # containing dataclasses or optional values. Perhaps we
-                # should just disallow those.
+            return _any_set
+
+        # We contain elements of some specified type.
+        assert len(childanntypes) == 1
+        childfunc = self._compile_value(childanntypes[0], ioattrs)
+
+        # In the single concrete type case, for most incarnations of
+        # that (str, int, etc.) we can just sort our final output. For
+        # more complex cases, however, such as optional values or
+        # dataclasses, we need to convert everything to a json string
+        # (itself with keys sorted) and sort based on those strings.
+        # This is probably a good reason to avoid sets containing
+        # dataclasses or optional values. Perhaps we should just
+        # disallow those.
+        sortkey = (
+            None
+            if childanntypes[0] in [str, int, float, bool]
+            else _json_sort_key
+        )
+
+        def _set(cls: type, fieldpath: str, value: Any) -> Any:
+            _check_set(fieldpath, value)
+            if create:
+                # We output json-friendly values so this becomes a
+                # (deterministically sorted) list.
                 return sorted(
-                    (
-                        self._process_value(
-                            cls, fieldpath, childanntypes[0], x, ioattrs
-                        )
-                        for x in value
-                    ),
-                    key=(
-                        None
-                        if childanntypes[0] in [str, int, float, bool]
-                        else lambda v: json.dumps(v, sort_keys=True)
-                    ),
+                    (childfunc(cls, fieldpath, x) for x in value),
+                    key=sortkey,
                 )
-
             for x in value:
-                self._process_value(
-                    cls, fieldpath, childanntypes[0], x, ioattrs
-                )
+                childfunc(cls, fieldpath, x)
             return None
 
-        if origin is dict:
-            return self._process_dict(cls, fieldpath, anntype, value, ioattrs)
-
-        if dataclasses.is_dataclass(origin):
-            if not isinstance(value, cast(Any, origin)):
-                raise TypeError(
-                    f'Expected a {origin} for {fieldpath};'
-                    f' found a {type(value)}.'
-                )
-            return self._process_dataclass(cls, value, fieldpath)
-
-        # ONLY consider something as a multi-type when it's not a
-        # dataclass (all dataclasses inheriting from the multi-type should
-        # just be processed as dataclasses).
-        if issubclass(origin, IOMultiType):
-            # In the multi-type case, we use each object's own type to
-            # do its conversion, but lets at least make sure each of
-            # those types inherits from the annotated multi-type class.
-            if not isinstance(value, origin):
-                raise ValueError(
-                    f"Found a {type(value)} value at '{fieldpath}'."
-                    f' It is expected to inherit from {origin}.'
-                )
-
-            return self._process_dataclass(cls, value, fieldpath)
-
-        if issubclass(origin, Enum):
-            if not isinstance(value, origin):
-                raise TypeError(
-                    f'Expected a {origin} for {fieldpath};'
-                    f' found a {type(value)}.'
-                )
-            # At prep-time we verified that these enums had valid value
-            # types, so we can blindly return it here.
-            return value.value if self._create else None
-
-        if issubclass(origin, datetime.datetime):
-            if not isinstance(value, origin):
-                raise TypeError(
-                    f'Expected a {origin} for {fieldpath};'
-                    f' found a {type(value)}.'
-                )
-            check_utc(value)
-            if ioattrs is not None:
-                ioattrs.validate_datetime(value, fieldpath)
-            if self._codec is Codec.FIRESTORE:
-                return value
-            assert self._codec is Codec.JSON
-            return (
-                [
-                    value.year,
-                    value.month,
-                    value.day,
-                    value.hour,
-                    value.minute,
-                    value.second,
-                    value.microsecond,
-                ]
-                if self._create
-                else None
-            )
-        if issubclass(origin, datetime.timedelta):
-            if not isinstance(value, origin):
-                raise TypeError(
-                    f'Expected a {origin} for {fieldpath};'
-                    f' found a {type(value)}.'
-                )
-            return (
-                [value.days, value.seconds, value.microseconds]
-                if self._create
-                else None
-            )
-
-        if origin is bytes:
-            return self._process_bytes(cls, fieldpath, value)
-
-        raise TypeError(
-            f"Field '{fieldpath}' of type '{anntype}' is unsupported here."
-        )
+        return _set
 
     def _process_bytes(self, cls: type, fieldpath: str, value: bytes) -> Any:
-        import base64
-
         if not isinstance(value, bytes):
             raise TypeError(
                 f'Expected bytes for {fieldpath} on {cls.__name__};'
@@ -503,89 +685,119 @@ class _Outputter:
         assert self._codec is Codec.FIRESTORE
         return value
 
-    def _process_dict(
-        self,
-        cls: type,
-        fieldpath: str,
-        anntype: Any,
-        value: dict,
-        ioattrs: IOAttrs | None,
-    ) -> Any:
-        # pylint: disable=too-many-branches
-        if not isinstance(value, dict):
-            raise TypeError(
-                f'Expected a dict for {fieldpath};' f' found a {type(value)}.'
-            )
+    def _compile_dict(self, anntype: Any, ioattrs: IOAttrs | None) -> _OutFunc:
+        # pylint: disable=too-many-statements
+        create = self._create
+        codec = self._codec
+
+        def _check_dict(fieldpath: str, value: Any) -> None:
+            if not isinstance(value, dict):
+                raise TypeError(
+                    f'Expected a dict for {fieldpath};'
+                    f' found a {type(value)}.'
+                )
+
         childtypes = typing.get_args(anntype)
         assert len(childtypes) in (0, 2)
 
         # We treat 'Any' dicts simply as json; we don't do any translating.
-        value_any: Any = value
         if not childtypes or childtypes[0] is typing.Any:
-            if not isinstance(value_any, dict) or not _is_valid_for_codec(
-                value, self._codec
-            ):
-                raise TypeError(
-                    f'Invalid value for Dict[Any, Any]'
-                    f' at \'{fieldpath}\' on {cls.__name__};'
-                    f' all keys and values must be directly compatible'
-                    f' with the specified codec ({self._codec.name})'
-                    f' when dict type is Any.'
-                )
-            return value if self._create else None
+
+            def _any_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(fieldpath, value)
+                if not isinstance(value, dict) or not _is_valid_for_codec(
+                    value, codec
+                ):
+                    raise TypeError(
+                        f'Invalid value for Dict[Any, Any]'
+                        f' at \'{fieldpath}\' on {cls.__name__};'
+                        f' all keys and values must be directly compatible'
+                        f' with the specified codec ({codec.name})'
+                        f' when dict type is Any.'
+                    )
+                return value if create else None
+
+            return _any_dict
 
         # Ok; we've got a definite key type (which we verified as valid
         # during prep). Make sure all keys match it.
-        out: dict | None = {} if self._create else None
         keyanntype, valanntype = childtypes
+        valfunc = self._compile_value(valanntype, ioattrs)
 
         # str keys we just export directly since that's supported by json.
         if keyanntype is str:
-            for key, val in value.items():
-                if not isinstance(key, str):
-                    raise TypeError(
-                        f'Got invalid key type {type(key)} for'
-                        f' dict key at \'{fieldpath}\' on {cls.__name__};'
-                        f' expected {keyanntype}.'
-                    )
-                outval = self._process_value(
-                    cls, fieldpath, valanntype, val, ioattrs
-                )
-                if self._create:
-                    assert out is not None
-                    out[key] = outval
+
+            def _str_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(fieldpath, value)
+                out: dict | None = {} if create else None
+                for key, val in value.items():
+                    if not isinstance(key, str):
+                        raise TypeError(
+                            f'Got invalid key type {type(key)} for'
+                            f' dict key at \'{fieldpath}\' on {cls.__name__};'
+                            f' expected {keyanntype}.'
+                        )
+                    outval = valfunc(cls, fieldpath, val)
+                    if create:
+                        assert out is not None
+                        out[key] = outval
+                return out
+
+            return _str_dict
 
         # int keys are stored as str versions of themselves.
-        elif keyanntype is int:
-            for key, val in value.items():
-                if not isinstance(key, int):
-                    raise TypeError(
-                        f'Got invalid key type {type(key)} for'
-                        f' dict key at \'{fieldpath}\' on {cls.__name__};'
-                        f' expected an int.'
-                    )
-                outval = self._process_value(
-                    cls, fieldpath, valanntype, val, ioattrs
-                )
-                if self._create:
-                    assert out is not None
-                    out[str(key)] = outval
+        if keyanntype is int:
 
-        elif issubclass(keyanntype, Enum):
-            for key, val in value.items():
-                if not isinstance(key, keyanntype):
-                    raise TypeError(
-                        f'Got invalid key type {type(key)} for'
-                        f' dict key at \'{fieldpath}\' on {cls.__name__};'
-                        f' expected a {keyanntype}.'
-                    )
-                outval = self._process_value(
-                    cls, fieldpath, valanntype, val, ioattrs
-                )
-                if self._create:
-                    assert out is not None
-                    out[str(key.value)] = outval
-        else:
+            def _int_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(fieldpath, value)
+                out: dict | None = {} if create else None
+                for key, val in value.items():
+                    if not isinstance(key, int):
+                        raise TypeError(
+                            f'Got invalid key type {type(key)} for'
+                            f' dict key at \'{fieldpath}\' on {cls.__name__};'
+                            f' expected an int.'
+                        )
+                    outval = valfunc(cls, fieldpath, val)
+                    if create:
+                        assert out is not None
+                        out[str(key)] = outval
+                return out
+
+            return _int_dict
+
+        try:
+            is_enum = issubclass(keyanntype, Enum)
+        except TypeError:
+            # Keep failing at the same point a generic walk would.
+            def _bad_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(fieldpath, value)
+                return issubclass(keyanntype, Enum)
+
+            return _bad_dict
+
+        if is_enum:
+
+            def _enum_dict(cls: type, fieldpath: str, value: Any) -> Any:
+                _check_dict(fieldpath, value)
+                out: dict | None = {} if create else None
+                for key, val in value.items():
+                    if not isinstance(key, keyanntype):
+                        raise TypeError(
+                            f'Got invalid key type {type(key)} for'
+                            f' dict key at \'{fieldpath}\' on {cls.__name__};'
+                            f' expected a {keyanntype}.'
+                        )
+                    outval = valfunc(cls, fieldpath, val)
+                    if create:
+                        assert out is not None
+                        out[str(key.value)] = outval
+                return out
+
+            return _enum_dict
+
+        def _unhandled_dict(cls: type, fieldpath: str, value: Any) -> Any:
+            _check_dict(fieldpath, value)
             raise RuntimeError(f'Unhandled dict out-key-type {keyanntype}')
 
-        return out
+        return _unhandled_dict
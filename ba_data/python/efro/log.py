@@ -3,15 +3,17 @@
 """Logging functionality."""
 from __future__ import annotations
 
+import os
 import sys
 import time
 import asyncio
 import logging
 import datetime
+import heapq
+import bisect
 import itertools
 from enum import Enum
 from functools import partial
-from collections import deque
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Annotated, override
 from threading import Thread, current_thread, Lock
@@ -22,7 +24,7 @@ from efro.dataclassio import ioprepped, IOAttrs, dataclass_to_json
 
 if TYPE_CHECKING:
     from pathlib import Path
-    from typing import Any, Callable, TextIO
+    from typing import Any, Callable, TextIO, Iterator
 
 
 class LogLevel(Enum):
@@ -111,6 +113,317 @@ class LogArchive:
     entries: Annotated[list[LogEntry], IOAttrs('e')]
 
 
+@dataclass
+class LogHandlerStats:
+    """Counters describing the state of a LogHandler's output pipeline.
+
+    Useful for noticing when logging itself is becoming a bottleneck.
+    """
+
+    # Log records submitted to the background thread but not yet
+    # processed by it.
+    queue_depth: int = 0
+
+    # Total log records dropped because queue_depth was over its limit.
+    dropped_entries: int = 0
+
+    # Serialized entries waiting to be written to the log file.
+    buffered_entries: int = 0
+    buffered_bytes: int = 0
+
+    # Log file output totals.
+    flushes: int = 0
+    bytes_written: int = 0
+    rotations: int = 0
+
+    # Total failed log file writes (the entries in question are lost).
+    write_errors: int = 0
+
+
+class _StructuredLogWriter:
+    """Accumulates serialized log entries and writes them in batches.
+
+    Also handles size-based rotation of the file. Only to be used from
+    a LogHandler's background thread.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        flush_size: int,
+        rotate_size: int | None,
+        rotate_count: int,
+    ) -> None:
+        assert flush_size >= 0
+        assert rotate_size is None or rotate_size > 0
+        assert rotate_count >= 0
+        self._path = str(path)
+        self._flush_size = flush_size
+        self._rotate_size = rotate_size
+        self._rotate_count = rotate_count
+        self._file: TextIO | None = None
+        self._file_size = 0
+        self._chunks: list[str] = []
+        self._chunks_size = 0
+        self._printed_error = False
+        self.flushes = 0
+        self.bytes_written = 0
+        self.rotations = 0
+        self.write_errors = 0
+        self._open('w')
+
+    @property
+    def buffered_entries(self) -> int:
+        """Number of entries waiting to be written."""
+        return len(self._chunks)
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Number of (character) bytes waiting to be written."""
+        return self._chunks_size
+
+    def add(self, line: str) -> bool:
+        """Add a single line; returns True if a flush is now due."""
+        self._chunks.append(line)
+        self._chunks_size += len(line) + 1
+        return self._chunks_size >= self._flush_size
+
+    def flush(self, echofile: TextIO | None) -> None:
+        """Write everything we've got to disk."""
+        if not self._chunks:
+            return
+        data = '\n'.join(self._chunks) + '\n'
+        self._chunks = []
+        self._chunks_size = 0
+        try:
+            if self._file is None:
+                self._open()
+            assert self._file is not None
+            self._file.write(data)
+            self._file.flush()
+            self.flushes += 1
+            self.bytes_written += len(data)
+            self._file_size += len(data)
+            if (
+                self._rotate_size is not None
+                and self._file_size >= self._rotate_size
+            ):
+                self._rotate()
+        except OSError:
+            self.write_errors += 1
+
+            # Only print the first error to avoid insanity.
+            if not self._printed_error:
+                import traceback
+
+                traceback.print_exc(file=echofile)
+                self._printed_error = True
+
+    def close(self) -> None:
+        """Close our file (anything unflushed is discarded)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self, mode: str = 'a') -> None:
+        # We only truncate when starting out or when explicitly
+        # discarding; any other (re)open appends so a failed rotation or
+        # write can never wipe out the live log.
+        # pylint: disable=consider-using-with
+        self._file = open(self._path, mode, encoding='utf-8')
+        self._file_size = self._file.tell()
+
+    def _rotate(self) -> None:
+        # Note that we need to close before moving things around (can't
+        # replace open files on Windows).
+        self.close()
+        mode = 'a'
+        try:
+            if self._rotate_count > 0:
+                # Shift log.1 to log.2, etc. (whatever falls off the end
+                # is overwritten) and then move the current log to log.1.
+                for i in range(self._rotate_count - 1, 0, -1):
+                    src = f'{self._path}.{i}'
+                    if os.path.exists(src):
+                        os.replace(src, f'{self._path}.{i + 1}')
+                os.replace(self._path, f'{self._path}.1')
+            else:
+                # Nowhere to keep old entries; just start over.
+                mode = 'w'
+            self.rotations += 1
+        finally:
+            self._open(mode)
+
+
+class _LogCache:
+    """In-memory cache of recent log entries.
+
+    Entries are stored in a list we only append to; pruning just
+    advances our start position, and the list is compacted once enough
+    dead space builds up. This gives cheap slicing without modifying
+    anything. We also keep (absolute) entry indexes by level and logger
+    name for filtered lookups.
+    """
+
+    # Rough fixed byte cost of an entry (the entry itself, its level,
+    # its time, etc.); calculated on first use.
+    _entry_overhead: int | None = None
+
+    def __init__(self) -> None:
+        self._entries: list[LogEntry] = []
+        self._sizes: list[int] = []
+        self._head = 0
+
+        # Total number of entries ever pruned from the cache (so the
+        # absolute index of our first present entry).
+        self.index_offset = 0
+
+        # Rough byte size of our present entries.
+        self.size = 0
+
+        self._level_indexes: dict[LogLevel, list[int]] = {}
+        self._name_indexes: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries) - self._head
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return itertools.islice(self._entries, self._head, None)
+
+    def first(self) -> LogEntry | None:
+        """Return the oldest entry present, if any."""
+        return self._entries[self._head] if len(self) else None
+
+    @classmethod
+    def entry_size(cls, entry: LogEntry) -> int:
+        """Do a rough calc of how many bytes an entry consumes."""
+        if cls._entry_overhead is None:
+            cls._entry_overhead = sum(
+                sys.getsizeof(x) for x in (entry, entry.level, entry.time)
+            )
+        return (
+            cls._entry_overhead
+            + sys.getsizeof(entry.name)
+            + sys.getsizeof(entry.message)
+        )
+
+    def append(self, entry: LogEntry) -> None:
+        """Add an entry."""
+        index = self.index_offset + len(self)
+        size = self.entry_size(entry)
+        self._entries.append(entry)
+        self._sizes.append(size)
+        self.size += size
+
+        levelindex = self._level_indexes.get(entry.level)
+        if levelindex is None:
+            levelindex = self._level_indexes[entry.level] = []
+        levelindex.append(index)
+        nameindex = self._name_indexes.get(entry.name)
+        if nameindex is None:
+            nameindex = self._name_indexes[entry.name] = []
+        nameindex.append(index)
+
+    def popleft(self) -> None:
+        """Prune the oldest entry."""
+        assert len(self)
+        self.size -= self._sizes[self._head]
+        self._head += 1
+        self.index_offset += 1
+
+        # Compact once at least half of our storage is dead.
+        if self._head >= 1024 and self._head * 2 >= len(self._entries):
+            self._compact()
+
+    def _compact(self) -> None:
+        del self._entries[: self._head]
+        del self._sizes[: self._head]
+        self._head = 0
+        for indexes in (self._level_indexes, self._name_indexes):
+            for key, index in list(indexes.items()):
+                del index[: bisect.bisect_left(index, self.index_offset)]
+                if not index:
+                    del indexes[key]
+
+    def get(
+        self,
+        start: int,
+        end: int,
+        level: LogLevel | None,
+        name: str | None,
+    ) -> list[LogEntry]:
+        """Return entries in an absolute index range, with filtering.
+
+        The range must be within the entries presently in the cache.
+        """
+        entries = self._entries
+        base = self._head - self.index_offset
+        if level is None and name is None:
+            return entries[base + start : base + end]
+
+        def _slices(indexes: list[list[int]]) -> list[list[int]]:
+            return [
+                index[
+                    bisect.bisect_left(index, start) : bisect.bisect_left(
+                        index, end
+                    )
+                ]
+                for index in indexes
+            ]
+
+        # Pull candidates from whichever of our indexes gives us the
+        # fewest for this range, and then check the other filter
+        # against each.
+        prefix = '' if name is None else f'{name}.'
+        candidates: list[list[int]] | None = None
+        check_name = check_level = False
+        if name is not None:
+            candidates = _slices(
+                [
+                    index
+                    for iname, index in self._name_indexes.items()
+                    if iname == name or iname.startswith(prefix)
+                ]
+            )
+        if level is not None:
+            levelcandidates = _slices(
+                [
+                    index
+                    for ilevel, index in self._level_indexes.items()
+                    if ilevel.value >= level.value
+                ]
+            )
+            if candidates is None:
+                candidates = levelcandidates
+            elif sum(map(len, levelcandidates)) < sum(map(len, candidates)):
+                candidates = levelcandidates
+                check_name = True
+            else:
+                check_level = True
+        assert candidates is not None
+
+        found = [
+            entries[base + i]
+            for i in (
+                candidates[0]
+                if len(candidates) == 1
+                else heapq.merge(*candidates)
+            )
+        ]
+        if check_level:
+            assert level is not None
+            minlevel = level.value
+            found = [e for e in found if e.level.value >= minlevel]
+        elif check_name:
+            assert name is not None
+            found = [
+                e
+                for e in found
+                if e.name == name or e.name.startswith(prefix)
+            ]
+        return found
+
+
 class LogHandler(logging.Handler):
     """Fancy-pants handler for logging output.
 
@@ -131,10 +444,44 @@ class LogHandler(logging.Handler):
         suppress_non_root_debug: bool,
         cache_size_limit: int,
         cache_time_limit: datetime.timedelta | None,
+        file_flush_size: int = 64 * 1024,
+        file_flush_interval: float = 0.5,
+        file_rotate_size: int | None = None,
+        file_rotate_count: int = 5,
+        max_queue_depth: int | None = None,
     ):
         super().__init__()
-        # pylint: disable=consider-using-with
-        self._file = None if path is None else open(path, 'w', encoding='utf-8')
+
+        # Structured log entries get written out in batches whenever
+        # file_flush_size bytes have accumulated or file_flush_interval
+        # seconds have passed (and on shutdown). If file_rotate_size is
+        # set, the file is moved aside to path.1 (path.1 to path.2,
+        # etc., keeping file_rotate_count old files) whenever it grows
+        # past that size.
+        self._file = (
+            None
+            if path is None
+            else _StructuredLogWriter(
+                path,
+                flush_size=file_flush_size,
+                rotate_size=file_rotate_size,
+                rotate_count=file_rotate_count,
+            )
+        )
+        self._file_flush_interval = file_flush_interval
+        self._file_flush_timer: asyncio.TimerHandle | None = None
+
+        # If max_queue_depth is set and more than that many records are
+        # waiting on our background thread, we drop anything less severe
+        # than errors instead of letting things balloon further.
+        assert max_queue_depth is None or max_queue_depth > 0
+        self._max_queue_depth = max_queue_depth
+        self._submit_counter = itertools.count(1)
+        self._submitted_count = 0
+        self._processed_count = 0
+        self._drop_counter = itertools.count(1)
+        self._dropped_count = 0
+
         self._echofile = echofile
         self._callbacks: list[Callable[[LogEntry], None]] = []
         self._suppress_non_root_debug = suppress_non_root_debug
@@ -143,12 +490,14 @@ class LogHandler(logging.Handler):
             'stdout': None,
             'stderr': None,
         }
-        self._cache_size = 0
+        # Stdout/stderr writes waiting to be handed to our thread in a
+        # single call (see file_write()).
+        self._file_write_batch: list[tuple[str, str]] | None = None
+        self._file_write_lock = Lock()
         assert cache_size_limit >= 0
         self._cache_size_limit = cache_size_limit
         self._cache_time_limit = cache_time_limit
-        self._cache = deque[tuple[int, LogEntry]]()
-        self._cache_index_offset = 0
+        self._cache = _LogCache()
         self._cache_lock = Lock()
         self._printed_callback_error = False
         self._thread_bootstrapped = False
@@ -197,7 +546,7 @@ class LogHandler(logging.Handler):
         # Run all of our cached entries through the new callback if desired.
         if feed_existing_logs and self._cache_size_limit > 0:
             with self._cache_lock:
-                for _id, entry in self._cache:
+                for entry in self._cache:
                     self._run_callback_on_entry(call, entry)
 
     def _log_thread_main(self) -> None:
@@ -236,16 +585,44 @@ class LogHandler(logging.Handler):
             with self._cache_lock:
                 # Prune the oldest entry as long as there is a first one that
                 # is too old.
-                while (
-                    self._cache
-                    and (now - self._cache[0][1].time) >= self._cache_time_limit
-                ):
-                    popped = self._cache.popleft()
-                    self._cache_size -= popped[0]
-                    self._cache_index_offset += 1
+                while True:
+                    first = self._cache.first()
+                    if (
+                        first is None
+                        or (now - first.time) < self._cache_time_limit
+                    ):
+                        break
+                    self._cache.popleft()
+
+    def get_stats(self) -> LogHandlerStats:
+        """Return current stats for the handler's output pipeline.
+
+        Values are read without synchronizing with the background
+        thread, so they may be slightly stale.
+        """
+        writer = self._file
+        return LogHandlerStats(
+            queue_depth=max(
+                0,
+                self._submitted_count
+                - self._processed_count
+                - self._dropped_count,
+            ),
+            dropped_entries=self._dropped_count,
+            buffered_entries=0 if writer is None else writer.buffered_entries,
+            buffered_bytes=0 if writer is None else writer.buffered_bytes,
+            flushes=0 if writer is None else writer.flushes,
+            bytes_written=0 if writer is None else writer.bytes_written,
+            rotations=0 if writer is None else writer.rotations,
+            write_errors=0 if writer is None else writer.write_errors,
+        )
 
     def get_cached(
-        self, start_index: int = 0, max_entries: int | None = None
+        self,
+        start_index: int = 0,
+        max_entries: int | None = None,
+        level: LogLevel | None = None,
+        name: str | None = None,
     ) -> LogArchive:
         """Build and return an archive of cached log entries.
 
@@ -254,46 +631,35 @@ class LogHandler(logging.Handler):
         entries for partially written stdout/stderr lines.
         Entries from the range [start_index:start_index+max_entries]
         which are still present in the cache will be returned.
+        If 'level' is passed, only entries of that severity or higher
+        are included, and if 'name' is passed, only entries from that
+        logger or its children are included. Note that these filters
+        don't affect the range considered, so archive indexes can be
+        used to page through a log the same way as without filters.
         """
 
         assert start_index >= 0
         if max_entries is not None:
             assert max_entries >= 0
         with self._cache_lock:
-            # Transform start_index to our present cache space.
-            start_index -= self._cache_index_offset
-            # Calc end-index in our present cache space.
+            cache = self._cache
+            log_size = cache.index_offset + len(cache)
+
+            # Clamp both ends of our range to the entries we have.
             end_index = (
-                len(self._cache)
+                log_size
                 if max_entries is None
-                else start_index + max_entries
+                else min(log_size, start_index + max_entries)
             )
-
-            # Clamp both indexes to both ends of our present space.
-            start_index = max(0, min(start_index, len(self._cache)))
-            end_index = max(0, min(end_index, len(self._cache)))
+            start_index = max(cache.index_offset, min(start_index, log_size))
+            end_index = max(start_index, end_index)
 
             return LogArchive(
-                log_size=self._cache_index_offset + len(self._cache),
-                start_index=start_index + self._cache_index_offset,
-                entries=self._cache_slice(start_index, end_index),
+                log_size=log_size,
+                start_index=start_index,
+                entries=cache.get(start_index, end_index, level, name),
             )
 
-    def _cache_slice(
-        self, start: int, end: int, step: int = 1
-    ) -> list[LogEntry]:
-        # Deque doesn't natively support slicing but we can do it manually.
-        # It sounds like rotating the deque and pulling from the beginning
-        # is the most efficient way to do this. The downside is the deque
-        # gets temporarily modified in the process so we need to make sure
-        # we're holding the lock.
-        assert self._cache_lock.locked()
-        cache = self._cache
-        cache.rotate(-start)
-        slc = [e[1] for e in itertools.islice(cache, 0, end - start, step)]
-        cache.rotate(start)
-        return slc
-
     @classmethod
     def _is_immutable_log_data(cls, data: Any) -> bool:
         if isinstance(data, (str, bool, int, float, bytes)):
@@ -303,8 +669,13 @@ class LogHandler(logging.Handler):
         return False
 
     def call_in_thread(self, call: Callable[[], Any]) -> None:
-        """Submit a call to be run in the logging background thread."""
-        self._event_loop.call_soon_threadsafe(call)
+        """Submit a call to be run in the logging background thread.
+
+        The call runs after any stdout/stderr output written before it.
+        """
+        with self._file_write_lock:
+            self._file_write_batch = None
+            self._event_loop.call_soon_threadsafe(call)
 
     @override
     def emit(self, record: logging.LogRecord) -> None:
@@ -322,6 +693,19 @@ class LogHandler(logging.Handler):
         ):
             return
 
+        # If our background thread is falling behind, shed less severe
+        # stuff rather than letting the backlog grow without bound.
+        # (itertools.count keeps these counts safe across threads).
+        submitted = self._submitted_count = next(self._submit_counter)
+        if (
+            self._max_queue_depth is not None
+            and record.levelno < logging.ERROR
+            and submitted - self._processed_count - self._dropped_count
+            > self._max_queue_depth
+        ):
+            self._dropped_count = next(self._drop_counter)
+            return
+
         # Optimization: if our log args are all simple immutable values,
         # we can just kick the whole thing over to our background thread to
         # be formatted there at our leisure. If anything is mutable and
@@ -341,7 +725,7 @@ class LogHandler(logging.Handler):
         if fast_path:
             if __debug__:
                 formattime = echotime = time.monotonic()
-            self._event_loop.call_soon_threadsafe(
+            self.call_in_thread(
                 partial(
                     self._emit_in_thread,
                     record.name,
@@ -394,7 +778,7 @@ class LogHandler(logging.Handler):
             if __debug__:
                 echotime = time.monotonic()
 
-            self._event_loop.call_soon_threadsafe(
+            self.call_in_thread(
                 partial(
                     self._emit_in_thread,
                     record.name,
@@ -447,6 +831,7 @@ class LogHandler(logging.Handler):
         message: str | logging.LogRecord,
         labels: dict[str, str],
     ) -> None:
+        self._processed_count += 1
         try:
             # If they passed a raw record here, bake it down to a string.
             if isinstance(message, logging.LogRecord):
@@ -471,14 +856,29 @@ class LogHandler(logging.Handler):
     def file_write(self, name: str, output: str) -> None:
         """Send raw stdout/stderr output to the logger to be collated."""
 
-        # Note to self: it turns out that things like '^^^^^^^^^^^^^^'
-        # lines in stack traces get written as lots of individual '^'
-        # writes. It feels a bit dirty to be pushing a deferred call to
-        # another thread for each character. Perhaps should do some sort
-        # of basic accumulation here?
-        self._event_loop.call_soon_threadsafe(
-            partial(self._file_write_in_thread, name, output)
-        )
+        # Things like '^^^^^^^^^^^^^^' lines in stack traces get written
+        # as lots of individual '^' writes, and each print is at least
+        # two writes, so pushing a call to our thread for each write is
+        # expensive. Instead we add writes to a batch which a single
+        # call processes in order. Anything else we push to our thread
+        # closes out the batch first (see call_in_thread()), so prints
+        # and logs still get processed in the order they happened.
+        with self._file_write_lock:
+            batch = self._file_write_batch
+            if batch is not None:
+                batch.append((name, output))
+                return
+            batch = self._file_write_batch = [(name, output)]
+            self._event_loop.call_soon_threadsafe(
+                partial(self._file_write_batch_in_thread, batch)
+            )
+
+    def _file_write_batch_in_thread(self, batch: list[tuple[str, str]]) -> None:
+        with self._file_write_lock:
+            if self._file_write_batch is batch:
+                self._file_write_batch = None
+        for name, output in batch:
+            self._file_write_in_thread(name, output)
 
     def _file_write_in_thread(self, name: str, output: str) -> None:
         try:
@@ -522,9 +922,10 @@ class LogHandler(logging.Handler):
 
         def _set_done() -> None:
             nonlocal done
+            self._flush_file()
             done = True
 
-        self._event_loop.call_soon_threadsafe(_set_done)
+        self.call_in_thread(_set_done)
 
         starttime = time.monotonic()
         while not done:
@@ -536,9 +937,7 @@ class LogHandler(logging.Handler):
     def file_flush(self, name: str) -> None:
         """Send raw stdout/stderr flush to the logger to be collated."""
 
-        self._event_loop.call_soon_threadsafe(
-            partial(self._file_flush_in_thread, name)
-        )
+        self.call_in_thread(partial(self._file_flush_in_thread, name))
 
     def _file_flush_in_thread(self, name: str) -> None:
         try:
@@ -579,42 +978,42 @@ class LogHandler(logging.Handler):
             ship_task.cancel()
         self._file_chunk_ship_task[name] = None
 
+
     def _emit_entry(self, entry: LogEntry) -> None:
         assert current_thread() is self._thread
 
         # Store to our cache.
         if self._cache_size_limit > 0:
             with self._cache_lock:
-                # Do a rough calc of how many bytes this entry consumes.
-                entry_size = sum(
-                    sys.getsizeof(x)
-                    for x in (
-                        entry,
-                        entry.name,
-                        entry.message,
-                        entry.level,
-                        entry.time,
-                    )
-                )
-                self._cache.append((entry_size, entry))
-                self._cache_size += entry_size
+                self._cache.append(entry)
 
                 # Prune old until we are back at or under our limit.
-                while self._cache_size > self._cache_size_limit:
-                    popped = self._cache.popleft()
-                    self._cache_size -= popped[0]
-                    self._cache_index_offset += 1
+                while self._cache.size > self._cache_size_limit:
+                    self._cache.popleft()
 
         # Pass to callbacks.
         for call in self._callbacks:
             self._run_callback_on_entry(call, entry)
 
-        # Dump to our structured log file.
-        # TODO: should set a timer for flushing; don't flush every line.
+        # Dump to our structured log file. We write in batches; either
+        # once enough has accumulated or after a short delay.
         if self._file is not None:
             entry_s = dataclass_to_json(entry)
             assert '\n' not in entry_s  # Make sure its a single line.
-            print(entry_s, file=self._file, flush=True)
+            if self._file.add(entry_s):
+                self._flush_file()
+            elif self._file_flush_timer is None:
+                self._file_flush_timer = self._event_loop.call_later(
+                    self._file_flush_interval, self._flush_file
+                )
+
+    def _flush_file(self) -> None:
+        assert current_thread() is self._thread
+        if self._file_flush_timer is not None:
+            self._file_flush_timer.cancel()
+            self._file_flush_timer = None
+        if self._file is not None:
+            self._file.flush(self._echofile)
 
     def _run_callback_on_entry(
         self, callback: Callable[[LogEntry], None], entry: LogEntry
@@ -683,11 +1082,17 @@ def setup_logging(
     echo_to_stderr: bool = True,
     cache_size_limit: int = 0,
     cache_time_limit: datetime.timedelta | None = None,
+    log_rotate_size: int | None = None,
+    log_rotate_count: int = 5,
+    max_queue_depth: int | None = None,
 ) -> LogHandler:
     """Set up our logging environment.
 
     Returns the custom handler which can be used to fetch information
     about logs that have passed through it. (worst log-levels, caches, etc.).
+
+    By default no log records are ever dropped; pass max_queue_depth to
+    shed sub-error records once that many are backed up.
     """
 
     lmap = {
@@ -715,6 +1120,9 @@ def setup_logging(
         suppress_non_root_debug=suppress_non_root_debug,
         cache_size_limit=cache_size_limit,
         cache_time_limit=cache_time_limit,
+        file_rotate_size=log_rotate_size,
+        file_rotate_count=log_rotate_count,
+        max_queue_depth=max_queue_depth,
     )
 
     # Note: going ahead with force=True here so that we replace any
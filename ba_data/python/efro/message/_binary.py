@@ -0,0 +1,243 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Compact binary encoding for message data.
+
+This is an alternative to json for carrying message dicts. It supports
+the same set of types as dataclassio's FIRESTORE codec (json types plus
+bytes and datetimes), so bytes fields go across as-is instead of
+getting base64'd.
+
+Layout is a 2 byte header (magic and format version) followed by a
+single tagged value. Each value is a 1 byte tag followed by its payload;
+str/bytes values and lists/dicts are prefixed with their length/count.
+All multi-byte numbers are big-endian.
+"""
+
+from __future__ import annotations
+
+import struct
+import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any
+
+BINARY_MAGIC = 0xC1
+BINARY_VERSION = 1
+
+_HEADER = bytes([BINARY_MAGIC, BINARY_VERSION])
+
+_T_NONE = 0
+_T_FALSE = 1
+_T_TRUE = 2
+_T_INT8 = 3
+_T_INT32 = 4
+_T_INT64 = 5
+_T_BIGINT = 6
+_T_FLOAT = 7
+_T_STR8 = 8
+_T_STR32 = 9
+_T_BYTES8 = 10
+_T_BYTES32 = 11
+_T_LIST8 = 12
+_T_LIST32 = 13
+_T_DICT8 = 14
+_T_DICT32 = 15
+_T_DATETIME = 16
+
+_TAG_INT8 = struct.Struct('>Bb')
+_TAG_INT32 = struct.Struct('>Bi')
+_TAG_INT64 = struct.Struct('>Bq')
+_TAG_UINT8 = struct.Struct('>BB')
+_TAG_UINT32 = struct.Struct('>BI')
+_TAG_FLOAT = struct.Struct('>Bd')
+_INT8 = struct.Struct('>b')
+_UINT8 = struct.Struct('>B')
+_INT32 = struct.Struct('>i')
+_UINT32 = struct.Struct('>I')
+_INT64 = struct.Struct('>q')
+_FLOAT = struct.Struct('>d')
+
+_SINGLES = {None: _T_NONE, False: _T_FALSE, True: _T_TRUE}
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def encode_binary(obj: Any) -> bytes:
+    """Encode a value to binary form.
+
+    Supports None, bools, ints, floats, strs, bytes, lists/tuples,
+    dicts, and timezone-aware datetimes (in any combination).
+    """
+    parts: list[bytes] = [_HEADER]
+    _encode(obj, parts)
+    return b''.join(parts)
+
+
+def decode_binary(data: bytes) -> Any:
+    """Decode a value from binary form.
+
+    Raises ValueError on malformed data.
+    """
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    if len(data) < 2 or data[0] != BINARY_MAGIC:
+        raise ValueError('Data is not binary message data.')
+    if data[1] != BINARY_VERSION:
+        raise ValueError(f'Unsupported binary message version {data[1]}.')
+    try:
+        value, offset = _decode(data, 2)
+    except (struct.error, IndexError) as exc:
+        raise ValueError('Truncated binary message data.') from exc
+    except RecursionError as exc:
+        raise ValueError('Binary message data nested too deeply.') from exc
+    except (TypeError, OverflowError) as exc:
+        # Unhashable dict keys, out-of-range datetimes, etc.
+        raise ValueError('Invalid binary message value.') from exc
+    if offset != len(data):
+        raise ValueError('Extra data after binary message value.')
+    return value
+
+
+def _encode(obj: Any, parts: list[bytes]) -> None:
+    # pylint: disable=too-many-branches
+    tp = type(obj)
+    if tp is str:
+        data = obj.encode()
+        size = len(data)
+        parts.append(
+            _TAG_UINT8.pack(_T_STR8, size)
+            if size < 256
+            else _TAG_UINT32.pack(_T_STR32, size)
+        )
+        parts.append(data)
+    elif tp is int:
+        if -0x80 <= obj < 0x80:
+            parts.append(_TAG_INT8.pack(_T_INT8, obj))
+        elif -0x80000000 <= obj < 0x80000000:
+            parts.append(_TAG_INT32.pack(_T_INT32, obj))
+        elif -0x8000000000000000 <= obj < 0x8000000000000000:
+            parts.append(_TAG_INT64.pack(_T_INT64, obj))
+        else:
+            size = (obj.bit_length() + 8) // 8
+            if size > 255:
+                raise ValueError('Int value too large to encode.')
+            parts.append(_TAG_UINT8.pack(_T_BIGINT, size))
+            parts.append(obj.to_bytes(size, 'big', signed=True))
+    elif tp is dict:
+        size = len(obj)
+        parts.append(
+            _TAG_UINT8.pack(_T_DICT8, size)
+            if size < 256
+            else _TAG_UINT32.pack(_T_DICT32, size)
+        )
+        for key, val in obj.items():
+            _encode(key, parts)
+            _encode(val, parts)
+    elif tp is list or tp is tuple:
+        size = len(obj)
+        parts.append(
+            _TAG_UINT8.pack(_T_LIST8, size)
+            if size < 256
+            else _TAG_UINT32.pack(_T_LIST32, size)
+        )
+        for val in obj:
+            _encode(val, parts)
+    elif obj is None or tp is bool:
+        parts.append(_UINT8.pack(_SINGLES[obj]))
+    elif tp is float:
+        parts.append(_TAG_FLOAT.pack(_T_FLOAT, obj))
+    elif tp is bytes:
+        size = len(obj)
+        parts.append(
+            _TAG_UINT8.pack(_T_BYTES8, size)
+            if size < 256
+            else _TAG_UINT32.pack(_T_BYTES32, size)
+        )
+        parts.append(obj)
+    elif isinstance(obj, datetime.datetime):
+        if obj.tzinfo is None:
+            raise ValueError('Datetime values must be timezone-aware.')
+        parts.append(
+            _TAG_INT64.pack(_T_DATETIME, (obj - _EPOCH) // _MICROSECOND)
+        )
+    else:
+        raise TypeError(f'Unsupported type for binary encoding: {tp}.')
+
+
+def _decode(data: bytes, offset: int) -> tuple[Any, int]:
+    # pylint: disable=too-many-return-statements
+    # pylint: disable=too-many-branches
+    tag = data[offset]
+    offset += 1
+    if tag == _T_STR8 or tag == _T_STR32:
+        if tag == _T_STR8:
+            size = data[offset]
+            offset += 1
+        else:
+            size = _UINT32.unpack_from(data, offset)[0]
+            offset += 4
+        end = offset + size
+        if end > len(data):
+            raise IndexError()
+        return data[offset:end].decode(), end
+    if tag == _T_INT8:
+        return _INT8.unpack_from(data, offset)[0], offset + 1
+    if tag == _T_DICT8 or tag == _T_DICT32:
+        if tag == _T_DICT8:
+            size = data[offset]
+            offset += 1
+        else:
+            size = _UINT32.unpack_from(data, offset)[0]
+            offset += 4
+        out: dict = {}
+        for _i in range(size):
+            key, offset = _decode(data, offset)
+            out[key], offset = _decode(data, offset)
+        return out, offset
+    if tag == _T_LIST8 or tag == _T_LIST32:
+        if tag == _T_LIST8:
+            size = data[offset]
+            offset += 1
+        else:
+            size = _UINT32.unpack_from(data, offset)[0]
+            offset += 4
+        outlist: list = []
+        for _i in range(size):
+            val, offset = _decode(data, offset)
+            outlist.append(val)
+        return outlist, offset
+    if tag == _T_NONE:
+        return None, offset
+    if tag == _T_FALSE:
+        return False, offset
+    if tag == _T_TRUE:
+        return True, offset
+    if tag == _T_INT32:
+        return _INT32.unpack_from(data, offset)[0], offset + 4
+    if tag == _T_FLOAT:
+        return _FLOAT.unpack_from(data, offset)[0], offset + 8
+    if tag == _T_BYTES8 or tag == _T_BYTES32:
+        if tag == _T_BYTES8:
+            size = data[offset]
+            offset += 1
+        else:
+            size = _UINT32.unpack_from(data, offset)[0]
+            offset += 4
+        end = offset + size
+        if end > len(data):
+            raise IndexError()
+        return data[offset:end], end
+    if tag == _T_INT64:
+        return _INT64.unpack_from(data, offset)[0], offset + 8
+    if tag == _T_BIGINT:
+        size = data[offset]
+        end = offset + 1 + size
+        if end > len(data):
+            raise IndexError()
+        return int.from_bytes(data[offset + 1 : end], 'big', signed=True), end
+    if tag == _T_DATETIME:
+        micros = _INT64.unpack_from(data, offset)[0]
+        return _EPOCH + micros * _MICROSECOND, offset + 8
+    raise ValueError(f'Invalid binary message tag {tag}.')
@@ -12,10 +12,12 @@ import json
 
 from efro.error import CleanError, CommunicationError
 from efro.dataclassio import (
+    Codec,
     is_ioprepped_dataclass,
     dataclass_to_dict,
     dataclass_from_dict,
 )
+from efro.message._binary import encode_binary, decode_binary
 from efro.message._message import (
     Message,
     Response,
@@ -36,8 +38,26 @@ class MessageProtocol:
     all message types must retain the same id, message attr storage
     names must not change, newly added attrs must have default values,
     etc.
+
+    Messages are normally encoded as json strings. Senders can also opt
+    in to a compact binary encoding (see MessageSender) which carries
+    bytes values natively; receivers handle both automatically.
+
+    Multiple messages can also be sent together as a single batch
+    (see MessageSender.send_batch_async()); the receiver handles each
+    and returns all responses together in a single batch response.
     """
 
+    # Peers able to handle binary-encoded messages can advertise this
+    # (see efro.rpc.RPCEndpoint 'features').
+    BINARY_FEATURE = 'efro.message.binary'
+
+    # Peers able to handle message batches can advertise this.
+    BATCH_FEATURE = 'efro.message.batch'
+
+    # Key holding the list of item dicts in batch messages/responses.
+    BATCH_KEY = 'b'
+
     def __init__(
         self,
         message_types: dict[int, type[Message]],
@@ -175,13 +195,32 @@ class MessageProtocol:
         """Json-encode a provided dict."""
         return json.dumps(obj, separators=(',', ':'))
 
-    def message_to_dict(self, message: Message) -> dict:
-        """Encode a message to a json ready dict."""
-        return self._to_dict(message, self.message_ids_by_type, 'message')
+    @staticmethod
+    def encode_dict_binary(obj: dict) -> bytes:
+        """Binary-encode a provided dict."""
+        return encode_binary(obj)
+
+    def message_to_dict(self, message: Message, binary: bool = False) -> dict:
+        """Encode a message to a json ready dict.
 
-    def response_to_dict(self, response: Response | SysResponse) -> dict:
-        """Encode a response to a json ready dict."""
-        return self._to_dict(response, self.response_ids_by_type, 'response')
+        If 'binary' is True, the dict is instead ready for binary
+        encoding (bytes and datetime values are left as-is).
+        """
+        return self._to_dict(
+            message, self.message_ids_by_type, 'message', binary
+        )
+
+    def response_to_dict(
+        self, response: Response | SysResponse, binary: bool = False
+    ) -> dict:
+        """Encode a response to a json ready dict.
+
+        If 'binary' is True, the dict is instead ready for binary
+        encoding (bytes and datetime values are left as-is).
+        """
+        return self._to_dict(
+            response, self.response_ids_by_type, 'response', binary
+        )
 
     def error_to_response(self, exc: Exception) -> tuple[SysResponse, bool]:
         """Translate an Exception to a SysResponse.
@@ -230,7 +269,11 @@ class MessageProtocol:
         )
 
     def _to_dict(
-        self, message: Any, ids_by_type: dict[type, int], opname: str
+        self,
+        message: Any,
+        ids_by_type: dict[type, int],
+        opname: str,
+        binary: bool,
     ) -> dict:
         """Encode a message to a json string for transport."""
 
@@ -240,7 +283,12 @@ class MessageProtocol:
                 f'{opname} type is not registered in protocol:'
                 f' {type(message)}'
             )
-        out = {'t': m_id, 'm': dataclass_to_dict(message)}
+        out = {
+            't': m_id,
+            'm': dataclass_to_dict(
+                message, codec=Codec.FIRESTORE if binary else Codec.JSON
+            ),
+        }
         return out
 
     @staticmethod
@@ -250,22 +298,48 @@ class MessageProtocol:
         assert isinstance(out, dict)
         return out
 
-    def message_from_dict(self, data: dict) -> Message:
-        """Decode a message from a json string."""
-        out = self._from_dict(data, self.message_types_by_id, 'message')
+    @staticmethod
+    def decode_dict_binary(data: bytes) -> dict:
+        """Decode binary data to a dict."""
+        out = decode_binary(data)
+        if not isinstance(out, dict):
+            raise ValueError('Binary message data is not a dict.')
+        return out
+
+    def message_from_dict(self, data: dict, binary: bool = False) -> Message:
+        """Decode a message from a json string.
+
+        If 'binary' is True, the dict is expected to have come from
+        binary data.
+        """
+        out = self._from_dict(
+            data, self.message_types_by_id, 'message', binary
+        )
         assert isinstance(out, Message)
         return out
 
-    def response_from_dict(self, data: dict) -> Response | SysResponse:
-        """Decode a response from a json string."""
-        out = self._from_dict(data, self.response_types_by_id, 'response')
+    def response_from_dict(
+        self, data: dict, binary: bool = False
+    ) -> Response | SysResponse:
+        """Decode a response from a json string.
+
+        If 'binary' is True, the dict is expected to have come from
+        binary data.
+        """
+        out = self._from_dict(
+            data, self.response_types_by_id, 'response', binary
+        )
         assert isinstance(out, Response | SysResponse)
         return out
 
     # Weeeird; we get mypy errors returning dict[int, type] but
     # dict[int, typing.Type] or dict[int, type[Any]] works..
     def _from_dict(
-        self, data: dict, types_by_id: dict[int, type[Any]], opname: str
+        self,
+        data: dict,
+        types_by_id: dict[int, type[Any]],
+        opname: str,
+        binary: bool,
     ) -> Any:
         """Decode a message from a json string."""
         msgdict: dict | None
@@ -283,7 +357,11 @@ class MessageProtocol:
             raise UnregisteredMessageIDError(
                 f'Got unregistered {opname} id of {m_id}.'
             )
-        return dataclass_from_dict(msgtype, msgdict)
+        return dataclass_from_dict(
+            msgtype,
+            msgdict,
+            codec=Codec.FIRESTORE if binary else Codec.JSON,
+        )
 
     def _get_module_header(
         self,
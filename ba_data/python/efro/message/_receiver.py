@@ -7,9 +7,10 @@ Supports static typing for message types and possible return types.
 from __future__ import annotations
 
 import types
+import asyncio
 import inspect
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, overload
 
 from efro.message._message import (
     Message,
@@ -49,6 +50,15 @@ class MessageReceiver:
 
     Any unhandled Exception occurring during message handling will result in
     an efro.error.RemoteError being raised on the sending end.
+
+    Raw messages can be json strs or binary-encoded bytes; responses are
+    returned in the same form as the messages they answer.
+
+    Raw messages can also be batches of messages (see
+    MessageSender.send_batch_async()). Each message in a batch is
+    handled individually (concurrently on async receivers) and errors
+    are isolated to the message that caused them; all responses are
+    returned together as a single raw batch response.
     """
 
     is_async = False
@@ -206,17 +216,39 @@ class MessageReceiver:
                     raise TypeError(msg)
 
     def _decode_incoming_message_base(
-        self, bound_obj: Any, msg: str
+        self, bound_obj: Any, msg: str | bytes
     ) -> tuple[Any, dict, Message]:
         # Decode the incoming message.
-        msg_dict = self.protocol.decode_dict(msg)
-        msg_decoded = self.protocol.message_from_dict(msg_dict)
+        msg_dict = self._decode_raw_dict(msg)
+        msg_decoded = self._decode_incoming_dict(
+            bound_obj, msg_dict, isinstance(msg, bytes)
+        )
+        return bound_obj, msg_dict, msg_decoded
+
+    def _decode_raw_dict(self, msg: str | bytes) -> dict:
+        if isinstance(msg, str):
+            return self.protocol.decode_dict(msg)
+        return self.protocol.decode_dict_binary(msg)
+
+    def _decode_incoming_dict(
+        self, bound_obj: Any, msg_dict: dict, binary: bool
+    ) -> Message:
+        msg_decoded = self.protocol.message_from_dict(msg_dict, binary=binary)
         assert isinstance(msg_decoded, Message)
         if self._decode_filter_call is not None:
             self._decode_filter_call(bound_obj, msg_dict, msg_decoded)
-        return bound_obj, msg_dict, msg_decoded
+        return msg_decoded
+
+    def _get_handler(self, msg_decoded: Message) -> Callable:
+        msgtype = type(msg_decoded)
+        handler = self._handlers.get(msgtype)
+        if handler is None:
+            raise RuntimeError(f'Got unhandled message type: {msgtype}.')
+        return handler
 
-    def _decode_incoming_message(self, bound_obj: Any, msg: str) -> Message:
+    def _decode_incoming_message(
+        self, bound_obj: Any, msg: str | bytes
+    ) -> Message:
         bound_obj, _msg_dict, msg_decoded = self._decode_incoming_message_base(
             bound_obj=bound_obj, msg=msg
         )
@@ -226,7 +258,31 @@ class MessageReceiver:
         self, bound_obj: Any, message: Message, response: Response | None
     ) -> str:
         """Encode a response provided by the user for sending."""
+        out = self._encode_user_response(bound_obj, message, response, False)
+        assert isinstance(out, str)
+        return out
+
+    def _encode_user_response(
+        self,
+        bound_obj: Any,
+        message: Message,
+        response: Response | None,
+        binary: bool,
+    ) -> str | bytes:
+        response_dict = self._user_response_dict(
+            bound_obj, message, response, binary
+        )
+        if binary:
+            return self.protocol.encode_dict_binary(response_dict)
+        return self.protocol.encode_dict(response_dict)
 
+    def _user_response_dict(
+        self,
+        bound_obj: Any,
+        message: Message,
+        response: Response | None,
+        binary: bool,
+    ) -> dict:
         assert isinstance(response, Response | None)
         # (user should never explicitly return error-responses)
         assert (
@@ -240,28 +296,116 @@ class MessageReceiver:
         else:
             out_response = response
 
-        response_dict = self.protocol.response_to_dict(out_response)
+        response_dict = self.protocol.response_to_dict(
+            out_response, binary=binary
+        )
         if self._encode_filter_call is not None:
             self._encode_filter_call(
                 bound_obj, message, out_response, response_dict
             )
-        return self.protocol.encode_dict(response_dict)
+        return response_dict
 
     def encode_error_response(
         self, bound_obj: Any, message: Message | None, exc: Exception
     ) -> tuple[str, bool]:
         """Given an error, return sysresponse str and whether to log."""
+        out, dolog = self._encode_error_response(
+            bound_obj, message, exc, False
+        )
+        assert isinstance(out, str)
+        return out, dolog
+
+    def _encode_error_response(
+        self,
+        bound_obj: Any,
+        message: Message | None,
+        exc: Exception,
+        binary: bool,
+    ) -> tuple[str | bytes, bool]:
+        response_dict, dolog = self._error_response_dict(
+            bound_obj, message, exc, binary
+        )
+        if binary:
+            return self.protocol.encode_dict_binary(response_dict), dolog
+        return self.protocol.encode_dict(response_dict), dolog
+
+    def _error_response_dict(
+        self,
+        bound_obj: Any,
+        message: Message | None,
+        exc: Exception,
+        binary: bool,
+    ) -> tuple[dict, bool]:
         response, dolog = self.protocol.error_to_response(exc)
-        response_dict = self.protocol.response_to_dict(response)
+        response_dict = self.protocol.response_to_dict(response, binary=binary)
         if self._encode_filter_call is not None:
             self._encode_filter_call(
                 bound_obj, message, response, response_dict
             )
-        return self.protocol.encode_dict(response_dict), dolog
+        return response_dict, dolog
 
+    def _batch_error_response_dict(
+        self,
+        bound_obj: Any,
+        item: Any,
+        msg_decoded: Message | None,
+        exc: Exception,
+        binary: bool,
+    ) -> dict:
+        response_dict, dolog = self._error_response_dict(
+            bound_obj, msg_decoded, exc, binary
+        )
+        if dolog:
+            if msg_decoded is not None:
+                msgtype = type(msg_decoded)
+                logging.error(
+                    'Error handling %s.%s message in batch.',
+                    msgtype.__module__,
+                    msgtype.__qualname__,
+                    exc_info=exc,
+                )
+            else:
+                logging.error(
+                    'Error handling efro.message in batch'
+                    ' (likely a message format incompatibility): %s.',
+                    item,
+                    exc_info=exc,
+                )
+        return response_dict
+
+    def _encode_batch_response(
+        self, response_dicts: list[dict], binary: bool
+    ) -> str | bytes:
+        batch_dict = {self.protocol.BATCH_KEY: response_dicts}
+        if binary:
+            return self.protocol.encode_dict_binary(batch_dict)
+        return self.protocol.encode_dict(batch_dict)
+
+    def _get_batch_items(self, msg_dict: dict) -> list | None:
+        """Return batch items if a raw message dict is a batch."""
+        items = msg_dict.get(self.protocol.BATCH_KEY)
+        if items is None:
+            return None
+        if not isinstance(items, list):
+            raise TypeError('Invalid message batch.')
+        return items
+
+    @overload
     def handle_raw_message(
         self, bound_obj: Any, msg: str, raise_unregistered: bool = False
-    ) -> str:
+    ) -> str: ...
+
+    @overload
+    def handle_raw_message(
+        self, bound_obj: Any, msg: bytes, raise_unregistered: bool = False
+    ) -> bytes: ...
+
+    def handle_raw_message(
+        self,
+        bound_obj: Any,
+        msg: str | bytes,
+        raise_unregistered: bool = False,
+    ) -> str | bytes:
         """Decode, handle, and return an response for a message.
 
         if 'raise_unregistered' is True, will raise an
@@ -272,22 +416,29 @@ class MessageReceiver:
         assert not self.is_async, "can't call sync handler on async receiver"
         msg_decoded: Message | None = None
         try:
-            msg_decoded = self._decode_incoming_message(bound_obj, msg)
-            msgtype = type(msg_decoded)
-            handler = self._handlers.get(msgtype)
-            if handler is None:
-                raise RuntimeError(f'Got unhandled message type: {msgtype}.')
+            msg_dict = self._decode_raw_dict(msg)
+            batch_items = self._get_batch_items(msg_dict)
+            if batch_items is not None:
+                return self._handle_raw_batch(
+                    bound_obj, batch_items, isinstance(msg, bytes)
+                )
+            msg_decoded = self._decode_incoming_dict(
+                bound_obj, msg_dict, isinstance(msg, bytes)
+            )
+            handler = self._get_handler(msg_decoded)
             response = handler(bound_obj, msg_decoded)
             assert isinstance(response, Response | None)
-            return self.encode_user_response(bound_obj, msg_decoded, response)
+            return self._encode_user_response(
+                bound_obj, msg_decoded, response, isinstance(msg, bytes)
+            )
 
         except Exception as exc:
             if raise_unregistered and isinstance(
                 exc, UnregisteredMessageIDError
             ):
                 raise
-            rstr, dolog = self.encode_error_response(
-                bound_obj, msg_decoded, exc
+            rstr, dolog = self._encode_error_response(
+                bound_obj, msg_decoded, exc, isinstance(msg, bytes)
             )
             if dolog:
                 if msg_decoded is not None:
@@ -305,12 +456,56 @@ class MessageReceiver:
                     )
             return rstr
 
+    def _handle_raw_batch(
+        self, bound_obj: Any, items: list, binary: bool
+    ) -> str | bytes:
+        response_dicts: list[dict] = []
+        for item in items:
+            msg_decoded: Message | None = None
+            try:
+                if not isinstance(item, dict):
+                    raise TypeError('Invalid message batch item.')
+                msg_decoded = self._decode_incoming_dict(
+                    bound_obj, item, binary
+                )
+                handler = self._get_handler(msg_decoded)
+                response = handler(bound_obj, msg_decoded)
+                assert isinstance(response, Response | None)
+                response_dicts.append(
+                    self._user_response_dict(
+                        bound_obj, msg_decoded, response, binary
+                    )
+                )
+            except Exception as exc:
+                response_dicts.append(
+                    self._batch_error_response_dict(
+                        bound_obj, item, msg_decoded, exc, binary
+                    )
+                )
+        return self._encode_batch_response(response_dicts, binary)
+
+    @overload
     def handle_raw_message_async(
         self, bound_obj: Any, msg: str, raise_unregistered: bool = False
-    ) -> Awaitable[str]:
+    ) -> Awaitable[str]: ...
+
+    @overload
+    def handle_raw_message_async(
+        self, bound_obj: Any, msg: bytes, raise_unregistered: bool = False
+    ) -> Awaitable[bytes]: ...
+
+    def handle_raw_message_async(
+        self,
+        bound_obj: Any,
+        msg: str | bytes,
+        raise_unregistered: bool = False,
+    ) -> Awaitable[str | bytes]:
         """Should be called when the receiver gets a message.
 
         The return value is the raw response to the message.
+
+        Handlers for the messages in a batch are all called immediately
+        (in order) and their results are then awaited concurrently.
         """
 
         # Note: This call is synchronous so that the first part of it can
@@ -321,11 +516,16 @@ class MessageReceiver:
         assert self.is_async, "Can't call async handler on sync receiver."
         msg_decoded: Message | None = None
         try:
-            msg_decoded = self._decode_incoming_message(bound_obj, msg)
-            msgtype = type(msg_decoded)
-            handler = self._handlers.get(msgtype)
-            if handler is None:
-                raise RuntimeError(f'Got unhandled message type: {msgtype}.')
+            msg_dict = self._decode_raw_dict(msg)
+            batch_items = self._get_batch_items(msg_dict)
+            if batch_items is not None:
+                return self._handle_raw_batch_async(
+                    bound_obj, batch_items, isinstance(msg, bytes)
+                )
+            msg_decoded = self._decode_incoming_dict(
+                bound_obj, msg_dict, isinstance(msg, bytes)
+            )
+            handler = self._get_handler(msg_decoded)
             handler_awaitable = handler(bound_obj, msg_decoded)
 
         except Exception as exc:
@@ -345,11 +545,13 @@ class MessageReceiver:
     async def _handle_raw_message_async_error(
         self,
         bound_obj: Any,
-        msg_raw: str,
+        msg_raw: str | bytes,
         msg_decoded: Message | None,
         exc: Exception,
-    ) -> str:
-        rstr, dolog = self.encode_error_response(bound_obj, msg_decoded, exc)
+    ) -> str | bytes:
+        rstr, dolog = self._encode_error_response(
+            bound_obj, msg_decoded, exc, isinstance(msg_raw, bytes)
+        )
         if dolog:
             if msg_decoded is not None:
                 msgtype = type(msg_decoded)
@@ -377,10 +579,10 @@ class MessageReceiver:
     async def _handle_raw_message_async(
         self,
         bound_obj: Any,
-        msg_raw: str,
+        msg_raw: str | bytes,
         msg_decoded: Message,
         handler_awaitable: Awaitable[Response | None],
-    ) -> str:
+    ) -> str | bytes:
         """Should be called when the receiver gets a message.
 
         The return value is the raw response to the message.
@@ -388,13 +590,76 @@ class MessageReceiver:
         try:
             response = await handler_awaitable
             assert isinstance(response, Response | None)
-            return self.encode_user_response(bound_obj, msg_decoded, response)
+            return self._encode_user_response(
+                bound_obj, msg_decoded, response, isinstance(msg_raw, bytes)
+            )
 
         except Exception as exc:
             return await self._handle_raw_message_async_error(
                 bound_obj, msg_raw, msg_decoded, exc
             )
 
+    def _handle_raw_batch_async(
+        self, bound_obj: Any, items: list, binary: bool
+    ) -> Awaitable[str | bytes]:
+        # Kick off all handlers synchronously (in order) and collect
+        # either awaitables or already-encoded errors for each item.
+        pending: list[Awaitable[dict] | dict] = []
+        for item in items:
+            msg_decoded: Message | None = None
+            try:
+                if not isinstance(item, dict):
+                    raise TypeError('Invalid message batch item.')
+                msg_decoded = self._decode_incoming_dict(
+                    bound_obj, item, binary
+                )
+                handler = self._get_handler(msg_decoded)
+                pending.append(
+                    self._handle_batch_item_async(
+                        bound_obj,
+                        item,
+                        msg_decoded,
+                        handler(bound_obj, msg_decoded),
+                        binary,
+                    )
+                )
+            except Exception as exc:
+                pending.append(
+                    self._batch_error_response_dict(
+                        bound_obj, item, msg_decoded, exc, binary
+                    )
+                )
+        return self._finish_raw_batch_async(pending, binary)
+
+    async def _handle_batch_item_async(
+        self,
+        bound_obj: Any,
+        item: dict,
+        msg_decoded: Message,
+        handler_awaitable: Awaitable[Response | None],
+        binary: bool,
+    ) -> dict:
+        try:
+            response = await handler_awaitable
+            assert isinstance(response, Response | None)
+            return self._user_response_dict(
+                bound_obj, msg_decoded, response, binary
+            )
+        except Exception as exc:
+            return self._batch_error_response_dict(
+                bound_obj, item, msg_decoded, exc, binary
+            )
+
+    async def _finish_raw_batch_async(
+        self, pending: list[Awaitable[dict] | dict], binary: bool
+    ) -> str | bytes:
+        awaitables = [p for p in pending if not isinstance(p, dict)]
+        results = iter(await asyncio.gather(*awaitables))
+        response_dicts = [
+            p if isinstance(p, dict) else next(results) for p in pending
+        ]
+        return self._encode_batch_response(response_dicts, binary)
+
 
 class BoundMessageReceiver:
     """Base bound receiver class."""
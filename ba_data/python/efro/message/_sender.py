@@ -6,13 +6,14 @@ Supports static typing for message types and possible return types.
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from efro.error import CleanError, RemoteError, CommunicationError
 from efro.message._message import EmptySysResponse, ErrorSysResponse, Response
 
 if TYPE_CHECKING:
-    from typing import Any, Callable, Awaitable
+    from typing import Any, Callable, Awaitable, Sequence
 
     from efro.message._message import Message, SysResponse
     from efro.message._protocol import MessageProtocol
@@ -47,6 +48,18 @@ class MessageSender:
     # SomeMessageType.
     response = obj.msg.send(SomeMessageType())
 
+    Senders can also opt in to binary encoding for messages by providing
+    send_binary_method/send_async_binary_method variants (taking and
+    returning bytes). These are used in place of the standard ones
+    whenever the binary_check_method call (if any) returns True; this
+    is generally based on what the peer advertised during connection
+    setup so that older peers keep getting json.
+
+    Multiple messages can be sent in a single round trip using
+    send_batch_async(). This only happens when a batch_check_method
+    is provided and returns True (generally based on the peer
+    advertising MessageProtocol.BATCH_FEATURE); otherwise the messages
+    are simply sent individually.
     """
 
     def __init__(self, protocol: MessageProtocol) -> None:
@@ -61,6 +74,14 @@ class MessageSender:
         self._send_async_raw_message_ex_call: (
             Callable[[Any, str, Message], Awaitable[str]] | None
         ) = None
+        self._send_binary_message_call: (
+            Callable[[Any, bytes], bytes] | None
+        ) = None
+        self._send_async_binary_message_call: (
+            Callable[[Any, bytes], Awaitable[bytes]] | None
+        ) = None
+        self._binary_check_call: Callable[[Any], bool] | None = None
+        self._batch_check_call: Callable[[Any], bool] | None = None
         self._encode_filter_call: (
             Callable[[Any, Message, dict], None] | None
         ) = None
@@ -131,6 +152,61 @@ class MessageSender:
         self._send_async_raw_message_ex_call = call
         return call
 
+    def send_binary_method(
+        self, call: Callable[[Any, bytes], bytes]
+    ) -> Callable[[Any, bytes], bytes]:
+        """Function decorator for setting raw binary send method.
+
+        Like send_method but for binary-encoded messages; takes bytes
+        and should return bytes.
+        """
+        assert self._send_binary_message_call is None
+        self._send_binary_message_call = call
+        return call
+
+    def send_async_binary_method(
+        self, call: Callable[[Any, bytes], Awaitable[bytes]]
+    ) -> Callable[[Any, bytes], Awaitable[bytes]]:
+        """Function decorator for setting raw binary send-async method.
+
+        Like send_async_method but for binary-encoded messages; takes
+        bytes and should return awaitable bytes.
+        """
+        assert self._send_async_binary_message_call is None
+        self._send_async_binary_message_call = call
+        return call
+
+    def binary_check_method(
+        self, call: Callable[[Any], bool]
+    ) -> Callable[[Any], bool]:
+        """Function decorator for checking if binary sends can be used.
+
+        This is called for each send when a binary send method is
+        available. It should return True only if the peer is known to
+        support binary messages (see MessageProtocol.BINARY_FEATURE).
+        If no such method is provided, binary sends are always used
+        when available.
+        """
+        assert self._binary_check_call is None
+        self._binary_check_call = call
+        return call
+
+    def batch_check_method(
+        self, call: Callable[[Any], bool]
+    ) -> Callable[[Any], bool]:
+        """Function decorator for checking if batch sends can be used.
+
+        This is called for each send_batch_async() call and should
+        return True only if the peer is known to support message
+        batches (see MessageProtocol.BATCH_FEATURE). If no such method
+        is provided, batched messages are always sent individually.
+        Note that batches go out through send_async_method or
+        send_async_binary_method; ex variants are not supported.
+        """
+        assert self._batch_check_call is None
+        self._batch_check_call = call
+        return call
+
     def encode_filter_method(
         self, call: Callable[[Any, Message, dict], None]
     ) -> Callable[[Any, Message, dict], None]:
@@ -207,6 +283,63 @@ class MessageSender:
             raw_response=await raw_response_awaitable,
         )
 
+    def send_batch_async(
+        self, bound_obj: Any, messages: Sequence[Message]
+    ) -> list[Awaitable[Response | None]]:
+        """Send multiple messages asynchronously in one round trip.
+
+        Returns an awaitable for each message which results in its
+        response (or raises its error) exactly as send_async() would;
+        an error for one message does not affect the others. Falls
+        back to individual sends if the peer does not support batches.
+        Must be called with an event loop running.
+        """
+        if len(messages) < 2 or not self._can_send_batch(bound_obj):
+            return [self.send_async(bound_obj, m) for m in messages]
+
+        # Note: as with send_async(), this part happens synchronously
+        # so batches go out in the order they are sent. The task then
+        # completes the round trip regardless of which (if any) of
+        # the individual awaitables gets awaited first.
+        raw_responses = asyncio.get_running_loop().create_task(
+            self.fetch_raw_response_batch_async(bound_obj, messages)
+        )
+        return [
+            self._send_batch_item_awaitable(
+                bound_obj, message, raw_responses, i
+            )
+            for i, message in enumerate(messages)
+        ]
+
+    async def _send_batch_item_awaitable(
+        self,
+        bound_obj: Any,
+        message: Message,
+        raw_responses: Awaitable[list[Response | SysResponse]],
+        index: int,
+    ) -> Response | None:
+        return self.unpack_raw_response(
+            bound_obj=bound_obj,
+            message=message,
+            raw_response=(await raw_responses)[index],
+        )
+
+    def _can_send_batch(self, bound_obj: Any) -> bool:
+        if self._batch_check_call is None:
+            return False
+        if (
+            self._send_async_raw_message_call is None
+            and not self._use_binary_async(bound_obj)
+        ):
+            return False
+        return self._batch_check_call(bound_obj)
+
+    def _use_binary_async(self, bound_obj: Any) -> bool:
+        return self._send_async_binary_message_call is not None and (
+            self._binary_check_call is None
+            or self._binary_check_call(bound_obj)
+        )
+
     def fetch_raw_response(
         self, bound_obj: Any, message: Message
     ) -> Response | SysResponse:
@@ -216,20 +349,34 @@ class MessageSender:
         for when message sending and response handling need to happen
         in different contexts/threads.
         """
+        binary = self._send_binary_message_call is not None and (
+            self._binary_check_call is None
+            or self._binary_check_call(bound_obj)
+        )
         if (
-            self._send_raw_message_call is None
+            not binary
+            and self._send_raw_message_call is None
             and self._send_raw_message_ex_call is None
         ):
             raise RuntimeError('send() is unimplemented for this type.')
 
-        msg_encoded = self._encode_message(bound_obj, message)
+        msg_encoded = self._encode_message(bound_obj, message, binary)
+        response_encoded: str | bytes
         try:
-            if self._send_raw_message_ex_call is not None:
+            if binary:
+                assert self._send_binary_message_call is not None
+                assert isinstance(msg_encoded, bytes)
+                response_encoded = self._send_binary_message_call(
+                    bound_obj, msg_encoded
+                )
+            elif self._send_raw_message_ex_call is not None:
+                assert isinstance(msg_encoded, str)
                 response_encoded = self._send_raw_message_ex_call(
                     bound_obj, msg_encoded, message
                 )
             else:
                 assert self._send_raw_message_call is not None
+                assert isinstance(msg_encoded, str)
                 response_encoded = self._send_raw_message_call(
                     bound_obj, msg_encoded
                 )
@@ -265,20 +412,31 @@ class MessageSender:
         # happen synchronously. If the whole call were async we wouldn't be
         # able to guarantee that messages sent in order would actually go
         # out in order.
+        binary = self._use_binary_async(bound_obj)
         if (
-            self._send_async_raw_message_call is None
+            not binary
+            and self._send_async_raw_message_call is None
             and self._send_async_raw_message_ex_call is None
         ):
             raise RuntimeError('send_async() is unimplemented for this type.')
 
-        msg_encoded = self._encode_message(bound_obj, message)
+        msg_encoded = self._encode_message(bound_obj, message, binary)
+        send_awaitable: Awaitable[str] | Awaitable[bytes]
         try:
-            if self._send_async_raw_message_ex_call is not None:
+            if binary:
+                assert self._send_async_binary_message_call is not None
+                assert isinstance(msg_encoded, bytes)
+                send_awaitable = self._send_async_binary_message_call(
+                    bound_obj, msg_encoded
+                )
+            elif self._send_async_raw_message_ex_call is not None:
+                assert isinstance(msg_encoded, str)
                 send_awaitable = self._send_async_raw_message_ex_call(
                     bound_obj, msg_encoded, message
                 )
             else:
                 assert self._send_async_raw_message_call is not None
+                assert isinstance(msg_encoded, str)
                 send_awaitable = self._send_async_raw_message_call(
                     bound_obj, msg_encoded
                 )
@@ -290,7 +448,75 @@ class MessageSender:
             bound_obj, message, send_awaitable
         )
 
+    def fetch_raw_response_batch_async(
+        self, bound_obj: Any, messages: Sequence[Message]
+    ) -> Awaitable[list[Response | SysResponse]]:
+        """Fetch an awaitable for raw responses to a message batch.
+
+        The peer must support batches. Each raw response in the result
+        should be passed to unpack_raw_response() along with its
+        message to produce the final message result.
+
+        Generally you can just call send_batch_async(); calling fetch
+        and unpack manually is for when message sending and response
+        handling need to happen in different contexts/threads.
+        """
+        binary = self._use_binary_async(bound_obj)
+        if not binary and self._send_async_raw_message_call is None:
+            raise RuntimeError(
+                'send_batch_async() is unimplemented for this type.'
+            )
+
+        msg_dicts = [
+            self._message_dict(bound_obj, message, binary)
+            for message in messages
+        ]
+        batch_dict = {self.protocol.BATCH_KEY: msg_dicts}
+        send_awaitable: Awaitable[str] | Awaitable[bytes]
+        try:
+            if binary:
+                assert self._send_async_binary_message_call is not None
+                send_awaitable = self._send_async_binary_message_call(
+                    bound_obj, self.protocol.encode_dict_binary(batch_dict)
+                )
+            else:
+                assert self._send_async_raw_message_call is not None
+                send_awaitable = self._send_async_raw_message_call(
+                    bound_obj, self.protocol.encode_dict(batch_dict)
+                )
+        except Exception as exc:
+            return self._error_batch_awaitable(exc, len(messages))
+
+        # Now return an awaitable to finish the job.
+        return self._fetch_raw_response_batch_awaitable(
+            bound_obj, messages, send_awaitable
+        )
+
+    async def _error_batch_awaitable(
+        self, exc: Exception, count: int
+    ) -> list[Response | SysResponse]:
+        # Each message gets its own response object so callers are
+        # free to modify or attach things to them individually.
+        return [self._send_error_response(exc) for _ in range(count)]
+
+    async def _fetch_raw_response_batch_awaitable(
+        self,
+        bound_obj: Any,
+        messages: Sequence[Message],
+        send_awaitable: Awaitable[str] | Awaitable[bytes],
+    ) -> list[Response | SysResponse]:
+        try:
+            response_encoded = await send_awaitable
+        except Exception as exc:
+            return await self._error_batch_awaitable(exc, len(messages))
+        return self._decode_raw_batch_response(
+            bound_obj, messages, response_encoded
+        )
+
     async def _error_awaitable(self, exc: Exception) -> SysResponse:
+        return self._send_error_response(exc)
+
+    def _send_error_response(self, exc: Exception) -> SysResponse:
         response = ErrorSysResponse(
             error_message='Error in MessageSender @send_async_method.',
             error_type=(
@@ -305,7 +531,10 @@ class MessageSender:
         return response
 
     async def _fetch_raw_response_awaitable(
-        self, bound_obj: Any, message: Message, send_awaitable: Awaitable[str]
+        self,
+        bound_obj: Any,
+        message: Message,
+        send_awaitable: Awaitable[str] | Awaitable[bytes],
     ) -> Response | SysResponse:
         try:
             response_encoded = await send_awaitable
@@ -343,15 +572,28 @@ class MessageSender:
         )
         return response
 
-    def _encode_message(self, bound_obj: Any, message: Message) -> str:
+    def _encode_message(
+        self, bound_obj: Any, message: Message, binary: bool
+    ) -> str | bytes:
         """Encode a message for sending."""
-        msg_dict = self.protocol.message_to_dict(message)
+        msg_dict = self._message_dict(bound_obj, message, binary)
+        if binary:
+            return self.protocol.encode_dict_binary(msg_dict)
+        return self.protocol.encode_dict(msg_dict)
+
+    def _message_dict(
+        self, bound_obj: Any, message: Message, binary: bool
+    ) -> dict:
+        msg_dict = self.protocol.message_to_dict(message, binary=binary)
         if self._encode_filter_call is not None:
             self._encode_filter_call(bound_obj, message, msg_dict)
-        return self.protocol.encode_dict(msg_dict)
+        return msg_dict
 
     def _decode_raw_response(
-        self, bound_obj: Any, message: Message, response_encoded: str
+        self,
+        bound_obj: Any,
+        message: Message,
+        response_encoded: str | bytes,
     ) -> Response | SysResponse:
         """Create a Response from returned data.
 
@@ -360,22 +602,93 @@ class MessageSender:
         should be used to translate to special values like None or raise
         Exceptions. This function itself should never raise Exceptions.
         """
+        try:
+            if isinstance(response_encoded, str):
+                response_dict = self.protocol.decode_dict(response_encoded)
+            else:
+                response_dict = self.protocol.decode_dict_binary(
+                    response_encoded
+                )
+        except Exception as exc:
+            return self._decode_error_response(exc)
+        return self._decode_response_dict(
+            bound_obj,
+            message,
+            response_dict,
+            not isinstance(response_encoded, str),
+        )
+
+    def _decode_raw_batch_response(
+        self,
+        bound_obj: Any,
+        messages: Sequence[Message],
+        response_encoded: str | bytes,
+    ) -> list[Response | SysResponse]:
+        """Create Responses from returned batch data.
+
+        Like _decode_raw_response(), this should never raise Exceptions.
+        """
+        binary = not isinstance(response_encoded, str)
+        try:
+            if binary:
+                assert isinstance(response_encoded, bytes)
+                response_dict = self.protocol.decode_dict_binary(
+                    response_encoded
+                )
+            else:
+                assert isinstance(response_encoded, str)
+                response_dict = self.protocol.decode_dict(response_encoded)
+            items = response_dict.get(self.protocol.BATCH_KEY)
+
+            # A non-batch response means the batch failed as a whole
+            # (for instance a peer that doesn't understand batches).
+            # That response applies to each message.
+            if items is None:
+                return [
+                    self._decode_response_dict(
+                        bound_obj, message, response_dict, binary
+                    )
+                    for message in messages
+                ]
+            if not isinstance(items, list) or len(items) != len(messages):
+                raise ValueError('Invalid batch response.')
+        except Exception as exc:
+            return [self._decode_error_response(exc) for _ in messages]
+        return [
+            self._decode_response_dict(bound_obj, message, item, binary)
+            for message, item in zip(messages, items)
+        ]
+
+    def _decode_error_response(self, exc: Exception) -> SysResponse:
+        response = ErrorSysResponse(
+            error_message='Error decoding raw response.',
+            error_type=ErrorSysResponse.ErrorType.LOCAL,
+        )
+        # Since we'll be looking at this locally, we can include
+        # extra info for logging/etc.
+        response.set_local_exception(exc)
+        return response
+
+    def _decode_response_dict(
+        self,
+        bound_obj: Any,
+        message: Message,
+        response_dict: Any,
+        binary: bool,
+    ) -> Response | SysResponse:
         response: Response | SysResponse
         try:
-            response_dict = self.protocol.decode_dict(response_encoded)
-            response = self.protocol.response_from_dict(response_dict)
+            if not isinstance(response_dict, dict):
+                raise TypeError('Response data is not a dict.')
+            response = self.protocol.response_from_dict(
+                response_dict, binary=binary
+            )
             if self._decode_filter_call is not None:
                 self._decode_filter_call(
                     bound_obj, message, response_dict, response
                 )
         except Exception as exc:
-            response = ErrorSysResponse(
-                error_message='Error decoding raw response.',
-                error_type=ErrorSysResponse.ErrorType.LOCAL,
-            )
-            # Since we'll be looking at this locally, we can include
-            # extra info for logging/etc.
-            response.set_local_exception(exc)
+            response = self._decode_error_response(exc)
         return response
 
     def _unpack_raw_response(
@@ -481,6 +794,19 @@ class BoundMessageSender:
         assert self._obj is not None
         return self._sender.send_async(bound_obj=self._obj, message=message)
 
+    def send_batch_async_untyped(
+        self, messages: Sequence[Message]
+    ) -> list[Awaitable[Response | None]]:
+        """Send multiple messages asynchronously in one round trip.
+
+        Returns an awaitable for each message; see
+        MessageSender.send_batch_async() for details.
+        """
+        assert self._obj is not None
+        return self._sender.send_batch_async(
+            bound_obj=self._obj, messages=messages
+        )
+
     def fetch_raw_response_async_untyped(
         self, message: Message
     ) -> Awaitable[Response | SysResponse]:
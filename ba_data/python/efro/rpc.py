@@ -4,14 +4,17 @@
 
 from __future__ import annotations
 
+import math
 import time
+import zlib
+import struct
 import asyncio
 import logging
 import weakref
 from enum import Enum
 from functools import partial
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from threading import current_thread
 from typing import TYPE_CHECKING, Annotated, assert_never
 
@@ -27,7 +30,7 @@ from efro.dataclassio import (
 )
 
 if TYPE_CHECKING:
-    from typing import Literal, Awaitable, Callable
+    from typing import Literal, Awaitable, Callable, Any, Sequence
 
 # Terminology:
 # Packet: A chunk of data consisting of a type and some type-dependent
@@ -43,10 +46,46 @@ class _PacketType(Enum):
     RESPONSE = 3
     MESSAGE_BIG = 4
     RESPONSE_BIG = 5
+    KEEPALIVE_ACK = 6
 
 
 _BYTE_ORDER: Literal['big'] = 'big'
 
+# Pre-compiled packet framing (big-endian to match _BYTE_ORDER).
+# Message/response packets are type (1b), id (2b), len (2b or 4b for
+# 'big' variants), and then data.
+_UINT32 = struct.Struct('>I')
+_HEADER = struct.Struct('>BHH')
+_HEADER_BIG = struct.Struct('>BHI')
+_ID_LEN = struct.Struct('>HH')
+_ID_LEN_BIG = struct.Struct('>HI')
+_KEEPALIVE_PACKET = bytes([_PacketType.KEEPALIVE.value])
+_KEEPALIVE_ACK_PACKET = bytes([_PacketType.KEEPALIVE_ACK.value])
+
+# Send-to-response latencies are histogrammed in power-of-two buckets:
+# bucket 0 is under 1ms, bucket n covers [2^(n-1), 2^n) ms, and the
+# last bucket catches everything beyond that (~16s+).
+_LATENCY_BUCKET_BASE = 0.001
+_LATENCY_BUCKET_COUNT = 16
+
+# Protocol 3+: the high bit of a message/response packet's type byte
+# marks its payload as compressed with the negotiated codec.
+_COMPRESSED_FLAG = 0x80
+
+# Payload compression codecs we support: name -> (compress, decompressor
+# factory). Decompression goes through incremental decompressor objects
+# so output size can be capped. We favor speed over ratio; these are for
+# on-the-fly network traffic.
+_CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[], Any]]] = {
+    'zlib': (partial(zlib.compress, level=1), zlib.decompressobj),
+}
+try:
+    import lzma
+
+    _CODECS['lzma'] = (partial(lzma.compress, preset=1), lzma.LZMADecompressor)
+except ImportError:
+    pass
+
 
 @ioprepped
 @dataclass
@@ -57,6 +96,95 @@ class _PeerInfo:
     # How often we'll be sending out keepalives (in seconds).
     keepalive_interval: Annotated[float, IOAttrs('k')]
 
+    # Compression codecs we can decode, most preferred first (protocol 3).
+    compression: Annotated[list[str], IOAttrs('c', store_default=False)] = (
+        field(default_factory=list)
+    )
+
+    # Arbitrary higher-level capabilities we support (such as
+    # efro.message binary encoding). Older peers won't send this.
+    features: Annotated[list[str], IOAttrs('f', store_default=False)] = (
+        field(default_factory=list)
+    )
+
+
+@dataclass
+class RPCMetrics:
+    """A snapshot of an RPCEndpoint's traffic and timing."""
+
+    # Traffic totals. Bytes include packet framing.
+    messages_sent: int = 0
+    messages_received: int = 0
+    responses_sent: int = 0
+    responses_received: int = 0
+    bytes_out: int = 0
+    bytes_in: int = 0
+
+    # Current state of things.
+    in_flight_messages: int = 0
+    queued_packets: int = 0
+    queued_bytes: int = 0
+    blocked_messages: int = 0
+
+    # Most recent keepalive round trip time (requires protocol 4 peer).
+    keepalive_rtt: float | None = None
+
+    # Total time spent in our handler for incoming messages.
+    handle_seconds: float = 0.0
+
+    # Send-to-response latency counts; see latency_bucket_bounds().
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * _LATENCY_BUCKET_COUNT
+    )
+    latency_total: float = 0.0
+
+    @staticmethod
+    def latency_bucket_bounds() -> list[float]:
+        """Return the upper bound (in seconds) of each histogram bucket."""
+        return [
+            _LATENCY_BUCKET_BASE * 2.0**i
+            for i in range(_LATENCY_BUCKET_COUNT - 1)
+        ] + [math.inf]
+
+    def latency_percentile(self, fraction: float) -> float | None:
+        """Estimate a latency percentile (0-1) from the histogram.
+
+        Returns the upper bound of the bucket containing it, or None
+        if no latencies have been recorded.
+        """
+        total = sum(self.latency_histogram)
+        if not total:
+            return None
+        target = fraction * total
+        seen = 0
+        bounds = self.latency_bucket_bounds()
+        for count, bound in zip(self.latency_histogram, bounds):
+            seen += count
+            if seen >= target:
+                return bound
+        return bounds[-1]
+
+
+@dataclass
+class RPCCompressionStats:
+    """Payload compression statistics for an RPCEndpoint."""
+
+    # Codecs negotiated for each direction (None if not compressing).
+    send_codec: str | None = None
+    receive_codec: str | None = None
+
+    # Outgoing payloads we compressed and their sizes before and after.
+    packets_compressed: int = 0
+    bytes_before_compression: int = 0
+    bytes_after_compression: int = 0
+    compress_seconds: float = 0.0
+
+    # Incoming compressed payloads and their sizes before and after.
+    packets_decompressed: int = 0
+    bytes_before_decompression: int = 0
+    bytes_after_decompression: int = 0
+    decompress_seconds: float = 0.0
+
 
 # Note: we are expected to be forward and backward compatible; we can
 # increment protocol freely and expect everyone else to still talk to us.
@@ -64,7 +192,9 @@ class _PeerInfo:
 # Protocol history:
 # 1 - initial release
 # 2 - gained big (32-bit len val) package/response packets
-OUR_PROTOCOL = 2
+# 3 - gained compression codec negotiation and compressed packet flag
+# 4 - gained keepalive acks (for measuring round trip time)
+OUR_PROTOCOL = 4
 
 
 def ssl_stream_writer_underlying_transport_info(
@@ -130,6 +260,7 @@ class _InFlightMessage:
     def __init__(self) -> None:
         self._response: bytes | None = None
         self._got_response = asyncio.Event()
+        self.send_time = time.monotonic()
         self.wait_task = asyncio.create_task(
             self._wait(), name='rpc in flight msg wait'
         )
@@ -146,6 +277,69 @@ class _InFlightMessage:
         self._got_response.set()
 
 
+class _PacketReader:
+    """Buffered reading of incoming packet data.
+
+    Pulls whatever the stream has available into a single reusable
+    buffer and parses fields out of it in place, so reading a packet
+    usually costs a single await instead of one per field.
+    """
+
+    _CHUNK_SIZE = 65536
+
+    def __init__(self, reader: asyncio.StreamReader) -> None:
+        self._reader = reader
+        self._buffer = bytearray()
+        self._pos = 0
+        self.total_bytes_read = 0
+
+    async def read_uint8(self) -> int:
+        """Read a single byte value."""
+        if self._pos >= len(self._buffer):
+            await self._fill(1)
+        val = self._buffer[self._pos]
+        self._pos += 1
+        self.total_bytes_read += 1
+        return val
+
+    async def read_struct(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        """Read and unpack a fixed-size struct."""
+        if len(self._buffer) - self._pos < fmt.size:
+            await self._fill(fmt.size)
+        vals = fmt.unpack_from(self._buffer, self._pos)
+        self._pos += fmt.size
+        self.total_bytes_read += fmt.size
+        return vals
+
+    async def read_bytes(self, count: int) -> bytes:
+        """Read a payload of the provided size."""
+        if len(self._buffer) - self._pos < count:
+            await self._fill(count)
+        start = self._pos
+        self._pos += count
+        self.total_bytes_read += count
+
+        # Copy straight out of our buffer; the only copy a payload gets.
+        with memoryview(self._buffer) as view:
+            return bytes(view[start : start + count])
+
+    async def _fill(self, count: int) -> None:
+        """Ensure at least 'count' unread bytes are buffered."""
+        buf = self._buffer
+
+        # Drop anything already consumed before we grow.
+        if self._pos:
+            del buf[: self._pos]
+            self._pos = 0
+        while len(buf) < count:
+            data = await self._reader.read(
+                max(self._CHUNK_SIZE, count - len(buf))
+            )
+            if not data:
+                raise asyncio.IncompleteReadError(bytes(buf), count)
+            buf += data
+
+
 class _KeepaliveTimeoutError(Exception):
     """Raised if we time out due to not receiving keepalives."""
 
@@ -174,6 +368,33 @@ class RPCEndpoint:
     # disconnect.
     DEFAULT_KEEPALIVE_TIMEOUT = 30.0
 
+    # How many bytes of outgoing packets we queue before new messages
+    # have to wait their turn (backpressure).
+    DEFAULT_MAX_QUEUED_OUT_BYTES = 8 * 1024 * 1024
+
+    # How much data we let pile up in the transport's write buffer before
+    # we stop and wait for it to drain.
+    DEFAULT_WRITE_HIGH_WATER = 256 * 1024
+
+    # Codecs we offer for payload compression, most preferred first.
+    DEFAULT_COMPRESSION_CODECS: tuple[str, ...] = tuple(_CODECS)
+
+    # Payloads smaller than this are always sent raw; compressing them
+    # would cost more latency than it saves.
+    DEFAULT_COMPRESSION_THRESHOLD = 4096
+
+    # Payloads larger than this are always sent raw. Compression runs
+    # synchronously on the event loop, so this bounds how long one send
+    # can stall every other connection on it (roughly 4ms for zlib and
+    # 30ms for lzma at this size; lzma on a 32MB payload takes seconds).
+    DEFAULT_MAX_COMPRESS_BYTES = 256 * 1024
+
+    # The most a compressed payload may expand to. Anything bigger fails
+    # the connection (so a tiny packet can't balloon into gigabytes).
+    # We never compress payloads over our own limit, so peers sharing
+    # the same limit always accept what we send.
+    DEFAULT_MAX_DECOMPRESSED_BYTES = 32 * 1024 * 1024
+
     def __init__(
         self,
         handle_raw_message_call: Callable[[bytes], Awaitable[bytes]],
@@ -185,9 +406,16 @@ class RPCEndpoint:
         debug_print_call: Callable[[str], None] | None = None,
         keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL,
         keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        max_queued_out_bytes: int = DEFAULT_MAX_QUEUED_OUT_BYTES,
+        write_high_water: int = DEFAULT_WRITE_HIGH_WATER,
+        compression_codecs: Sequence[str] = DEFAULT_COMPRESSION_CODECS,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        max_compress_bytes: int = DEFAULT_MAX_COMPRESS_BYTES,
+        max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+        features: Sequence[str] = (),
     ) -> None:
         self._handle_raw_message_call = handle_raw_message_call
-        self._reader = reader
+        self._packet_reader = _PacketReader(reader)
         self._writer = writer
         self.debug_print = debug_print
         self.debug_print_io = debug_print_io
@@ -199,21 +427,60 @@ class RPCEndpoint:
         self._closing = False
         self._did_wait_closed = False
         self._event_loop = asyncio.get_running_loop()
+        # Packet headers and payloads are queued as separate chunks so
+        # payloads never get copied just to prepend a header.
         self._out_packets = deque[bytes]()
+        self._out_packets_size = 0
         self._have_out_packets = asyncio.Event()
+        self._max_queued_out_bytes = max_queued_out_bytes
+        self._write_high_water = write_high_water
+
+        # Messages (id, data) waiting to be packed into _out_packets, in
+        # send order, along with futures to fire once they are enqueued.
+        self._blocked_messages = deque[
+            tuple[int, bytes, asyncio.Future[None]]
+        ]()
         self._run_called = False
         self._peer_info: _PeerInfo | None = None
+
+        # Sends wait on this until we know who we're talking to. It also
+        # gets set when we close so nobody waits forever.
+        self._have_peer_info = asyncio.Event()
         self._keepalive_interval = keepalive_interval
         self._keepalive_timeout = keepalive_timeout
         self._did_close_writer = False
         self._did_wait_closed_writer = False
-        self._did_out_packets_buildup_warning = False
-        self._total_bytes_read = 0
         self._create_time = time.monotonic()
+        self._first_response_latency: float | None = None
+
+        for codec in compression_codecs:
+            if codec not in _CODECS:
+                raise ValueError(f'Unsupported compression codec: {codec}')
+        self._compression_codecs = list(compression_codecs)
+        self._compression_threshold = compression_threshold
+        assert max_decompressed_bytes > 0
+        self._max_decompressed_bytes = max_decompressed_bytes
+        self._max_compress_bytes = min(
+            max_compress_bytes, max_decompressed_bytes
+        )
+        self._compression_stats = RPCCompressionStats()
+        self._features = list(features)
 
-        # Need to hold weak-refs to these otherwise it creates dep-loops
-        # which keeps us alive.
-        self._tasks: list[asyncio.Task] = []
+        self._metrics = RPCMetrics()
+        self._bytes_written = 0
+
+        # When we sent keepalives we're still waiting on acks for.
+        self._keepalive_send_times = deque[float]()
+
+        # Negotiated once we have the peer's handshake.
+        self._compress_call: Callable[[bytes], bytes] | None = None
+        self._make_decompressor: Callable[[], Any] | None = None
+
+        # Strong refs to our in-flight tasks (the event loop only holds
+        # weak ones, so untracked tasks can get garbage collected
+        # mid-run). Each task discards itself via a done-callback as it
+        # finishes, which also breaks the task->us->task ref cycle.
+        self._tasks: set[asyncio.Task] = set()
 
         # When we last got a keepalive or equivalent (time.monotonic value)
         self._last_keepalive_receive_time: float | None = None
@@ -287,7 +554,8 @@ class RPCEndpoint:
                 name='rpc write',
             ),
         ]
-        self._tasks += core_tasks
+        for task in core_tasks:
+            self._add_task(task)
 
         # Run our core tasks until they all complete.
         results = await asyncio.gather(*core_tasks, return_exceptions=True)
@@ -367,27 +635,21 @@ class RPCEndpoint:
                 f'{self._label}: will enqueue at {self._tm()}.'
             )
 
-        # FIXME - should handle backpressure (waiting here if there are
-        # enough packets already enqueued).
-
-        if len(message) > 65535:
-            # Payload consists of type (1b), message_id (2b),
-            # len (4b), and data.
-            self._enqueue_outgoing_packet(
-                _PacketType.MESSAGE_BIG.value.to_bytes(1, _BYTE_ORDER)
-                + message_id.to_bytes(2, _BYTE_ORDER)
-                + len(message).to_bytes(4, _BYTE_ORDER)
-                + message
-            )
+        # Backpressure: if our outgoing queue is over budget (or others
+        # are already waiting on it) we hold on to the message and the
+        # async part of the send waits until it makes it into the queue.
+        # Keeping waiters in a fifo preserves send order. We also hold
+        # compressible messages until we know what codecs the peer has.
+        enqueued: asyncio.Future[None] | None = None
+        if (
+            self._blocked_messages
+            or self._out_packets_size >= self._max_queued_out_bytes
+            or self._awaiting_codecs(message)
+        ):
+            enqueued = self._event_loop.create_future()
+            self._blocked_messages.append((message_id, message, enqueued))
         else:
-            # Payload consists of type (1b), message_id (2b),
-            # len (2b), and data.
-            self._enqueue_outgoing_packet(
-                _PacketType.MESSAGE.value.to_bytes(1, _BYTE_ORDER)
-                + message_id.to_bytes(2, _BYTE_ORDER)
-                + len(message).to_bytes(2, _BYTE_ORDER)
-                + message
-            )
+            self._enqueue_message_packet(message_id, message)
 
         if self.debug_print_io:
             self.debug_print_call(
@@ -399,9 +661,8 @@ class RPCEndpoint:
         assert message_id not in self._in_flight_messages
         msgobj = self._in_flight_messages[message_id] = _InFlightMessage()
 
-        # Also add its task to our list so we properly cancel it if we die.
-        self._prune_tasks()  # Keep our list from filling with dead tasks.
-        self._tasks.append(msgobj.wait_task)
+        # Also add its task to our set so we properly cancel it if we die.
+        self._add_task(msgobj.wait_task)
 
         # Note: we always want to incorporate a timeout. Individual
         # messages may hang or error on the other end and this ensures
@@ -415,7 +676,12 @@ class RPCEndpoint:
 
         # Now complete the send asynchronously.
         return self._send_message(
-            message, timeout, close_on_error, bytes_awaitable, message_id
+            message,
+            timeout,
+            close_on_error,
+            bytes_awaitable,
+            message_id,
+            enqueued,
         )
 
     async def _send_message(
@@ -425,18 +691,25 @@ class RPCEndpoint:
         close_on_error: bool,
         bytes_awaitable: asyncio.Task[bytes],
         message_id: int,
+        enqueued: asyncio.Future[None] | None,
     ) -> bytes:
         # We need to know their protocol, so if we haven't gotten a handshake
         # from them yet, just wait.
-        while self._peer_info is None:
-            await asyncio.sleep(0.01)
-        assert self._peer_info is not None
+        if self._peer_info is None:
+            await self._have_peer_info.wait()
+            if self._peer_info is None:
+                # We closed before the handshake arrived.
+                raise CommunicationError()
 
         if self._peer_info.protocol == 1:
             if len(message) > 65535:
                 raise RuntimeError('Message cannot be larger than 65535 bytes')
 
         try:
+            if enqueued is not None:
+                # Note: time spent waiting for queue room is not counted
+                # against our timeout; the endpoint closing fails this.
+                await enqueued
             return await asyncio.wait_for(bytes_awaitable, timeout=timeout)
         except asyncio.CancelledError as exc:
             # Question: we assume this means the above wait_for() was
@@ -446,6 +719,13 @@ class RPCEndpoint:
                 self.debug_print_call(
                     f'{self._label}: message {message_id} was cancelled.'
                 )
+
+            # Stop waiting on the response and remove the record of this
+            # message. (Sends cancelled while blocked on queue room get
+            # here too; their packets get dropped when their turn comes.)
+            bytes_awaitable.cancel()
+            self._in_flight_messages.pop(message_id, None)
+
             if close_on_error:
                 self.close()
 
@@ -466,7 +746,7 @@ class RPCEndpoint:
                 bytes_awaitable.cancel()
 
                 # Remove the record of this message.
-                del self._in_flight_messages[message_id]
+                self._in_flight_messages.pop(message_id, None)
 
                 if close_on_error:
                     self.close()
@@ -489,6 +769,17 @@ class RPCEndpoint:
 
         self._closing = True
 
+        # Release any sends still waiting on a handshake.
+        self._have_peer_info.set()
+
+        # Fail any sends still waiting for queue room.
+        while self._blocked_messages:
+            _msgid, _message, enqueued = self._blocked_messages.popleft()
+            if not enqueued.done():
+                enqueued.set_exception(
+                    CommunicationError('Endpoint is closed.')
+                )
+
         # Kill all of our in-flight tasks.
         if self.debug_print:
             self.debug_print_call(f'{self._label}: cancelling tasks...')
@@ -506,6 +797,46 @@ class RPCEndpoint:
         # dependency loop.
         del self._handle_raw_message_call
 
+    @property
+    def first_response_latency(self) -> float | None:
+        """Seconds from endpoint creation until our first response arrived.
+
+        This covers the handshake and the first message round trip, so
+        it is a good measure of connect-to-first-response latency. It is
+        None until a response has been received.
+        """
+        return self._first_response_latency
+
+    @property
+    def peer_features(self) -> frozenset[str] | None:
+        """Features advertised by our peer in its handshake.
+
+        These are the 'features' values passed to the peer's endpoint,
+        and can be used by higher level code to decide how to talk to
+        it. This is None until the handshake has been received.
+        """
+        if self._peer_info is None:
+            return None
+        return frozenset(self._peer_info.features)
+
+    def get_metrics(self) -> RPCMetrics:
+        """Return a snapshot of our traffic and timing metrics."""
+        metrics = replace(
+            self._metrics,
+            latency_histogram=list(self._metrics.latency_histogram),
+        )
+        metrics.bytes_out = self._bytes_written
+        metrics.bytes_in = self._packet_reader.total_bytes_read
+        metrics.in_flight_messages = len(self._in_flight_messages)
+        metrics.queued_packets = len(self._out_packets)
+        metrics.queued_bytes = self._out_packets_size
+        metrics.blocked_messages = len(self._blocked_messages)
+        return metrics
+
+    def get_compression_stats(self) -> RPCCompressionStats:
+        """Return a snapshot of our payload compression statistics."""
+        return replace(self._compression_stats)
+
     def is_closing(self) -> bool:
         """Have we begun the process of closing?"""
         return self._closing
@@ -537,7 +868,7 @@ class RPCEndpoint:
 
         # Don't need our task list anymore; this should
         # break any cyclical refs from tasks referring to us.
-        self._tasks = []
+        self._tasks = set()
 
         if self.debug_print:
             self.debug_print_call(
@@ -630,10 +961,12 @@ class RPCEndpoint:
 
         # The first thing they should send us is their handshake; then
         # we'll know if/how we can talk to them.
-        mlen = await self._read_int_32()
-        message = await self._reader.readexactly(mlen)
-        self._total_bytes_read += mlen
+        (mlen,) = await self._packet_reader.read_struct(_UINT32)
+        message = await self._packet_reader.read_bytes(mlen)
         self._peer_info = dataclass_from_json(_PeerInfo, message.decode())
+        self._negotiate_compression(self._peer_info)
+        self._have_peer_info.set()
+        self._release_blocked_messages()
         self._last_keepalive_receive_time = time.monotonic()
         if self.debug_print:
             self.debug_print_call(
@@ -645,11 +978,19 @@ class RPCEndpoint:
             if self._closing:
                 return
 
-            # Read message type.
-            mtype = _PacketType(await self._read_int_8())
+            # Read message type (and compressed flag).
+            mbyte = await self._packet_reader.read_uint8()
+            mtype = _PacketType(mbyte & ~_COMPRESSED_FLAG)
+            compressed = bool(mbyte & _COMPRESSED_FLAG)
             if mtype is _PacketType.HANDSHAKE:
                 raise RuntimeError('Got multiple handshakes')
 
+            if compressed and mtype in {
+                _PacketType.KEEPALIVE,
+                _PacketType.KEEPALIVE_ACK,
+            }:
+                raise RuntimeError(f'Got compressed {mtype.name} packet.')
+
             if mtype is _PacketType.KEEPALIVE:
                 if self.debug_print_io:
                     self.debug_print_call(
@@ -658,30 +999,52 @@ class RPCEndpoint:
                     )
                 self._last_keepalive_receive_time = time.monotonic()
 
+                # Newer peers want to hear back so they can measure rtt.
+                if self._peer_info.protocol >= 4:
+                    self._enqueue_outgoing_packet(_KEEPALIVE_ACK_PACKET)
+
+            elif mtype is _PacketType.KEEPALIVE_ACK:
+                now = time.monotonic()
+                self._last_keepalive_receive_time = now
+                if self._keepalive_send_times:
+                    self._metrics.keepalive_rtt = (
+                        now - self._keepalive_send_times.popleft()
+                    )
+
             elif mtype is _PacketType.MESSAGE:
-                await self._handle_message_packet(big=False)
+                await self._handle_message_packet(
+                    big=False, compressed=compressed
+                )
 
             elif mtype is _PacketType.MESSAGE_BIG:
-                await self._handle_message_packet(big=True)
+                await self._handle_message_packet(
+                    big=True, compressed=compressed
+                )
 
             elif mtype is _PacketType.RESPONSE:
-                await self._handle_response_packet(big=False)
+                await self._handle_response_packet(
+                    big=False, compressed=compressed
+                )
 
             elif mtype is _PacketType.RESPONSE_BIG:
-                await self._handle_response_packet(big=True)
+                await self._handle_response_packet(
+                    big=True, compressed=compressed
+                )
 
             else:
                 assert_never(mtype)
 
-    async def _handle_message_packet(self, big: bool) -> None:
+    async def _handle_message_packet(
+        self, big: bool, compressed: bool
+    ) -> None:
         assert self._peer_info is not None
-        msgid = await self._read_int_16()
-        if big:
-            msglen = await self._read_int_32()
-        else:
-            msglen = await self._read_int_16()
-        msg = await self._reader.readexactly(msglen)
-        self._total_bytes_read += msglen
+        msgid, msglen = await self._packet_reader.read_struct(
+            _ID_LEN_BIG if big else _ID_LEN
+        )
+        msg = await self._packet_reader.read_bytes(msglen)
+        if compressed:
+            msg = self._decompress(msg)
+        self._metrics.messages_received += 1
         if self.debug_print_io:
             self.debug_print_call(
                 f'{self._label}: received message {msgid}'
@@ -691,8 +1054,7 @@ class RPCEndpoint:
         # Create a message-task to handle this message and return
         # a response (we don't want to block while that happens).
         assert not self._closing
-        self._prune_tasks()  # Keep from filling with dead tasks.
-        self._tasks.append(
+        self._add_task(
             asyncio.create_task(
                 self._handle_raw_message(message_id=msgid, message=msg),
                 name='efro rpc message handle',
@@ -703,22 +1065,24 @@ class RPCEndpoint:
                 f'{self._label}: done handling message at {self._tm()}.'
             )
 
-    async def _handle_response_packet(self, big: bool) -> None:
+    async def _handle_response_packet(
+        self, big: bool, compressed: bool
+    ) -> None:
         assert self._peer_info is not None
-        msgid = await self._read_int_16()
         # Protocol 2 gained 32 bit data lengths.
-        if big:
-            rsplen = await self._read_int_32()
-        else:
-            rsplen = await self._read_int_16()
+        msgid, rsplen = await self._packet_reader.read_struct(
+            _ID_LEN_BIG if big else _ID_LEN
+        )
         if self.debug_print_io:
             self.debug_print_call(
                 f'{self._label}: received response {msgid}'
                 f' of size {rsplen} at {self._tm()}.'
             )
-        rsp = await self._reader.readexactly(rsplen)
-        self._total_bytes_read += rsplen
-        msgobj = self._in_flight_messages.get(msgid)
+        rsp = await self._packet_reader.read_bytes(rsplen)
+        if compressed:
+            rsp = self._decompress(rsp)
+        self._metrics.responses_received += 1
+        msgobj = self._in_flight_messages.pop(msgid, None)
         if msgobj is None:
             # It's possible for us to get a response to a message
             # that has timed out. In this case we will have no local
@@ -729,6 +1093,10 @@ class RPCEndpoint:
                     f' message id {msgid}; perhaps it timed out?'
                 )
         else:
+            now = time.monotonic()
+            if self._first_response_latency is None:
+                self._first_response_latency = now - self._create_time
+            self._record_latency(now - msgobj.send_time)
             msgobj.set_response(rsp)
 
     async def _run_write_task(self) -> None:
@@ -741,40 +1109,38 @@ class RPCEndpoint:
             _PeerInfo(
                 protocol=OUR_PROTOCOL,
                 keepalive_interval=self._keepalive_interval,
+                compression=self._compression_codecs,
+                features=self._features,
             )
         ).encode()
-        self._writer.write(len(data).to_bytes(4, _BYTE_ORDER) + data)
+        self._writer.write(_UINT32.pack(len(data)) + data)
+        self._bytes_written += 4 + len(data)
 
-        # Now just write out-messages as they come in.
+        # Now just write out-messages as they come in. We hand everything
+        # that has accumulated since our last wakeup to the transport in
+        # one go and only wait for it to drain once it has buffered more
+        # than our high-water mark.
         while True:
             # Wait until some data comes in.
             await self._have_out_packets.wait()
 
             assert self._out_packets
-            data = self._out_packets.popleft()
-
-            # Important: only clear this once all packets are sent.
-            if not self._out_packets:
-                self._have_out_packets.clear()
-
-            self._writer.write(data)
-
-            # This should keep our writer from buffering huge amounts
-            # of outgoing data. We must remember though that we also
-            # need to prevent _out_packets from growing too large and
-            # that part's on us.
-            await self._writer.drain()
-
-            # For now we're not applying backpressure, but let's make
-            # noise if this gets out of hand.
-            if len(self._out_packets) > 200:
-                if not self._did_out_packets_buildup_warning:
-                    logging.warning(
-                        '_out_packets building up too'
-                        ' much on RPCEndpoint %s.',
-                        id(self),
-                    )
-                    self._did_out_packets_buildup_warning = True
+            writer = self._writer
+            out_packets = self._out_packets
+            while out_packets:
+                writer.write(out_packets.popleft())
+            self._bytes_written += self._out_packets_size
+            self._out_packets_size = 0
+            self._have_out_packets.clear()
+
+            # Now that there's room, let any waiting sends in.
+            self._release_blocked_messages()
+
+            if (
+                self._writer.transport.get_write_buffer_size()
+                > self._write_high_water
+            ):
+                await self._writer.drain()
 
     async def _run_keepalive_task(self) -> None:
         """Send periodic keepalive packets."""
@@ -791,9 +1157,12 @@ class RPCEndpoint:
             assert not self._closing
             await asyncio.sleep(self._keepalive_interval)
             if not self.test_suppress_keepalives:
-                self._enqueue_outgoing_packet(
-                    _PacketType.KEEPALIVE.value.to_bytes(1, _BYTE_ORDER)
-                )
+                self._enqueue_outgoing_packet(_KEEPALIVE_PACKET)
+                if (
+                    self._peer_info is not None
+                    and self._peer_info.protocol >= 4
+                ):
+                    self._keepalive_send_times.append(time.monotonic())
 
             # Also go ahead and handle dropping the connection if we
             # haven't heard from the peer in a while.
@@ -826,7 +1195,7 @@ class RPCEndpoint:
                     self._label,
                     tasklabel,
                     time.monotonic() - self._create_time,
-                    self._total_bytes_read,
+                    self._packet_reader.total_bytes_read,
                 )
             else:
                 if self.debug_print:
@@ -845,6 +1214,7 @@ class RPCEndpoint:
     async def _handle_raw_message(
         self, message_id: int, message: bytes
     ) -> None:
+        starttime = time.monotonic()
         try:
             response = await self._handle_raw_message_call(message)
         except Exception:
@@ -854,6 +1224,8 @@ class RPCEndpoint:
             # message.
             logging.exception('Error handling raw rpc message')
             return
+        finally:
+            self._metrics.handle_seconds += time.monotonic() - starttime
 
         assert self._peer_info is not None
 
@@ -862,35 +1234,102 @@ class RPCEndpoint:
                 raise RuntimeError('Response cannot be larger than 65535 bytes')
 
         # Now send back our response.
-        # Payload consists of type (1b), msgid (2b), len (2b), and data.
-        if len(response) > 65535:
-            self._enqueue_outgoing_packet(
-                _PacketType.RESPONSE_BIG.value.to_bytes(1, _BYTE_ORDER)
-                + message_id.to_bytes(2, _BYTE_ORDER)
-                + len(response).to_bytes(4, _BYTE_ORDER)
-                + response
-            )
-        else:
-            self._enqueue_outgoing_packet(
-                _PacketType.RESPONSE.value.to_bytes(1, _BYTE_ORDER)
-                + message_id.to_bytes(2, _BYTE_ORDER)
-                + len(response).to_bytes(2, _BYTE_ORDER)
-                + response
+        self._metrics.responses_sent += 1
+        self._enqueue_outgoing_packet(
+            *self._pack_packet(
+                _PacketType.RESPONSE,
+                _PacketType.RESPONSE_BIG,
+                message_id,
+                response,
             )
+        )
 
-    async def _read_int_8(self) -> int:
-        out = int.from_bytes(await self._reader.readexactly(1), _BYTE_ORDER)
-        self._total_bytes_read += 1
-        return out
+    def _negotiate_compression(self, peer_info: _PeerInfo) -> None:
+        """Pick codecs for each direction given the peer's handshake.
 
-    async def _read_int_16(self) -> int:
-        out = int.from_bytes(await self._reader.readexactly(2), _BYTE_ORDER)
-        self._total_bytes_read += 2
-        return out
+        For each direction we use the receiver's most preferred codec
+        that the sender also supports, so both ends arrive at the same
+        answer without any further back-and-forth.
+        """
+        if peer_info.protocol < 3:
+            return
+        send_codec = next(
+            (c for c in peer_info.compression if c in self._compression_codecs),
+            None,
+        )
+        receive_codec = next(
+            (c for c in self._compression_codecs if c in peer_info.compression),
+            None,
+        )
+        if send_codec is not None:
+            self._compress_call = _CODECS[send_codec][0]
+        if receive_codec is not None:
+            self._make_decompressor = _CODECS[receive_codec][1]
+        self._compression_stats.send_codec = send_codec
+        self._compression_stats.receive_codec = receive_codec
+
+    def _pack_packet(
+        self,
+        ptype: _PacketType,
+        ptype_big: _PacketType,
+        ident: int,
+        payload: bytes,
+    ) -> tuple[bytes, bytes]:
+        """Return header and payload for a message or response packet.
+
+        Compresses the payload if we've negotiated a codec and it is
+        large enough to be worth it (but not so large that compressing
+        it would hold up the event loop).
+        """
+        flag = 0
+        compress_call = self._compress_call
+        if (
+            compress_call is not None
+            and self._compression_threshold
+            <= len(payload)
+            <= self._max_compress_bytes
+        ):
+            stats = self._compression_stats
+            starttime = time.monotonic()
+            compressed = compress_call(payload)
+            stats.compress_seconds += time.monotonic() - starttime
+
+            # Only bother if it actually came out smaller.
+            if len(compressed) < len(payload):
+                stats.packets_compressed += 1
+                stats.bytes_before_compression += len(payload)
+                stats.bytes_after_compression += len(compressed)
+                payload = compressed
+                flag = _COMPRESSED_FLAG
+
+        if len(payload) > 65535:
+            return (
+                _HEADER_BIG.pack(ptype_big.value | flag, ident, len(payload)),
+                payload,
+            )
+        return _HEADER.pack(ptype.value | flag, ident, len(payload)), payload
 
-    async def _read_int_32(self) -> int:
-        out = int.from_bytes(await self._reader.readexactly(4), _BYTE_ORDER)
-        self._total_bytes_read += 4
+    def _decompress(self, payload: bytes) -> bytes:
+        if self._make_decompressor is None:
+            raise RuntimeError('Got compressed packet without a codec.')
+        stats = self._compression_stats
+        starttime = time.monotonic()
+        limit = self._max_decompressed_bytes
+
+        # Ask for one byte more than we allow so we can tell a payload
+        # that exactly hits the limit from one that goes past it.
+        decompressor = self._make_decompressor()
+        out = decompressor.decompress(payload, limit + 1)
+        if len(out) > limit:
+            raise RuntimeError(
+                f'Compressed payload expands past {limit} bytes.'
+            )
+        if not decompressor.eof:
+            raise RuntimeError('Got truncated compressed payload.')
+        stats.decompress_seconds += time.monotonic() - starttime
+        stats.packets_decompressed += 1
+        stats.bytes_before_decompression += len(payload)
+        stats.bytes_after_decompression += len(out)
         return out
 
     @classmethod
@@ -916,22 +1355,73 @@ class RPCEndpoint:
         # This should always be the case if thread is the same.
         assert asyncio.get_running_loop() is self._event_loop
 
-    def _enqueue_outgoing_packet(self, data: bytes) -> None:
+    def _enqueue_outgoing_packet(
+        self, header: bytes, payload: bytes = b''
+    ) -> None:
         """Enqueue a raw packet to be sent. Must be called from our loop."""
         self._check_env()
 
         if self.debug_print_io:
             self.debug_print_call(
                 f'{self._label}: enqueueing outgoing packet'
-                f' {data[:50]!r} at {self._tm()}.'
+                f' {header!r} with {len(payload)} byte payload'
+                f' at {self._tm()}.'
             )
 
         # Add the data and let our write task know about it.
-        self._out_packets.append(data)
+        self._out_packets.append(header)
+        if payload:
+            self._out_packets.append(payload)
+        self._out_packets_size += len(header) + len(payload)
         self._have_out_packets.set()
 
-    def _prune_tasks(self) -> None:
-        self._tasks = self._get_live_tasks()
+    def _record_latency(self, latency: float) -> None:
+        metrics = self._metrics
+        metrics.latency_total += latency
+        bucket = math.frexp(latency / _LATENCY_BUCKET_BASE)[1]
+        metrics.latency_histogram[
+            min(max(bucket, 0), _LATENCY_BUCKET_COUNT - 1)
+        ] += 1
+
+    def _awaiting_codecs(self, message: bytes) -> bool:
+        """Should this message wait for the handshake to be compressed?"""
+        return (
+            self._peer_info is None
+            and bool(self._compression_codecs)
+            and len(message) >= self._compression_threshold
+        )
+
+    def _enqueue_message_packet(self, message_id: int, message: bytes) -> None:
+        self._metrics.messages_sent += 1
+        self._enqueue_outgoing_packet(
+            *self._pack_packet(
+                _PacketType.MESSAGE,
+                _PacketType.MESSAGE_BIG,
+                message_id,
+                message,
+            )
+        )
+
+    def _release_blocked_messages(self) -> None:
+        """Move waiting messages into our queue while there's room."""
+        blocked = self._blocked_messages
+        while blocked and self._out_packets_size < self._max_queued_out_bytes:
+            message_id, message, enqueued = blocked[0]
+            if enqueued.done():
+                # Its sender was cancelled; drop it.
+                blocked.popleft()
+                continue
+            if self._awaiting_codecs(message):
+                break
+            blocked.popleft()
+            self._enqueue_message_packet(message_id, message)
+            enqueued.set_result(None)
+
+    def _add_task(self, task: asyncio.Task) -> None:
+        # Tracking tasks in a self-pruning set keeps this O(1) no matter
+        # how many messages we have in flight.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     def _get_live_tasks(self) -> list[asyncio.Task]:
         return [t for t in self._tasks if not t.done()]
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import heapq
 import random
 import logging
 import math
@@ -13,6 +14,7 @@ from typing import TYPE_CHECKING, override
 
 import bascenev1 as bs
 from enum import Enum
+from dataclasses import dataclass
 
 from bascenev1lib.actor.bomb import Bomb, Blast
 from bascenev1lib.actor.powerupbox import PowerupBoxFactory, PowerupBox
@@ -78,6 +80,100 @@ class BombDiedMessage:
     """A bomb has died and thus can be recycled."""
 
 
+@dataclass
+class SillyPowerup:
+    """Describes how a powerup type is applied to a Silly.
+
+    Category: **Gameplay Classes**
+    """
+
+    apply: Callable[[Silly], Any]
+    """Called with the Silly when the powerup is picked up."""
+
+    texture: Callable[[Silly], bs.Texture] | None = None
+    """Returns the texture to flash on the billboard (after apply)."""
+
+    billboard_slot: int | None = None
+    """Mini-billboard slot (1-3) showing the powerup while it lasts."""
+
+    expire: Callable[[Silly], Any] | None = None
+    """Called when the powerup wears off; None means it never does."""
+
+    expire_flash: Callable[[Silly], Any] | None = None
+    """Called shortly before the powerup wears off as a warning."""
+
+    expire_key: str | None = None
+    """Powerups sharing a key replace each other's pending expiry."""
+
+    can_expire: Callable[[Silly], bool] | None = None
+    """Optional check for whether the powerup should wear off at all."""
+
+    rearm: Callable[[Silly], Any] | None = None
+    """Called when a new wear-off gets scheduled (to undo a warning)."""
+
+
+# pylint: disable=protected-access
+SILLY_POWERUPS: dict[str, SillyPowerup] = {
+    'triple_bombs': SillyPowerup(
+        apply=lambda silly: silly.set_bomb_count(3),
+        texture=lambda silly: PowerupBoxFactory.get().tex_bomb,
+        billboard_slot=1,
+        expire=lambda silly: silly._multi_bomb_wear_off(),
+        expire_flash=lambda silly: silly._multi_bomb_wear_off_flash(),
+        expire_key='multi_bomb',
+    ),
+    'impact_bombs': SillyPowerup(
+        apply=lambda silly: setattr(silly, 'bomb_type', 'impact'),
+        texture=lambda silly: silly._get_bomb_type_tex(),
+        billboard_slot=2,
+        expire=lambda silly: silly._bomb_wear_off(),
+        expire_flash=lambda silly: silly._bomb_wear_off_flash(),
+        expire_key='bomb_type',
+    ),
+    'sticky_bombs': SillyPowerup(
+        apply=lambda silly: setattr(silly, 'bomb_type', 'sticky'),
+        texture=lambda silly: silly._get_bomb_type_tex(),
+        billboard_slot=2,
+        expire=lambda silly: silly._bomb_wear_off(),
+        expire_flash=lambda silly: silly._bomb_wear_off_flash(),
+        expire_key='bomb_type',
+    ),
+    'ice_bombs': SillyPowerup(
+        apply=lambda silly: setattr(silly, 'bomb_type', 'ice'),
+        texture=lambda silly: silly._get_bomb_type_tex(),
+        billboard_slot=2,
+        expire=lambda silly: silly._bomb_wear_off(),
+        expire_flash=lambda silly: silly._bomb_wear_off_flash(),
+        expire_key='bomb_type',
+    ),
+    'punch': SillyPowerup(
+        apply=lambda silly: silly.equip_boxing_gloves(),
+        texture=lambda silly: PowerupBoxFactory.get().tex_punch,
+        billboard_slot=3,
+        expire=lambda silly: silly._gloves_wear_off(),
+        expire_flash=lambda silly: silly._gloves_wear_off_flash(),
+        expire_key='boxing_gloves',
+        can_expire=lambda silly: not silly.default_boxing_gloves,
+        rearm=lambda silly: setattr(
+            silly.node, 'boxing_gloves_flashing', False
+        ),
+    ),
+    # Let's allow powerup-equipped shields to lose hp over time.
+    'shield': SillyPowerup(
+        apply=lambda silly: silly.equip_shields(
+            decay=SillyFactory.get().shield_decay_rate > 0
+        ),
+    ),
+    'curse': SillyPowerup(apply=lambda silly: silly.curse()),
+    'health': SillyPowerup(
+        apply=lambda silly: silly.heal(),
+        texture=lambda silly: PowerupBoxFactory.get().tex_health,
+    ),
+}
+"""Powerup types a Silly knows how to accept; add entries for new ones."""
+# pylint: enable=protected-access
+
+
 class Silly(bs.Actor):
     """
     Base class for various Sillyzes.
@@ -219,13 +315,16 @@ class Silly(bs.Actor):
         self.shield_hitpoints_max = SHIELD_HITPOINTS_MAX
         self.shield_decay_rate = 0
         self.shield_decay_timer: bs.Timer | None = None
-        self._boxing_gloves_wear_off_timer: bs.Timer | None = None
-        self._boxing_gloves_wear_off_flash_timer: bs.Timer | None = None
-        self._bomb_wear_off_timer: bs.Timer | None = None
-        self._bomb_wear_off_flash_timer: bs.Timer | None = None
-        self._multi_bomb_wear_off_timer: bs.Timer | None = None
-        self._multi_bomb_wear_off_flash_timer: bs.Timer | None = None
-        self._curse_timer: bs.Timer | None = None
+
+        # Timed effects (powerup wear-offs, curses, etc.) live in a heap
+        # of (time, seq, key, call) serviced by a single timer. The
+        # latest seq scheduled per key is the only live one for that key.
+        self._expiries: list[
+            tuple[float, int, str, Callable[[Silly], Any]]
+        ] = []
+        self._expiry_seqs: dict[str, int] = {}
+        self._expiry_count = 0
+        self._expiry_timer: bs.Timer | None = None
         self.bomb_count = self.default_bomb_count
         self._max_bomb_count = self.default_bomb_count
         self.bomb_type_default = self.default_bomb_type
@@ -852,9 +951,10 @@ class Silly(bs.Actor):
                 self.node.curse_death_time = int(
                     1000.0 * (tval + self.curse_time)
                 )
-                self._curse_timer = bs.Timer(
+                self.schedule_expiry(
+                    'curse',
                     self.curse_time,
-                    bs.WeakCall(self.handlemessage, CurseExplodeMessage()),
+                    lambda silly: silly.handlemessage(CurseExplodeMessage()),
                 )
 
     def equip_boxing_gloves(self) -> None:
@@ -940,606 +1040,619 @@ class Silly(bs.Actor):
         else:
             self.shield_decay_timer = None
 
-    @override
-    def handlemessage(self, msg: Any) -> Any:
-        # pylint: disable=too-many-return-statements
+    def heal(self) -> None:
+        """Restore this Silly to full health, lifting any curse."""
+        assert self.node
+        if self._cursed:
+            self._cursed = False
+
+            # Remove cursed material.
+            factory = SillyFactory.get()
+            for attr in ['materials', 'roller_materials']:
+                materials = getattr(self.node, attr)
+                if factory.curse_material in materials:
+                    setattr(
+                        self.node,
+                        attr,
+                        tuple(
+                            m
+                            for m in materials
+                            if m != factory.curse_material
+                        ),
+                    )
+
+            self.node.curse_death_time = 0
+        self.hitpoints = self.hitpoints_max
+        self.node.hurt = 0
+        self._last_hit_time = None
+        self._num_times_hit = 0
+
+    def apply_powerup(self, powerup: SillyPowerup) -> None:
+        """Apply a powerup definition to this Silly.
+
+        Handles the billboard flash and, if our powerups expire, the
+        mini-billboard countdown and scheduled wear-off.
+        """
+        assert self.node
+        powerup.apply(self)
+        if powerup.texture is None:
+            return
+        tex = powerup.texture(self)
+        self._flash_billboard(tex)
+        if (
+            not self.powerups_expire
+            or powerup.expire is None
+            or (powerup.can_expire is not None and not powerup.can_expire(self))
+        ):
+            return
+        if powerup.rearm is not None:
+            powerup.rearm(self)
+        if powerup.billboard_slot is not None:
+            slot = f'mini_billboard_{powerup.billboard_slot}'
+            t_ms = int(bs.time() * 1000.0)
+            assert isinstance(t_ms, int)
+            setattr(self.node, f'{slot}_texture', tex)
+            setattr(self.node, f'{slot}_start_time', t_ms)
+            setattr(
+                self.node, f'{slot}_end_time', t_ms + POWERUP_WEAR_OFF_TIME
+            )
+        key = powerup.expire_key
+        if key is None:
+            key = str(id(powerup))
+        if powerup.expire_flash is not None:
+            self.schedule_expiry(
+                f'{key}_flash',
+                (POWERUP_WEAR_OFF_TIME - 2000) / 1000.0,
+                powerup.expire_flash,
+            )
+        self.schedule_expiry(
+            key, POWERUP_WEAR_OFF_TIME / 1000.0, powerup.expire
+        )
+
+    def schedule_expiry(
+        self, key: str, delay: float, call: Callable[[Silly], Any]
+    ) -> None:
+        """Schedule a timed effect to run after a delay (in seconds).
+
+        Any effect still pending under the same key is replaced. The call
+        is passed this Silly; it should not hold its own reference to it
+        (that would keep us alive). All timed effects share one timer.
+        """
+        self._expiry_count += 1
+        seq = self._expiry_count
+        self._expiry_seqs[key] = seq
+        heapq.heappush(self._expiries, (bs.time() + delay, seq, key, call))
+        if self._expiries[0][1] == seq:
+            self._arm_expiry_timer()
+
+    def cancel_expiry(self, key: str) -> None:
+        """Cancel a pending timed effect (if any)."""
+        # Stale heap entries are dropped lazily as they come due.
+        self._expiry_seqs.pop(key, None)
+
+    def _arm_expiry_timer(self) -> None:
+        expiries = self._expiries
+        while expiries and (
+            self._expiry_seqs.get(expiries[0][2]) != expiries[0][1]
+        ):
+            heapq.heappop(expiries)
+        if not expiries:
+            self._expiry_timer = None
+            return
+        self._expiry_timer = bs.Timer(
+            max(0.0, expiries[0][0] - bs.time()),
+            bs.WeakCall(self._service_expiries),
+        )
+
+    def _service_expiries(self) -> None:
+        # (allow a hair of slop for float times)
+        now = bs.time() + 0.0001
+        expiries = self._expiries
+        while expiries and expiries[0][0] <= now:
+            _due, seq, key, call = heapq.heappop(expiries)
+            if self._expiry_seqs.get(key) != seq:
+                continue
+            del self._expiry_seqs[key]
+            call(self)
+        self._arm_expiry_timer()
+
+    @bs.messagehandler(bs.PickedUpMessage)
+    def _handle_picked_up(self, msg: bs.PickedUpMessage) -> Any:
+        del msg  # Unused.
+        if self.node:
+            self.node.handlemessage('hurt_sound')
+            self.node.handlemessage('picked_up')
+
+        # This counts as a hit.
+        self._num_times_hit += 1
+
+    @bs.messagehandler(bs.ShouldShatterMessage)
+    def _handle_should_shatter(self, msg: bs.ShouldShatterMessage) -> Any:
+        del msg  # Unused.
+        # Eww; seems we have to do this in a timer or it wont work right.
+        # (since we're getting called from within update() perhaps?..)
+        # NOTE: should test to see if that's still the case.
+        bs.TimerWheel.get().schedule_weak(0.001, self.shatter)
+
+    @bs.messagehandler(bs.ImpactDamageMessage)
+    def _handle_impact_damage(self, msg: bs.ImpactDamageMessage) -> Any:
+        # Eww; seems we have to do this in a timer or it wont work right.
+        # (since we're getting called from within update() perhaps?..)
+        bs.TimerWheel.get().schedule_weak(
+            0.001, self._hit_self, msg.intensity
+        )
+
+    @bs.messagehandler(bs.PowerupMessage)
+    def _handle_powerup(self, msg: bs.PowerupMessage) -> Any:
+        if self._dead or not self.node:
+            return True
+        if self.pick_up_powerup_callback is not None:
+            self.pick_up_powerup_callback(self)
+        powerup = SILLY_POWERUPS.get(msg.poweruptype)
+        if powerup is not None:
+            self.apply_powerup(powerup)
+
+        self.node.handlemessage('flash')
+        if msg.sourcenode:
+            msg.sourcenode.handlemessage(bs.PowerupAcceptMessage())
+        return True
+
+    @bs.messagehandler(bs.FreezeMessage)
+    def _handle_freeze(self, msg: bs.FreezeMessage) -> Any:
+        del msg  # Unused.
+        if not self.node:
+            return None
+        if self.node.invincible:
+            SillyFactory.get().block_sound.play(
+                1.0,
+                position=self.node.position,
+            )
+            return None
+        if not self.frozen:
+            self.frozen = True
+            self.node.frozen = True
+            self.schedule_expiry(
+                'thaw',
+                FREEZE_TIME,
+                lambda silly: silly.handlemessage(bs.ThawMessage()),
+            )
+            # Instantly shatter if we're already dead.
+            # (otherwise its hard to tell we're dead).
+            if self.hitpoints <= 0:
+                self.shatter()
+
+    @bs.messagehandler(bs.ThawMessage)
+    def _handle_thaw(self, msg: bs.ThawMessage) -> Any:
+        del msg  # Unused.
+        if self.frozen and not self.shattered and self.node:
+            self.frozen = False
+            self.node.frozen = False
+
+    @bs.messagehandler(bs.HitMessage)
+    def _handle_hit(self, msg: bs.HitMessage) -> Any:
         # pylint: disable=too-many-statements
         # pylint: disable=too-many-branches
-        assert not self.expired
-
-        if isinstance(msg, bs.PickedUpMessage):
-            if self.node:
-                self.node.handlemessage('hurt_sound')
-                self.node.handlemessage('picked_up')
+        if not self.node:
+            return None
+        if self.node.invincible:
+            SillyFactory.get().block_sound.play(
+                1.0,
+                position=self.node.position,
+            )
+            return True
 
-            # This counts as a hit.
+        # If we were recently hit, don't count this as another.
+        # (so punch flurries and bomb pileups essentially count as 1 hit).
+        local_time = int(bs.time() * 1000.0)
+        assert isinstance(local_time, int)
+        if (
+            self._last_hit_time is None
+            or local_time - self._last_hit_time > 1000
+        ):
             self._num_times_hit += 1
+            self._last_hit_time = local_time
 
-        elif isinstance(msg, bs.ShouldShatterMessage):
-            # Eww; seems we have to do this in a timer or it wont work right.
-            # (since we're getting called from within update() perhaps?..)
-            # NOTE: should test to see if that's still the case.
-            bs.timer(0.001, bs.WeakCall(self.shatter))
-
-        elif isinstance(msg, bs.ImpactDamageMessage):
-            # Eww; seems we have to do this in a timer or it wont work right.
-            # (since we're getting called from within update() perhaps?..)
-            bs.timer(0.001, bs.WeakCall(self._hit_self, msg.intensity))
-
-        elif isinstance(msg, bs.PowerupMessage):
-            if self._dead or not self.node:
-                return True
-            if self.pick_up_powerup_callback is not None:
-                self.pick_up_powerup_callback(self)
-            if msg.poweruptype == 'triple_bombs':
-                tex = PowerupBoxFactory.get().tex_bomb
-                self._flash_billboard(tex)
-                self.set_bomb_count(3)
-                if self.powerups_expire:
-                    self.node.mini_billboard_1_texture = tex
-                    t_ms = int(bs.time() * 1000.0)
-                    assert isinstance(t_ms, int)
-                    self.node.mini_billboard_1_start_time = t_ms
-                    self.node.mini_billboard_1_end_time = (
-                        t_ms + POWERUP_WEAR_OFF_TIME
-                    )
-                    self._multi_bomb_wear_off_flash_timer = bs.Timer(
-                        (POWERUP_WEAR_OFF_TIME - 2000) / 1000.0,
-                        bs.WeakCall(self._multi_bomb_wear_off_flash),
-                    )
-                    self._multi_bomb_wear_off_timer = bs.Timer(
-                        POWERUP_WEAR_OFF_TIME / 1000.0,
-                        bs.WeakCall(self._multi_bomb_wear_off),
-                    )
-            elif msg.poweruptype == 'impact_bombs':
-                self.bomb_type = 'impact'
-                tex = self._get_bomb_type_tex()
-                self._flash_billboard(tex)
-                if self.powerups_expire:
-                    self.node.mini_billboard_2_texture = tex
-                    t_ms = int(bs.time() * 1000.0)
-                    assert isinstance(t_ms, int)
-                    self.node.mini_billboard_2_start_time = t_ms
-                    self.node.mini_billboard_2_end_time = (
-                        t_ms + POWERUP_WEAR_OFF_TIME
-                    )
-                    self._bomb_wear_off_flash_timer = bs.Timer(
-                        (POWERUP_WEAR_OFF_TIME - 2000) / 1000.0,
-                        bs.WeakCall(self._bomb_wear_off_flash),
-                    )
-                    self._bomb_wear_off_timer = bs.Timer(
-                        POWERUP_WEAR_OFF_TIME / 1000.0,
-                        bs.WeakCall(self._bomb_wear_off),
-                    )
-            elif msg.poweruptype == 'sticky_bombs':
-                self.bomb_type = 'sticky'
-                tex = self._get_bomb_type_tex()
-                self._flash_billboard(tex)
-                if self.powerups_expire:
-                    self.node.mini_billboard_2_texture = tex
-                    t_ms = int(bs.time() * 1000.0)
-                    assert isinstance(t_ms, int)
-                    self.node.mini_billboard_2_start_time = t_ms
-                    self.node.mini_billboard_2_end_time = (
-                        t_ms + POWERUP_WEAR_OFF_TIME
-                    )
-                    self._bomb_wear_off_flash_timer = bs.Timer(
-                        (POWERUP_WEAR_OFF_TIME - 2000) / 1000.0,
-                        bs.WeakCall(self._bomb_wear_off_flash),
-                    )
-                    self._bomb_wear_off_timer = bs.Timer(
-                        POWERUP_WEAR_OFF_TIME / 1000.0,
-                        bs.WeakCall(self._bomb_wear_off),
-                    )
-            elif msg.poweruptype == 'punch':
-                tex = PowerupBoxFactory.get().tex_punch
-                self._flash_billboard(tex)
-                self.equip_boxing_gloves()
-                if self.powerups_expire and not self.default_boxing_gloves:
-                    self.node.boxing_gloves_flashing = False
-                    self.node.mini_billboard_3_texture = tex
-                    t_ms = int(bs.time() * 1000.0)
-                    assert isinstance(t_ms, int)
-                    self.node.mini_billboard_3_start_time = t_ms
-                    self.node.mini_billboard_3_end_time = (
-                        t_ms + POWERUP_WEAR_OFF_TIME
-                    )
-                    self._boxing_gloves_wear_off_flash_timer = bs.Timer(
-                        (POWERUP_WEAR_OFF_TIME - 2000) / 1000.0,
-                        bs.WeakCall(self._gloves_wear_off_flash),
-                    )
-                    self._boxing_gloves_wear_off_timer = bs.Timer(
-                        POWERUP_WEAR_OFF_TIME / 1000.0,
-                        bs.WeakCall(self._gloves_wear_off),
-                    )
-            elif msg.poweruptype == 'shield':
-                factory = SillyFactory.get()
-
-                # Let's allow powerup-equipped shields to lose hp over time.
-                self.equip_shields(decay=factory.shield_decay_rate > 0)
-            elif msg.poweruptype == 'curse':
-                self.curse()
-            elif msg.poweruptype == 'ice_bombs':
-                self.bomb_type = 'ice'
-                tex = self._get_bomb_type_tex()
-                self._flash_billboard(tex)
-                if self.powerups_expire:
-                    self.node.mini_billboard_2_texture = tex
-                    t_ms = int(bs.time() * 1000.0)
-                    assert isinstance(t_ms, int)
-                    self.node.mini_billboard_2_start_time = t_ms
-                    self.node.mini_billboard_2_end_time = (
-                        t_ms + POWERUP_WEAR_OFF_TIME
-                    )
-                    self._bomb_wear_off_flash_timer = bs.Timer(
-                        (POWERUP_WEAR_OFF_TIME - 2000) / 1000.0,
-                        bs.WeakCall(self._bomb_wear_off_flash),
-                    )
-                    self._bomb_wear_off_timer = bs.Timer(
-                        POWERUP_WEAR_OFF_TIME / 1000.0,
-                        bs.WeakCall(self._bomb_wear_off),
-                    )
-            elif msg.poweruptype == 'health':
-                if self._cursed:
-                    self._cursed = False
-
-                    # Remove cursed material.
-                    factory = SillyFactory.get()
-                    for attr in ['materials', 'roller_materials']:
-                        materials = getattr(self.node, attr)
-                        if factory.curse_material in materials:
-                            setattr(
-                                self.node,
-                                attr,
-                                tuple(
-                                    m
-                                    for m in materials
-                                    if m != factory.curse_material
-                                ),
-                            )
-
-                    self.node.curse_death_time = 0
-                self.hitpoints = self.hitpoints_max
-                self._flash_billboard(PowerupBoxFactory.get().tex_health)
-                self.node.hurt = 0
-                self._last_hit_time = None
-                self._num_times_hit = 0
+        mag = msg.magnitude * self.impact_scale
+        velocity_mag = msg.velocity_magnitude * self.impact_scale
+        damage_scale = 0.22
 
-            self.node.handlemessage('flash')
-            if msg.sourcenode:
-                msg.sourcenode.handlemessage(bs.PowerupAcceptMessage())
-            return True
+        # If they've got a shield, deliver it to that instead.
+        if self.shield:
+            if msg.flat_damage:
+                damage = msg.flat_damage * self.impact_scale
 
-        elif isinstance(msg, bs.FreezeMessage):
-            if not self.node:
-                return None
-            if self.node.invincible:
-                SillyFactory.get().block_sound.play(
-                    1.0,
-                    position=self.node.position,
-                )
-                return None
-            if not self.frozen:
-                self.frozen = True
-                self.node.frozen = True
-                bs.timer(FREEZE_TIME, bs.WeakCall(self.handlemessage, bs.ThawMessage()))
-                # Instantly shatter if we're already dead.
-                # (otherwise its hard to tell we're dead).
-                if self.hitpoints <= 0:
-                    self.shatter()
-
-        elif isinstance(msg, bs.ThawMessage):
-            if self.frozen and not self.shattered and self.node:
-                self.frozen = False
-                self.node.frozen = False
-
-        elif isinstance(msg, bs.HitMessage):
-            if not self.node:
-                return None
-            if self.node.invincible:
-                SillyFactory.get().block_sound.play(
-                    1.0,
-                    position=self.node.position,
-                )
-                return True
+            assert self.shield_hitpoints is not None
 
-            # If we were recently hit, don't count this as another.
-            # (so punch flurries and bomb pileups essentially count as 1 hit).
-            local_time = int(bs.time() * 1000.0)
-            assert isinstance(local_time, int)
-            if (
-                self._last_hit_time is None
-                or local_time - self._last_hit_time > 1000
-            ):
-                self._num_times_hit += 1
-                self._last_hit_time = local_time
-
-            mag = msg.magnitude * self.impact_scale
-            velocity_mag = msg.velocity_magnitude * self.impact_scale
-            damage_scale = 0.22
-
-            # If they've got a shield, deliver it to that instead.
-            if self.shield:
-                if msg.flat_damage:
-                    damage = msg.flat_damage * self.impact_scale
-
-                assert self.shield_hitpoints is not None
-
-                # Its a cleaner event if a hit just kills the shield
-                # without damaging the player.
-                # However, massive damage events should still be able to
-                # damage the player. This hopefully gives us a happy medium.
-                SillyFactory.get().shield_hit_sound.play(
-                    0.5,
-                    position=self.node.position,
-                )
+            # Its a cleaner event if a hit just kills the shield
+            # without damaging the player.
+            # However, massive damage events should still be able to
+            # damage the player. This hopefully gives us a happy medium.
+            SillyFactory.get().shield_hit_sound.play(
+                0.5,
+                position=self.node.position,
+            )
 
-                # Emit some cool looking sparks on shield hit.
+            # Emit some cool looking sparks on shield hit.
+            assert msg.force_direction is not None
+            bs.emitfx(
+                position=msg.pos,
+                velocity=(
+                    msg.force_direction[0] * 1.0,
+                    msg.force_direction[1] * 1.0,
+                    msg.force_direction[2] * 1.0,
+                ),
+                count=4,
+                scale=0.5,
+                spread=0.3,
+                chunk_type='spark',
+            )
+
+        if msg.flat_damage:
+            damage = int(
+                msg.flat_damage * self.impact_scale
+            )
+        else:
+            # Hit it with an impulse and get the resulting damage.
+            assert msg.force_direction is not None
+            self.node.handlemessage(
+                'impulse',
+                msg.pos[0],
+                msg.pos[1],
+                msg.pos[2],
+                msg.velocity[0],
+                msg.velocity[1],
+                msg.velocity[2],
+                mag,
+                velocity_mag,
+                msg.radius,
+                0,
+                msg.force_direction[0],
+                msg.force_direction[1],
+                msg.force_direction[2],
+            )
+
+            damage = int(damage_scale * self.node.damage)
+        self.node.handlemessage('hurt_sound')
+
+        # Play punch impact sound based on damage if it was a punch.
+        if msg.hit_type == 'punch':
+            self.on_punched(damage)
+
+            # If damage was significant, lets show it.
+            if damage >= 350:
                 assert msg.force_direction is not None
-                bs.emitfx(
-                    position=msg.pos,
-                    velocity=(
-                        msg.force_direction[0] * 1.0,
-                        msg.force_direction[1] * 1.0,
-                        msg.force_direction[2] * 1.0,
-                    ),
-                    count=4,
-                    scale=0.5,
-                    spread=0.3,
-                    chunk_type='spark',
+                bs.show_damage_count(
+                    '-' + f'{damage}',
+                    msg.pos,
+                    msg.force_direction,
                 )
 
-            if msg.flat_damage:
-                damage = int(
-                    msg.flat_damage * self.impact_scale
+            # Let's always add in a super-punch sound with boxing
+            # gloves just to differentiate them.
+            if msg.hit_subtype == 'super_punch':
+                SillyFactory.get().punch_sound_stronger.play(
+                    1.0,
+                    position=self.node.position,
                 )
+            if damage >= 500:
+                sounds = SillyFactory.get().punch_sound_strong
+                sound = sounds[random.randrange(len(sounds))]
+            elif damage >= 100:
+                sound = SillyFactory.get().punch_sound
             else:
-                # Hit it with an impulse and get the resulting damage.
-                assert msg.force_direction is not None
-                self.node.handlemessage(
-                    'impulse',
-                    msg.pos[0],
-                    msg.pos[1],
-                    msg.pos[2],
-                    msg.velocity[0],
-                    msg.velocity[1],
-                    msg.velocity[2],
-                    mag,
-                    velocity_mag,
-                    msg.radius,
-                    0,
-                    msg.force_direction[0],
-                    msg.force_direction[1],
-                    msg.force_direction[2],
-                )
+                sound = SillyFactory.get().punch_sound_weak
+            sound.play(1.0, position=self.node.position)
 
-                damage = int(damage_scale * self.node.damage)
-            self.node.handlemessage('hurt_sound')
+            # Throw up some chunks.
+            assert msg.force_direction is not None
+            bs.emitfx(
+                position=msg.pos,
+                velocity=(
+                    msg.force_direction[0] * 0.5,
+                    msg.force_direction[1] * 0.5,
+                    msg.force_direction[2] * 0.5,
+                ),
+                count=min(10, 1 + int(damage * 0.0025)),
+                scale=0.3,
+                spread=0.03,
+            )
 
-            # Play punch impact sound based on damage if it was a punch.
-            if msg.hit_type == 'punch':
-                self.on_punched(damage)
-
-                # If damage was significant, lets show it.
-                if damage >= 350:
-                    assert msg.force_direction is not None
-                    bs.show_damage_count(
-                        '-' + f'{damage}',
-                        msg.pos,
-                        msg.force_direction,
-                    )
+            bs.emitfx(
+                position=msg.pos,
+                chunk_type='sweat',
+                velocity=(
+                    msg.force_direction[0] * 1.3,
+                    msg.force_direction[1] * 1.3 + 5.0,
+                    msg.force_direction[2] * 1.3,
+                ),
+                count=min(30, 1 + int(damage * 0.04)),
+                scale=0.9,
+                spread=0.28,
+            )
 
-                # Let's always add in a super-punch sound with boxing
-                # gloves just to differentiate them.
-                if msg.hit_subtype == 'super_punch':
-                    SillyFactory.get().punch_sound_stronger.play(
-                        1.0,
-                        position=self.node.position,
-                    )
-                if damage >= 500:
-                    sounds = SillyFactory.get().punch_sound_strong
-                    sound = sounds[random.randrange(len(sounds))]
-                elif damage >= 100:
-                    sound = SillyFactory.get().punch_sound
-                else:
-                    sound = SillyFactory.get().punch_sound_weak
-                sound.play(1.0, position=self.node.position)
+            # Momentary flash.
+            hurtiness = damage * 0.003
+            punchpos = (
+                msg.pos[0] + msg.force_direction[0] * 0.02,
+                msg.pos[1] + msg.force_direction[1] * 0.02,
+                msg.pos[2] + msg.force_direction[2] * 0.02,
+            )
+            flash_color = (1.0, 0.8, 0.4)
+            light = bs.newnode(
+                'light',
+                attrs={
+                    'position': punchpos,
+                    'radius': 0.12 + hurtiness * 0.12,
+                    'intensity': 0.3 * (1.0 + 1.0 * hurtiness),
+                    'height_attenuated': False,
+                    'color': flash_color,
+                },
+            )
+            bs.timer(0.06, light.delete)
 
-                # Throw up some chunks.
-                assert msg.force_direction is not None
-                bs.emitfx(
-                    position=msg.pos,
-                    velocity=(
-                        msg.force_direction[0] * 0.5,
-                        msg.force_direction[1] * 0.5,
-                        msg.force_direction[2] * 0.5,
-                    ),
-                    count=min(10, 1 + int(damage * 0.0025)),
-                    scale=0.3,
-                    spread=0.03,
-                )
+            flash = bs.newnode(
+                'flash',
+                attrs={
+                    'position': punchpos,
+                    'size': 0.17 + 0.17 * hurtiness,
+                    'color': flash_color,
+                },
+            )
+            bs.timer(0.06, flash.delete)
 
-                bs.emitfx(
-                    position=msg.pos,
-                    chunk_type='sweat',
-                    velocity=(
-                        msg.force_direction[0] * 1.3,
-                        msg.force_direction[1] * 1.3 + 5.0,
-                        msg.force_direction[2] * 1.3,
-                    ),
-                    count=min(30, 1 + int(damage * 0.04)),
-                    scale=0.9,
-                    spread=0.28,
-                )
+        if msg.hit_type == 'impact':
+            assert msg.force_direction is not None
+            bs.emitfx(
+                position=msg.pos,
+                velocity=(
+                    msg.force_direction[0] * 2.0,
+                    msg.force_direction[1] * 2.0,
+                    msg.force_direction[2] * 2.0,
+                ),
+                count=min(10, 1 + int(damage * 0.01)),
+                scale=0.4,
+                spread=0.1,
+            )
+        if self.hitpoints > 0:
+            # It's kinda crappy to die from impacts, so lets reduce
+            # impact damage by a reasonable amount *if* it'll keep us alive.
+            if msg.hit_type == 'impact' and damage >= self.hitpoints:
+                # Drop damage to whatever puts us at 10 hit points,
+                # or 200 less than it used to be whichever is greater
+                # (so it *can* still kill us if its high enough).
+                newdamage = max(damage - 200, self.hitpoints - 10)
+                damage = newdamage
+            self.node.handlemessage('flash')
 
-                # Momentary flash.
-                hurtiness = damage * 0.003
-                punchpos = (
-                    msg.pos[0] + msg.force_direction[0] * 0.02,
-                    msg.pos[1] + msg.force_direction[1] * 0.02,
-                    msg.pos[2] + msg.force_direction[2] * 0.02,
-                )
-                flash_color = (1.0, 0.8, 0.4)
-                light = bs.newnode(
-                    'light',
-                    attrs={
-                        'position': punchpos,
-                        'radius': 0.12 + hurtiness * 0.12,
-                        'intensity': 0.3 * (1.0 + 1.0 * hurtiness),
-                        'height_attenuated': False,
-                        'color': flash_color,
-                    },
-                )
-                bs.timer(0.06, light.delete)
-
-                flash = bs.newnode(
-                    'flash',
-                    attrs={
-                        'position': punchpos,
-                        'size': 0.17 + 0.17 * hurtiness,
-                        'color': flash_color,
-                    },
-                )
-                bs.timer(0.06, flash.delete)
+            # If we're holding something, drop it.
+            if damage > 0.0 and self.node.hold_node:
+                self.node.hold_node = None
+            self.hitpoints -= damage
+            self.node.hurt = (
+                1.0 - float(self.hitpoints) / self.hitpoints_max
+            )
 
-            if msg.hit_type == 'impact':
-                assert msg.force_direction is not None
-                bs.emitfx(
-                    position=msg.pos,
-                    velocity=(
-                        msg.force_direction[0] * 2.0,
-                        msg.force_direction[1] * 2.0,
-                        msg.force_direction[2] * 2.0,
+            # If we're cursed, *any* damage blows us up.
+            if self._cursed and damage > 0:
+                bs.timer(
+                    0.05,
+                    bs.WeakCall(
+                        self.curse_explode, msg.get_source_player(bs.Player)
                     ),
-                    count=min(10, 1 + int(damage * 0.01)),
-                    scale=0.4,
-                    spread=0.1,
-                )
-            if self.hitpoints > 0:
-                # It's kinda crappy to die from impacts, so lets reduce
-                # impact damage by a reasonable amount *if* it'll keep us alive.
-                if msg.hit_type == 'impact' and damage >= self.hitpoints:
-                    # Drop damage to whatever puts us at 10 hit points,
-                    # or 200 less than it used to be whichever is greater
-                    # (so it *can* still kill us if its high enough).
-                    newdamage = max(damage - 200, self.hitpoints - 10)
-                    damage = newdamage
-                self.node.handlemessage('flash')
-
-                # If we're holding something, drop it.
-                if damage > 0.0 and self.node.hold_node:
-                    self.node.hold_node = None
-                self.hitpoints -= damage
-                self.node.hurt = (
-                    1.0 - float(self.hitpoints) / self.hitpoints_max
                 )
 
-                # If we're cursed, *any* damage blows us up.
-                if self._cursed and damage > 0:
-                    bs.timer(
-                        0.05,
-                        bs.WeakCall(
-                            self.curse_explode, msg.get_source_player(bs.Player)
-                        ),
-                    )
-
-                # If we're frozen, shatter.. otherwise die if we hit zero
-                if self.frozen and (damage > 200 or self.hitpoints <= 0):
-                    self.shatter()
-                elif self.hitpoints <= 0:
-                    self.node.handlemessage(
-                        bs.DieMessage(how=bs.DeathType.IMPACT)
-                    )
+            # If we're frozen, shatter.. otherwise die if we hit zero
+            if self.frozen and (damage > 200 or self.hitpoints <= 0):
+                self.shatter()
+            elif self.hitpoints <= 0:
+                self.node.handlemessage(
+                    bs.DieMessage(how=bs.DeathType.IMPACT)
+                )
 
-            # If we're dead, take a look at the smoothed damage value
-            # (which gives us a smoothed average of recent damage) and shatter
-            # us if its grown high enough.
-            if self.hitpoints <= 0:
-                damage_avg = self.node.damage_smoothed * damage_scale
-                if damage_avg >= 1000:
-                    self.shatter()
-
-        elif isinstance(msg, BombDiedMessage):
-            self.bomb_count += 1
-
-        elif isinstance(msg, bs.DieMessage):
-            wasdead = self._dead
-            self._dead = True
-            self.hitpoints = 0
-            if msg.immediate:
-                if self.node:
-                    self.node.delete()
-            elif self.node:
-                self.node.hurt = 1.0
-                # We want to shatter and do cool slow mo...
-                # ...but only if we didn't leave
-                if msg.how is not bs.DeathType.LEFT_GAME:
-                    bs.timer(0.1, bs.Call(self.shatter, extreme=True))
-                    bs.getactivity().globalsnode.slow_motion = True
-                    bs.timer(0.2, lambda: setattr(bs.getactivity().globalsnode, 'slow_motion', False))
-                if self.play_big_death_sound and not wasdead:
-                    SillyFactory.get().single_player_death_sound.play()
-                self.node.dead = True
-                bs.timer(2.0, self.node.delete)
-
-        elif isinstance(msg, bs.OutOfBoundsMessage):
-            # By default we just die here.
-            self.handlemessage(bs.DieMessage(how=bs.DeathType.FALL))
-
-        elif isinstance(msg, bs.FootConnectMessage):
-            self.touched_floors += 1
-            if self._state == SillyState.JUMPING:
-                self._set_state(SillyState.ACTIONABLE)
-
-        elif isinstance(msg, bs.FootDisconnectMessage):
-            self.touched_floors -= 1
-
-        elif isinstance(msg, bs.StandMessage):
-            self._last_stand_pos = (
+        # If we're dead, take a look at the smoothed damage value
+        # (which gives us a smoothed average of recent damage) and shatter
+        # us if its grown high enough.
+        if self.hitpoints <= 0:
+            damage_avg = self.node.damage_smoothed * damage_scale
+            if damage_avg >= 1000:
+                self.shatter()
+
+    @bs.messagehandler(BombDiedMessage)
+    def _handle_bomb_died(self, msg: BombDiedMessage) -> Any:
+        del msg  # Unused.
+        self.bomb_count += 1
+
+    @bs.messagehandler(bs.DieMessage)
+    def _handle_die(self, msg: bs.DieMessage) -> Any:
+        wasdead = self._dead
+        self._dead = True
+        self.hitpoints = 0
+        if msg.immediate:
+            if self.node:
+                self.node.delete()
+        elif self.node:
+            self.node.hurt = 1.0
+            # We want to shatter and do cool slow mo...
+            # ...but only if we didn't leave
+            if msg.how is not bs.DeathType.LEFT_GAME:
+                bs.timer(0.1, bs.Call(self.shatter, extreme=True))
+                bs.getactivity().globalsnode.slow_motion = True
+                bs.timer(0.2, lambda: setattr(bs.getactivity().globalsnode, 'slow_motion', False))
+            if self.play_big_death_sound and not wasdead:
+                SillyFactory.get().single_player_death_sound.play()
+            self.node.dead = True
+            bs.timer(2.0, self.node.delete)
+
+    @bs.messagehandler(bs.OutOfBoundsMessage)
+    def _handle_out_of_bounds(self, msg: bs.OutOfBoundsMessage) -> Any:
+        del msg  # Unused.
+        # By default we just die here.
+        self.handlemessage(bs.DieMessage(how=bs.DeathType.FALL))
+
+    @bs.messagehandler(bs.FootConnectMessage)
+    def _handle_foot_connect(self, msg: bs.FootConnectMessage) -> Any:
+        del msg  # Unused.
+        self.touched_floors += 1
+        if self._state == SillyState.JUMPING:
+            self._set_state(SillyState.ACTIONABLE)
+
+    @bs.messagehandler(bs.FootDisconnectMessage)
+    def _handle_foot_disconnect(self, msg: bs.FootDisconnectMessage) -> Any:
+        del msg  # Unused.
+        self.touched_floors -= 1
+
+    @bs.messagehandler(bs.StandMessage)
+    def _handle_stand(self, msg: bs.StandMessage) -> Any:
+        self._last_stand_pos = (
+            msg.position[0],
+            msg.position[1],
+            msg.position[2],
+        )
+        if self.node:
+            self.node.handlemessage(
+                'stand',
                 msg.position[0],
                 msg.position[1],
                 msg.position[2],
+                msg.angle,
             )
-            if self.node:
-                self.node.handlemessage(
-                    'stand',
-                    msg.position[0],
-                    msg.position[1],
-                    msg.position[2],
-                    msg.angle,
-                )
 
-        elif isinstance(msg, CurseExplodeMessage):
-            self.curse_explode()
-
-        elif isinstance(msg, PunchHitMessage):
-            if not self.node:
-                return None
-            node = bs.getcollision().opposingnode
-
-            if not node:
-                return None
-
-            # Don't want to physically affect powerups.
-            if node.getdelegate(PowerupBox):
-                return None
-
-            # Only allow one hit per node per punch.
-            if node and (node not in self._punched_nodes):
-                punch_momentum_angular = PUNCH_MOMENTUM
-                punch_power = PUNCH_POWER
-
-                # Ok here's the deal:  we pass along our base velocity for use
-                # in the impulse damage calculations since that is a more
-                # predictable value than our fist velocity, which is rather
-                # erratic. However, we want to actually apply force in the
-                # direction our fist is moving so it looks better. So we still
-                # pass that along as a direction. Perhaps a time-averaged
-                # fist-velocity would work too?.. perhaps should try that.
-
-                # If its something besides another Silly, just do a muffled
-                # punch sound.
-                if node.getnodetype() != 'spaz':
-                    sounds = SillyFactory.get().impact_sounds_medium
-                    sound = sounds[random.randrange(len(sounds))]
-                    sound.play(1.0, position=self.node.position)
-
-                self._punched_nodes.add(node)
-                node.handlemessage(
-                    bs.HitMessage(
-                        pos=self.node.position,
-                        velocity=self.node.velocity,
-                        magnitude=punch_power * punch_momentum_angular * 110.0,
-                        velocity_magnitude=punch_power * 40,
-                        radius=0,
-                        srcnode=self.node,
-                        source_player=self.source_player,
-                        force_direction=self.node.velocity,
-                        hit_type='punch',
-                        hit_subtype=(
-                            'super_punch'
-                            if self._has_boxing_gloves
-                            else 'default'
-                        ),
-                    )
+    @bs.messagehandler(CurseExplodeMessage)
+    def _handle_curse_explode(self, msg: CurseExplodeMessage) -> Any:
+        del msg  # Unused.
+        self.curse_explode()
+
+    @bs.messagehandler(PunchHitMessage)
+    def _handle_punch_hit(self, msg: PunchHitMessage) -> Any:
+        del msg  # Unused.
+        if not self.node:
+            return None
+        node = bs.getcollision().opposingnode
+
+        if not node:
+            return None
+
+        # Don't want to physically affect powerups.
+        if node.getdelegate(PowerupBox):
+            return None
+
+        # Only allow one hit per node per punch.
+        if node and (node not in self._punched_nodes):
+            punch_momentum_angular = PUNCH_MOMENTUM
+            punch_power = PUNCH_POWER
+
+            # Ok here's the deal:  we pass along our base velocity for use
+            # in the impulse damage calculations since that is a more
+            # predictable value than our fist velocity, which is rather
+            # erratic. However, we want to actually apply force in the
+            # direction our fist is moving so it looks better. So we still
+            # pass that along as a direction. Perhaps a time-averaged
+            # fist-velocity would work too?.. perhaps should try that.
+
+            # If its something besides another Silly, just do a muffled
+            # punch sound.
+            if node.getnodetype() != 'spaz':
+                sounds = SillyFactory.get().impact_sounds_medium
+                sound = sounds[random.randrange(len(sounds))]
+                sound.play(1.0, position=self.node.position)
+
+            self._punched_nodes.add(node)
+            node.handlemessage(
+                bs.HitMessage(
+                    pos=self.node.position,
+                    velocity=self.node.velocity,
+                    magnitude=punch_power * punch_momentum_angular * 110.0,
+                    velocity_magnitude=punch_power * 40,
+                    radius=0,
+                    srcnode=self.node,
+                    source_player=self.source_player,
+                    force_direction=self.node.velocity,
+                    hit_type='punch',
+                    hit_subtype=(
+                        'super_punch'
+                        if self._has_boxing_gloves
+                        else 'default'
+                    ),
                 )
-                if node.getnodetype() == 'spaz':
-                    # Uppercut
-                    if self._state == SillyState.JUMPING:
-                        # Yay :3
-                        self.node.handlemessage(bs.CelebrateMessage(0.5))
-                        # Play sound
-                        SillyFactory.get().uppercut_sound.play(position=self.node.position, volume=1.0)
-                        # Emit
-                        bs.emitfx(position=self.node.position,
-                                  velocity=[v*1 for v in self.node.velocity],
-                                  count=3,
-                                  scale=1,
-                                  spread=0.5,
-                                  chunk_type='sweat')
-                        xforce = 4
-                        yforce = 35
-
-                        for x in range(20):
-                            v = self.node.velocity
-                            node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
-                                                    0, 25, 0,
-                                                    yforce, 0.05, 0, 0,
-                                                    0, 20*400, 0)
-
-                            node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
-                                                    0, 25, 0,
-                                                    xforce, 0.05, 0, 0,
-                                                    v[0]*15*2, 0, v[2]*15*2)
-                    # Dodge hit
-                    if self._state == SillyState.DASHING:
-                        # Play sound
-                        SillyFactory.get().dash_hit_sound.play(position=self.node.position, volume=1.0)
-                        # Emit
-                        bs.emitfx(position=self.node.position,
-                                  velocity=[v*1 for v in self.node.velocity],
-                                  count=3,
-                                  scale=1,
-                                  spread=0.5,
-                                  chunk_type='sweat')
-                        xforce = 30
-                        yforce = 4
-
-                        for x in range(10):
-                            v = self.node.velocity
-                            node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
-                                                    0, 25, 0,
-                                                    yforce, 0.05, 0, 0,
-                                                    0, 20*400, 0)
-
-                            node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
-                                                    0, 25, 0,
-                                                    xforce, 0.05, 0, 0,
-                                                    v[0]*15*2, 0, v[2]*15*2)
-
-                # Also apply opposite to ourself for the first punch only.
-                # This is given as a constant force so that it is more
-                # noticeable for slower punches where it matters. For fast
-                # awesome looking punches its ok if we punch 'through'
-                # the target.
-                mag = -400.0
-                if self._hockey:
-                    mag *= 0.5
-                #if len(self._punched_nodes) == 1:
-                #    self.node.handlemessage(
-                #        'kick_back',
-                #        ppos[0],
-                #        ppos[1],
-                #        ppos[2],
-                #        punchdir[0],
-                #        punchdir[1],
-                #        punchdir[2],
-                #        mag,
-                #    )
-
-        elif isinstance(msg, bs.CelebrateMessage):
-            if self.node:
-                self.node.handlemessage('celebrate', int(msg.duration * 1000))
+            )
+            if node.getnodetype() == 'spaz':
+                # Uppercut
+                if self._state == SillyState.JUMPING:
+                    # Yay :3
+                    self.node.handlemessage(bs.CelebrateMessage(0.5))
+                    # Play sound
+                    SillyFactory.get().uppercut_sound.play(position=self.node.position, volume=1.0)
+                    # Emit
+                    bs.emitfx(position=self.node.position,
+                              velocity=[v*1 for v in self.node.velocity],
+                              count=3,
+                              scale=1,
+                              spread=0.5,
+                              chunk_type='sweat')
+                    xforce = 4
+                    yforce = 35
+
+                    for x in range(20):
+                        v = self.node.velocity
+                        node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
+                                                0, 25, 0,
+                                                yforce, 0.05, 0, 0,
+                                                0, 20*400, 0)
+
+                        node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
+                                                0, 25, 0,
+                                                xforce, 0.05, 0, 0,
+                                                v[0]*15*2, 0, v[2]*15*2)
+                # Dodge hit
+                if self._state == SillyState.DASHING:
+                    # Play sound
+                    SillyFactory.get().dash_hit_sound.play(position=self.node.position, volume=1.0)
+                    # Emit
+                    bs.emitfx(position=self.node.position,
+                              velocity=[v*1 for v in self.node.velocity],
+                              count=3,
+                              scale=1,
+                              spread=0.5,
+                              chunk_type='sweat')
+                    xforce = 30
+                    yforce = 4
+
+                    for x in range(10):
+                        v = self.node.velocity
+                        node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
+                                                0, 25, 0,
+                                                yforce, 0.05, 0, 0,
+                                                0, 20*400, 0)
+
+                        node.handlemessage('impulse', node.position[0], node.position[1], node.position[2],
+                                                0, 25, 0,
+                                                xforce, 0.05, 0, 0,
+                                                v[0]*15*2, 0, v[2]*15*2)
+
+            # Also apply opposite to ourself for the first punch only.
+            # This is given as a constant force so that it is more
+            # noticeable for slower punches where it matters. For fast
+            # awesome looking punches its ok if we punch 'through'
+            # the target.
+            mag = -400.0
+            if self._hockey:
+                mag *= 0.5
+            #if len(self._punched_nodes) == 1:
+            #    self.node.handlemessage(
+            #        'kick_back',
+            #        ppos[0],
+            #        ppos[1],
+            #        ppos[2],
+            #        punchdir[0],
+            #        punchdir[1],
+            #        punchdir[2],
+            #        mag,
+            #    )
+
+    @bs.messagehandler(bs.CelebrateMessage)
+    def _handle_celebrate(self, msg: bs.CelebrateMessage) -> Any:
+        if self.node:
+            self.node.handlemessage('celebrate', int(msg.duration * 1000))
 
     def drop_bomb(self) -> Bomb | None:
         """
@@ -335,3 +335,23 @@ class SillyFactory:
             factory = activity.customdata[cls._STORENAME] = SillyFactory()
         assert isinstance(factory, SillyFactory)
         return factory
+
+    @classmethod
+    def preload(cls, activity: bs.Activity) -> None:
+        """Build the shared factory ahead of time for an incoming game.
+
+        Registered via bs.register_activity_preloader() so this happens
+        while the previous activity is transitioning out. Media for the
+        characters of everyone currently in the session is loaded too.
+        """
+        if not isinstance(activity, bs.GameActivity):
+            return
+        assert bs.app.classic is not None
+        appearances = bs.app.classic.silly_appearances
+        factory = cls.get()
+        for sessionplayer in activity.session.sessionplayers:
+            if sessionplayer.character in appearances:
+                factory._preload(sessionplayer.character)
+
+
+bs.register_activity_preloader(SillyFactory.preload)
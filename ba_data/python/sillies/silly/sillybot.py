@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import math
 import random
 import weakref
 import logging
@@ -25,6 +26,37 @@ PRO_BOT_COLOR = (1.0, 0.2, 0.1)
 PRO_BOT_HIGHLIGHT = (0.6, 0.1, 0.05)
 
 
+def find_nearest_targets(
+    positions: Sequence[Sequence[float]],
+    player_pts: Sequence[Sequence[float]],
+) -> list[int]:
+    """Return the index of the nearest usable player point per position.
+
+    Player points are flat (x, y, z, vx, vy, vz) sequences. Points
+    significantly below a position are ignored (keeps bots from following
+    players off cliffs). An index of -1 means there is no target.
+    """
+    out: list[int] = []
+    for bpos in positions:
+        bx, by, bz = bpos[0], bpos[1], bpos[2]
+        floor = by - 5.0
+        closest = -1
+        closest_dist = 0.0
+        for i, plpt in enumerate(player_pts):
+            ply = plpt[1]
+            if ply <= floor:
+                continue
+            dx = plpt[0] - bx
+            dy = ply - by
+            dz = plpt[2] - bz
+            dist = dx * dx + dy * dy + dz * dz
+            if closest == -1 or dist < closest_dist:
+                closest = i
+                closest_dist = dist
+        out.append(closest)
+    return out
+
+
 class SillyBotPunchedMessage:
     """A message saying a bs.SillyBot got punched.
 
@@ -145,7 +177,7 @@ class SillyBot(Silly):
 
         self._throw_release_time: float | None = None
         self._have_dropped_throw_bomb: bool | None = None
-        self._player_pts: list[tuple[bs.Vec3, bs.Vec3]] | None = None
+        self._player_coords: list[tuple[float, ...]] | None = None
 
         # These cooldowns didn't exist when these bots were calibrated,
         # so take them out of the equation.
@@ -164,60 +196,26 @@ class SillyBot(Silly):
         assert mval is not None
         return mval
 
-    def _get_target_player_pt(self) -> tuple[bs.Vec3 | None, bs.Vec3 | None]:
-        """Returns the position and velocity of our target.
-
-        Both values will be None in the case of no target.
-        """
-        assert self.node
-        botpt = bs.Vec3(self.node.position)
-        closest_dist: float | None = None
-        closest_vel: bs.Vec3 | None = None
-        closest: bs.Vec3 | None = None
-        assert self._player_pts is not None
-        for plpt, plvel in self._player_pts:
-            dist = (plpt - botpt).length()
-
-            # Ignore player-points that are significantly below the bot
-            # (keeps bots from following players off cliffs).
-            if (closest_dist is None or dist < closest_dist) and (
-                plpt[1] > botpt[1] - 5.0
-            ):
-                closest_dist = dist
-                closest_vel = plvel
-                closest = plpt
-        if closest_dist is not None:
-            assert closest_vel is not None
-            assert closest is not None
-            return (
-                bs.Vec3(closest[0], closest[1], closest[2]),
-                bs.Vec3(closest_vel[0], closest_vel[1], closest_vel[2]),
-            )
-        return None, None
-
     def set_player_points(self, pts: list[tuple[bs.Vec3, bs.Vec3]]) -> None:
         """Provide the silly-bot with the locations of its enemies."""
-        self._player_pts = pts
+        self._player_coords = [(*plpt, *plvel) for plpt, plvel in pts]
 
     def update_ai(self) -> None:
         """Should be called periodically to update the silly' AI."""
-        # pylint: disable=too-many-branches
-        # pylint: disable=too-many-statements
-        # pylint: disable=too-many-locals
+        SillyBot.update_ai_batch([self], self._player_coords or [])
+
+    def _update_ai_pre(self) -> bool:
+        """Handle the parts of an AI update that don't involve a target.
+
+        Returns whether the bot still needs to be steered at its target.
+        """
         if self.update_callback is not None:
             if self.update_callback(self):
                 # Bot has been handled.
-                return
+                return False
 
         if not self.node:
-            return
-
-        pos = self.node.position
-        our_pos = bs.Vec3(pos[0], 0, pos[2])
-        can_attack = True
-
-        target_pt_raw: bs.Vec3 | None
-        target_vel: bs.Vec3 | None
+            return False
 
         # If we're a flag-bearer, we're pretty simple-minded - just walk
         # towards the flag and try to pick it up.
@@ -235,17 +233,17 @@ class SillyBot(Silly):
 
             # Otherwise try to go pick it up.
             elif self.target_flag.node:
-                target_pt_raw = bs.Vec3(*self.target_flag.node.position)
-                diff = target_pt_raw - our_pos
-                diff = bs.Vec3(diff[0], 0, diff[2])  # Don't care about y.
-                dist = diff.length()
-                to_target = diff.normalized()
+                pos = self.node.position
+                flagpos = self.target_flag.node.position
+                diff_x = flagpos[0] - pos[0]
+                diff_z = flagpos[2] - pos[2]  # Don't care about y.
+                dist = math.hypot(diff_x, diff_z)
 
                 # If we're holding some non-flag item, drop it.
                 if self.node.hold_node:
                     self.node.pickup_pressed = True
                     self.node.pickup_pressed = False
-                    return
+                    return False
 
                 # If we're a runner, run only when not super-near the flag.
                 if self.run and dist > 3.0:
@@ -255,12 +253,16 @@ class SillyBot(Silly):
                     self._running = False
                     self.node.run = 0.0
 
-                self.node.move_left_right = to_target.x
-                self.node.move_up_down = -to_target.z
+                if dist > 0.0:
+                    self.node.move_left_right = diff_x / dist
+                    self.node.move_up_down = -diff_z / dist
+                else:
+                    self.node.move_left_right = 0.0
+                    self.node.move_up_down = 0.0
                 if dist < 1.25:
                     self.node.pickup_pressed = True
                     self.node.pickup_pressed = False
-            return
+            return False
 
         # Not a flag-bearer. If we're holding anything but a bomb, drop it.
         if self.node.hold_node:
@@ -268,226 +270,294 @@ class SillyBot(Silly):
             if not holding_bomb:
                 self.node.pickup_pressed = True
                 self.node.pickup_pressed = False
-                return
-
-        target_pt_raw, target_vel = self._get_target_player_pt()
-
-        if target_pt_raw is None:
-            # Use default target if we've got one.
-            if self.target_point_default is not None:
-                target_pt_raw = self.target_point_default
-                target_vel = bs.Vec3(0, 0, 0)
-                can_attack = False
+                return False
+        return True
 
-            # With no target, we stop moving and drop whatever we're holding.
-            else:
-                self.node.move_left_right = 0
-                self.node.move_up_down = 0
-                if self.node.hold_node:
-                    self.node.pickup_pressed = True
-                    self.node.pickup_pressed = False
-                return
-
-        # We don't want height to come into play.
-        target_pt_raw[1] = 0.0
-        assert target_vel is not None
-        target_vel[1] = 0.0
-
-        dist_raw = (target_pt_raw - our_pos).length()
-
-        # Use a point out in front of them as real target.
-        # (more out in front the farther from us they are)
-        target_pt = (
-            target_pt_raw + target_vel * dist_raw * 0.3 * self._lead_amount
+    def _is_near_edge(self, pos: Sequence[float]) -> bool:
+        return self.map.is_point_near_edge(
+            bs.Vec3(pos[0], 0, pos[2]), self._running
         )
 
-        diff = target_pt - our_pos
-        dist = diff.length()
-        to_target = diff.normalized()
-
-        if self._mode == 'throw':
-            # We can only throw if alive and well.
-            if not self._dead and not self.node.knockout:
-                assert self._throw_release_time is not None
-                time_till_throw = self._throw_release_time - bs.time()
+    @classmethod
+    def update_ai_batch(
+        cls,
+        bots: Sequence[SillyBot],
+        player_coords: Sequence[Sequence[float]],
+    ) -> None:
+        """Update the AI for a number of bots in a single pass.
 
-                if not self.node.hold_node:
-                    # If we haven't thrown yet, whip out the bomb.
-                    if not self._have_dropped_throw_bomb:
-                        self.drop_bomb()
-                        self._have_dropped_throw_bomb = True
+        Player coords are flat (x, y, z, vx, vy, vz) values for each
+        potential target. Targets, lead points and distances for all
+        bots are worked out together on flat float lists, after which
+        each bot's mode behavior and mode transitions are run and the
+        results written back to the bot and its node.
+        """
+        # pylint: disable=too-many-branches
+        # pylint: disable=too-many-statements
+        # pylint: disable=too-many-locals
+        # pylint: disable=protected-access
+        steering = [bot for bot in bots if bot._update_ai_pre()]
+        if not steering:
+            return
+        now = bs.time()
+        positions = [bot.node.position for bot in steering]
+        targets = find_nearest_targets(positions, player_coords)
+
+        # Pass 1: target, lead point and distance math for everyone.
+        # We don't want height to come into play so this is all on the
+        # x/z plane. A raw distance of -1 means no target at all.
+        count = len(steering)
+        dists_raw = [-1.0] * count
+        dists = [0.0] * count
+        dirs_x = [0.0] * count
+        dirs_z = [0.0] * count
+        can_attack = [True] * count
+        for i in range(count):
+            bot = steering[i]
+            pos = positions[i]
+            index = targets[i]
+            if index != -1:
+                plc = player_coords[index]
+                target_x, target_z = plc[0], plc[2]
+                vel_x, vel_z = plc[3], plc[5]
+            elif bot.target_point_default is not None:
+                # Use default target if we've got one.
+                target_x = bot.target_point_default[0]
+                target_z = bot.target_point_default[2]
+                vel_x = vel_z = 0.0
+                can_attack[i] = False
+            else:
+                continue
+            dist_raw = math.hypot(target_x - pos[0], target_z - pos[2])
+
+            # Use a point out in front of them as real target.
+            # (more out in front the farther from us they are)
+            lead = dist_raw * 0.3 * bot._lead_amount
+            diff_x = target_x + vel_x * lead - pos[0]
+            diff_z = target_z + vel_z * lead - pos[2]
+            dist = math.hypot(diff_x, diff_z)
+            dists_raw[i] = dist_raw
+            dists[i] = dist
+            if dist > 0.0:
+                dirs_x[i] = diff_x / dist
+                dirs_z[i] = diff_z / dist
+
+        # Pass 2: mode behavior and mode transitions.
+        for i in range(count):
+            bot = steering[i]
+            node = bot.node
+            dist_raw = dists_raw[i]
+            if dist_raw < 0.0:
+                # With no target, we stop moving and drop whatever
+                # we're holding.
+                node.move_left_right = 0
+                node.move_up_down = 0
+                if node.hold_node:
+                    node.pickup_pressed = True
+                    node.pickup_pressed = False
+                continue
+            dist = dists[i]
+            to_target_x = dirs_x[i]
+            to_target_z = dirs_z[i]
+
+            if bot._mode == 'throw':
+                bot._update_throw(now, dist, to_target_x, to_target_z)
+
+            elif bot._mode == 'charge':
+                if random.random() < 0.3:
+                    bot._charge_speed = random.uniform(
+                        bot.charge_speed_min, bot.charge_speed_max
+                    )
 
-                    # Otherwise our lack of held node means we successfully
-                    # released our bomb; lets retreat now.
-                    else:
-                        self._mode = 'flee'
-
-                # Oh crap, we're holding a bomb; better throw it.
-                elif time_till_throw <= 0.0:
-                    # Jump and throw.
-                    def _safe_pickup(node: bs.Node) -> None:
-                        if node and self.node:
-                            self.node.pickup_pressed = True
-                            self.node.pickup_pressed = False
-
-                    if dist > 5.0:
-                        self.node.jump_pressed = True
-                        self.node.jump_pressed = False
-
-                        # Throws:
-                        bs.timer(0.1, bs.Call(_safe_pickup, self.node))
-                    else:
-                        # Throws:
-                        bs.timer(0.1, bs.Call(_safe_pickup, self.node))
-
-                if self.static:
-                    if time_till_throw < 0.3:
-                        speed = 1.0
-                    elif time_till_throw < 0.7 and dist > 3.0:
-                        speed = -1.0  # Whiplash for long throws.
+                    # If we're a runner we run during charges *except
+                    # when near an edge (otherwise we tend to fly off
+                    # easily).
+                    if bot.run and dist_raw > bot.run_dist_min:
+                        bot._lead_amount = 0.3
+                        bot._running = True
+                        node.run = 1.0
                     else:
-                        speed = 0.02
+                        bot._lead_amount = 0.01
+                        bot._running = False
+                        node.run = 0.0
+
+                node.move_left_right = to_target_x * bot._charge_speed
+                node.move_up_down = to_target_z * -1.0 * bot._charge_speed
+
+            elif bot._mode == 'wait':
+                # Every now and then, aim towards our target.
+                # Other than that, just stand there.
+                if int(now * 1000.0) % 1234 < 100:
+                    node.move_left_right = to_target_x * (400.0 / 33000)
+                    node.move_up_down = to_target_z * (-400.0 / 33000)
                 else:
-                    if time_till_throw < 0.7:
-                        # Right before throw charge full speed towards target.
-                        speed = 1.0
-                    else:
-                        # Earlier we can hold or move backward for a whiplash.
-                        speed = 0.0125
-                self.node.move_left_right = to_target.x * speed
-                self.node.move_up_down = to_target.z * -1.0 * speed
-
-        elif self._mode == 'charge':
-            if random.random() < 0.3:
-                self._charge_speed = random.uniform(
-                    self.charge_speed_min, self.charge_speed_max
-                )
-
-                # If we're a runner we run during charges *except when near
-                # an edge (otherwise we tend to fly off easily).
-                if self.run and dist_raw > self.run_dist_min:
-                    self._lead_amount = 0.3
-                    self._running = True
-                    self.node.run = 1.0
+                    node.move_left_right = 0
+                    node.move_up_down = 0
+
+            elif bot._mode == 'flee':
+                # Even if we're a runner, only run till we get away from
+                # our target (if we keep running we tend to run off
+                # edges).
+                if bot.run and dist < 3.0:
+                    bot._running = True
+                    node.run = 1.0
                 else:
-                    self._lead_amount = 0.01
-                    self._running = False
-                    self.node.run = 0.0
+                    bot._running = False
+                    node.run = 0.0
+                node.move_left_right = to_target_x * -1.0
+                node.move_up_down = to_target_z
 
-            self.node.move_left_right = to_target.x * self._charge_speed
-            self.node.move_up_down = to_target.z * -1.0 * self._charge_speed
+            # We might wanna switch states unless we're doing a throw
+            # (in which case that's our sole concern).
+            if bot._mode == 'throw':
+                continue
 
-        elif self._mode == 'wait':
-            # Every now and then, aim towards our target.
-            # Other than that, just stand there.
-            if int(bs.time() * 1000.0) % 1234 < 100:
-                self.node.move_left_right = to_target.x * (400.0 / 33000)
-                self.node.move_up_down = to_target.z * (-400.0 / 33000)
-            else:
-                self.node.move_left_right = 0
-                self.node.move_up_down = 0
-
-        elif self._mode == 'flee':
-            # Even if we're a runner, only run till we get away from our
-            # target (if we keep running we tend to run off edges).
-            if self.run and dist < 3.0:
-                self._running = True
-                self.node.run = 1.0
-            else:
-                self._running = False
-                self.node.run = 0.0
-            self.node.move_left_right = to_target.x * -1.0
-            self.node.move_up_down = to_target.z
-
-        # We might wanna switch states unless we're doing a throw
-        # (in which case that's our sole concern).
-        if self._mode != 'throw':
             # If we're currently charging, keep track of how far we are
-            # from our target. When this value increases it means our charge
-            # is over (ran by them or something).
-            if self._mode == 'charge':
+            # from our target. When this value increases it means our
+            # charge is over (ran by them or something).
+            if bot._mode == 'charge':
                 if (
-                    self._charge_closing_in
-                    and self._last_charge_dist < dist < 3.0
+                    bot._charge_closing_in
+                    and bot._last_charge_dist < dist < 3.0
                 ):
-                    self._charge_closing_in = False
-                self._last_charge_dist = dist
+                    bot._charge_closing_in = False
+                bot._last_charge_dist = dist
 
             # If we have a clean shot, throw!
             if (
-                self.throw_dist_min <= dist < self.throw_dist_max
-                and random.random() < self.throwiness
-                and can_attack
+                bot.throw_dist_min <= dist < bot.throw_dist_max
+                and random.random() < bot.throwiness
+                and can_attack[i]
             ):
-                self._mode = 'throw'
-                self._lead_amount = (
+                bot._mode = 'throw'
+                bot._lead_amount = (
                     (0.4 + random.random() * 0.6)
                     if dist_raw > 4.0
                     else (0.1 + random.random() * 0.4)
                 )
-                self._have_dropped_throw_bomb = False
-                self._throw_release_time = bs.time() + (
-                    1.0 / self.throw_rate
-                ) * (0.8 + 1.3 * random.random())
-
-            # If we're static, always charge (which for us means barely move).
-            elif self.static:
-                self._mode = 'wait'
-
-            # If we're too close to charge (and aren't in the middle of an
-            # existing charge) run away.
-            elif dist < self.charge_dist_min and not self._charge_closing_in:
+                bot._have_dropped_throw_bomb = False
+                bot._throw_release_time = now + (1.0 / bot.throw_rate) * (
+                    0.8 + 1.3 * random.random()
+                )
+
+            # If we're static, always charge (which for us means barely
+            # move).
+            elif bot.static:
+                bot._mode = 'wait'
+
+            # If we're too close to charge (and aren't in the middle of
+            # an existing charge) run away.
+            elif dist < bot.charge_dist_min and not bot._charge_closing_in:
                 # ..unless we're near an edge, in which case we've got no
                 # choice but to charge.
-                if self.map.is_point_near_edge(our_pos, self._running):
-                    if self._mode != 'charge':
-                        self._mode = 'charge'
-                        self._lead_amount = 0.2
-                        self._charge_closing_in = True
-                        self._last_charge_dist = dist
+                if bot._is_near_edge(positions[i]):
+                    if bot._mode != 'charge':
+                        bot._mode = 'charge'
+                        bot._lead_amount = 0.2
+                        bot._charge_closing_in = True
+                        bot._last_charge_dist = dist
                 else:
-                    self._mode = 'flee'
+                    bot._mode = 'flee'
 
             # We're within charging distance, backed against an edge,
             # or farther than our max throw distance.. chaaarge!
             elif (
-                dist < self.charge_dist_max
-                or dist > self.throw_dist_max
-                or self.map.is_point_near_edge(our_pos, self._running)
+                dist < bot.charge_dist_max
+                or dist > bot.throw_dist_max
+                or bot._is_near_edge(positions[i])
             ):
-                if self._mode != 'charge':
-                    self._mode = 'charge'
-                    self._lead_amount = 0.01
-                    self._charge_closing_in = True
-                    self._last_charge_dist = dist
+                if bot._mode != 'charge':
+                    bot._mode = 'charge'
+                    bot._lead_amount = 0.01
+                    bot._charge_closing_in = True
+                    bot._last_charge_dist = dist
 
             # We're too close to throw but too far to charge - either run
             # away or just chill if we're near an edge.
-            elif dist < self.throw_dist_min:
+            elif dist < bot.throw_dist_min:
                 # Charge if either we're within charge range or
                 # cant retreat to throw.
-                self._mode = 'flee'
+                bot._mode = 'flee'
 
             # Do some awesome jumps if we're running.
             # FIXME: pylint: disable=too-many-boolean-expressions
             if (
-                self._running
+                bot._running
                 and 1.2 < dist < 2.2
-                and bs.time() - self._last_jump_time > 1.0
+                and now - bot._last_jump_time > 1.0
             ) or (
-                self.bouncy
-                and bs.time() - self._last_jump_time > 0.4
+                bot.bouncy
+                and now - bot._last_jump_time > 0.4
                 and random.random() < 0.5
             ):
-                self._last_jump_time = bs.time()
+                bot._last_jump_time = now
+                node.jump_pressed = True
+                node.jump_pressed = False
+
+            # Throw punches when real close.
+            if dist < (1.6 if bot._running else 1.2) and can_attack[i]:
+                if random.random() < bot.punchiness:
+                    bot.on_punch_press()
+                    bot.on_punch_release()
+
+    def _update_throw(
+        self, now: float, dist: float, to_target_x: float, to_target_z: float
+    ) -> None:
+        # We can only throw if alive and well.
+        if self._dead or self.node.knockout:
+            return
+        assert self._throw_release_time is not None
+        time_till_throw = self._throw_release_time - now
+
+        if not self.node.hold_node:
+            # If we haven't thrown yet, whip out the bomb.
+            if not self._have_dropped_throw_bomb:
+                self.drop_bomb()
+                self._have_dropped_throw_bomb = True
+
+            # Otherwise our lack of held node means we successfully
+            # released our bomb; lets retreat now.
+            else:
+                self._mode = 'flee'
+
+        # Oh crap, we're holding a bomb; better throw it.
+        elif time_till_throw <= 0.0:
+            # Jump and throw.
+            def _safe_pickup(node: bs.Node) -> None:
+                if node and self.node:
+                    self.node.pickup_pressed = True
+                    self.node.pickup_pressed = False
+
+            if dist > 5.0:
                 self.node.jump_pressed = True
                 self.node.jump_pressed = False
 
-            # Throw punches when real close.
-            if dist < (1.6 if self._running else 1.2) and can_attack:
-                if random.random() < self.punchiness:
-                    self.on_punch_press()
-                    self.on_punch_release()
+                # Throws:
+                bs.TimerWheel.get().schedule(
+                    0.1, bs.Call(_safe_pickup, self.node)
+                )
+            else:
+                # Throws:
+                bs.TimerWheel.get().schedule(
+                    0.1, bs.Call(_safe_pickup, self.node)
+                )
+
+        if self.static:
+            if time_till_throw < 0.3:
+                speed = 1.0
+            elif time_till_throw < 0.7 and dist > 3.0:
+                speed = -1.0  # Whiplash for long throws.
+            else:
+                speed = 0.02
+        else:
+            if time_till_throw < 0.7:
+                # Right before throw charge full speed towards target.
+                speed = 1.0
+            else:
+                # Earlier we can hold or move backward for a whiplash.
+                speed = 0.0125
+        self.node.move_left_right = to_target_x * speed
+        self.node.move_up_down = to_target_z * -1.0 * speed
 
     @override
     def on_punched(self, damage: int) -> None:
@@ -505,81 +575,80 @@ class SillyBot(Silly):
         # no chance of them keeping activities or other things alive.
         self.update_callback = None
 
+    # Keep track of if we're being held and by who most recently.
     @override
-    def handlemessage(self, msg: Any) -> Any:
-        # pylint: disable=too-many-branches
-        assert not self.expired
-
-        # Keep track of if we're being held and by who most recently.
-        if isinstance(msg, bs.PickedUpMessage):
-            super().handlemessage(msg)  # Augment standard behavior.
-            self.held_count += 1
-            picked_up_by = msg.node.source_player
-            if picked_up_by:
-                self.last_player_held_by = picked_up_by
-
-        elif isinstance(msg, bs.DroppedMessage):
-            super().handlemessage(msg)  # Augment standard behavior.
-            self.held_count -= 1
-            if self.held_count < 0:
-                print('ERROR: silly held_count < 0')
-
-            # Let's count someone dropping us as an attack.
-            try:
-                if msg.node:
-                    picked_up_by = msg.node.source_player
-                else:
-                    picked_up_by = None
-            except Exception:
-                logging.exception('Error on SillyBot DroppedMessage.')
+    @bs.messagehandler(bs.PickedUpMessage)
+    def _handle_picked_up(self, msg: bs.PickedUpMessage) -> Any:
+        super()._handle_picked_up(msg)  # Augment standard behavior.
+        self.held_count += 1
+        picked_up_by = msg.node.source_player
+        if picked_up_by:
+            self.last_player_held_by = picked_up_by
+
+    @bs.messagehandler(bs.DroppedMessage)
+    def _handle_dropped(self, msg: bs.DroppedMessage) -> Any:
+        self.held_count -= 1
+        if self.held_count < 0:
+            print('ERROR: silly held_count < 0')
+
+        # Let's count someone dropping us as an attack.
+        try:
+            if msg.node:
+                picked_up_by = msg.node.source_player
+            else:
                 picked_up_by = None
+        except Exception:
+            logging.exception('Error on SillyBot DroppedMessage.')
+            picked_up_by = None
 
-            if picked_up_by:
-                self.last_player_attacked_by = picked_up_by
-                self.last_attacked_time = bs.time()
-                self.last_attacked_type = ('picked_up', 'default')
-
-        elif isinstance(msg, bs.DieMessage):
-            # Report normal deaths for scoring purposes.
-            if not self._dead and not msg.immediate:
-                killerplayer: bs.Player | None
+        if picked_up_by:
+            self.last_player_attacked_by = picked_up_by
+            self.last_attacked_time = bs.time()
+            self.last_attacked_type = ('picked_up', 'default')
 
-                # If this guy was being held at the time of death, the
-                # holder is the killer.
-                if self.held_count > 0 and self.last_player_held_by:
-                    killerplayer = self.last_player_held_by
+    @override
+    @bs.messagehandler(bs.DieMessage)
+    def _handle_die(self, msg: bs.DieMessage) -> Any:
+        # Report normal deaths for scoring purposes.
+        if not self._dead and not msg.immediate:
+            killerplayer: bs.Player | None
+
+            # If this guy was being held at the time of death, the
+            # holder is the killer.
+            if self.held_count > 0 and self.last_player_held_by:
+                killerplayer = self.last_player_held_by
+            else:
+                # If they were attacked by someone in the last few
+                # seconds that person's the killer.
+                # Otherwise it was a suicide.
+                if (
+                    self.last_player_attacked_by
+                    and bs.time() - self.last_attacked_time < 4.0
+                ):
+                    killerplayer = self.last_player_attacked_by
                 else:
-                    # If they were attacked by someone in the last few
-                    # seconds that person's the killer.
-                    # Otherwise it was a suicide.
-                    if (
-                        self.last_player_attacked_by
-                        and bs.time() - self.last_attacked_time < 4.0
-                    ):
-                        killerplayer = self.last_player_attacked_by
-                    else:
-                        killerplayer = None
-                activity = self._activity()
-
-                # (convert dead player refs to None)
-                if not killerplayer:
                     killerplayer = None
-                if activity is not None:
-                    activity.handlemessage(
-                        SillyBotDiedMessage(self, killerplayer, msg.how)
-                    )
-            super().handlemessage(msg)  # Augment standard behavior.
-
-        # Keep track of the player who last hit us for point rewarding.
-        elif isinstance(msg, bs.HitMessage):
-            source_player = msg.get_source_player(bs.Player)
-            if source_player:
-                self.last_player_attacked_by = source_player
-                self.last_attacked_time = bs.time()
-                self.last_attacked_type = (msg.hit_type, msg.hit_subtype)
-            super().handlemessage(msg)
-        else:
-            super().handlemessage(msg)
+            activity = self._activity()
+
+            # (convert dead player refs to None)
+            if not killerplayer:
+                killerplayer = None
+            if activity is not None:
+                activity.handlemessage(
+                    SillyBotDiedMessage(self, killerplayer, msg.how)
+                )
+        super()._handle_die(msg)  # Augment standard behavior.
+
+    # Keep track of the player who last hit us for point rewarding.
+    @override
+    @bs.messagehandler(bs.HitMessage)
+    def _handle_hit(self, msg: bs.HitMessage) -> Any:
+        source_player = msg.get_source_player(bs.Player)
+        if source_player:
+            self.last_player_attacked_by = source_player
+            self.last_attacked_time = bs.time()
+            self.last_attacked_type = (msg.hit_type, msg.hit_subtype)
+        super()._handle_hit(msg)  # Augment standard behavior.
 
 
 class BomberBot(SillyBot):
@@ -1008,8 +1077,9 @@ class SillyBotSet:
             self._bot_update_list + 1
         ) % self._bot_list_count
 
-        # Update our list of player points for the bots to use.
-        player_pts = []
+        # Gather flat position/velocity values for everyone the bots
+        # might target, then run AI for the whole list in one pass.
+        player_coords: list[tuple[float, ...]] = []
         for player in bs.getactivity().players:
             assert isinstance(player, bs.Player)
             try:
@@ -1019,18 +1089,16 @@ class SillyBotSet:
                 if player.is_alive():
                     assert isinstance(player.actor, Silly)
                     assert player.actor.node
-                    player_pts.append(
+                    player_coords.append(
                         (
-                            bs.Vec3(player.actor.node.position),
-                            bs.Vec3(player.actor.node.velocity),
+                            *player.actor.node.position,
+                            *player.actor.node.velocity,
                         )
                     )
             except Exception:
                 logging.exception('Error on bot-set _update.')
 
-        for bot in bot_list:
-            bot.set_player_points(player_pts)
-            bot.update_ai()
+        SillyBot.update_ai_batch(bot_list, player_coords)
 
     def clear(self) -> None:
         """Immediately clear out any bots in the set."""